@@ -7,5 +7,7 @@ using their native calculator applications.
 
 from .calculator_service import CalculatorService
 from .base_calculator import BaseCalculator
+from .calculator_pipeline import CalculatorPipeline
+from .decimal_calculator import DecimalCalculator
 
-__all__ = ['CalculatorService', 'BaseCalculator'] 
\ No newline at end of file
+__all__ = ['CalculatorService', 'BaseCalculator', 'CalculatorPipeline', 'DecimalCalculator'] 
\ No newline at end of file
@@ -1,13 +1,58 @@
 from abc import ABC, abstractmethod
 from typing import Dict, List
-from utils.logger import log_info, log_debug
+from utils.logger import log_info, log_debug, log_warning
 
 
 class BaseCalculator(ABC):
-    """Abstract base class for calculator implementations."""
+    """
+    Abstract base class for calculator implementations.
+    
+    Every calculate_conversions call opens and closes the calculator, unless a session is
+    open: then the calculator is launched by the first call, health-checked and reused by the
+    following ones (relaunched when it died or stopped answering) and closed by close_session().
+    """
     
     def __init__(self):
         self.calculator_open = False
+        self.session_active = False
+        self.session_launches = 0
+    
+    def open_session(self) -> None:
+        """Keep the calculator open across calculate_conversions calls - it is launched on first use."""
+        self.session_active = True
+    
+    def close_session(self) -> None:
+        """End the session and close the calculator if it was launched."""
+        if not self.session_active:
+            return
+        self.session_active = False
+        if self.session_launches:
+            self._close_calculator()
+            log_info(f"{self.get_platform_name()} calculator session closed "
+                     f"({self.session_launches} launch{'es' if self.session_launches > 1 else ''})")
+    
+    def is_healthy(self) -> bool:
+        """Whether the open calculator can take calculations - refined by the platform implementations."""
+        return self.calculator_open
+    
+    def acquire_calculator(self) -> None:
+        """Open the calculator for a run; in a session reuse it, relaunching it only when unhealthy."""
+        if not self.session_active:
+            self._open_calculator()
+            return
+        if self.session_launches and self.is_healthy():
+            log_debug(f"Reusing the open {self.get_platform_name()} calculator")
+            return
+        if self.session_launches:
+            log_warning(f"{self.get_platform_name()} calculator failed its health check, relaunching it")
+            self._close_calculator()
+        self._open_calculator()
+        self.session_launches += 1
+    
+    def release_calculator(self) -> None:
+        """Close the calculator after a run, unless a session keeps it open."""
+        if not self.session_active:
+            self._close_calculator()
     
     @abstractmethod
     def calculate_conversions(self, amounts: List[float], exchange_rates: Dict, source: str) -> Dict:
@@ -16,7 +61,7 @@ class BaseCalculator(ABC):
         
         Args:
             amounts: List of amounts to convert (e.g., [1000, 2000, 3000])
-            exchange_rates: Dict with 'eur' and 'usd' rates (e.g., {'eur': 0.00853, 'usd': 0.00988})
+            exchange_rates: Dict with a rate per pair key (e.g., {'eur': 0.00853, 'usd': 0.00988, 'eur_usd': 1.08})
             source: Source of the exchange rates (e.g., 'XE.com')
             
         Returns:
@@ -35,7 +80,7 @@ class BaseCalculator(ABC):
         pass
     
     @abstractmethod
-    def _perform_calculation(self, amount: float, rate: float) -> float:
+    def perform_calculation(self, amount: float, rate: float) -> float:
         """
         Perform a single multiplication calculation.
         
@@ -48,28 +93,24 @@ class BaseCalculator(ABC):
         """
         pass
     
-    def _create_results_structure(self, amounts: List[float], exchange_rates: Dict, source: str) -> Dict:
-        """Create the standard results structure."""
-        return {
-            "source": f"{source} + Calculator",
-            "eur": {
-                "exchange_rate": exchange_rates["eur"],
-                "conversions": {}
-            },
-            "usd": {
-                "exchange_rate": exchange_rates["usd"], 
+    def create_results_structure(self, amounts: List[float], exchange_rates: Dict, source: str) -> Dict:
+        """Create the standard results structure, one entry per pair key."""
+        results = {"source": f"{source} + Calculator"}
+        for key, rate in exchange_rates.items():
+            results[key] = {
+                "exchange_rate": rate,
                 "conversions": {}
             }
-        }
+        return results
     
     def _log_calculation_start(self, currency: str, rate: float):
         """Log the start of calculations for a currency."""
         log_info(f"Calculating {currency} conversions using {self.get_platform_name()} Calculator...")
         log_debug(f"Exchange rate: {rate:.8f}")
     
-    def _log_calculation_result(self, amount: float, rate: float, result: float, currency: str):
+    def log_calculation_result(self, amount: float, rate: float, result: float, currency: str):
         """Log individual calculation results."""
-        log_debug(f"{amount} RSD × {rate:.8f} = {result:.4f} {currency}")
+        log_debug(f"{amount} × {rate:.8f} = {result:.4f} {currency}")
     
     @abstractmethod
     def get_platform_name(self) -> str:
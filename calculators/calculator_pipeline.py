@@ -0,0 +1,125 @@
+import queue
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from utils.conversion_planner import pair_key, pair_label
+from utils.logger import log_info, log_debug, log_warning
+from utils.result_structure import pair_rate
+from .base_calculator import BaseCalculator
+
+
+class CalculatorPipeline:
+    """
+    Calculator work overlapped with web scraping.
+
+    A background thread opens the calculator as soon as the pipeline starts and works through a
+    queue of (pair key, amount, rate) calculations. feed() queues every amount of a pair the
+    moment the page reports the pair complete (and so its rate known), so the calculator runs
+    while the browser is still busy with the next pairs.
+
+    Usage:
+        pipeline = CalculatorPipeline(calculator, amounts, "Calculator").start()
+        ... pipeline.feed(results) for web results as they arrive ...
+        calculator_data = pipeline.finish(exchange_rates)
+    """
+
+    def __init__(self, calculator: BaseCalculator, amounts: List[float], source: str):
+        self.calculator = calculator
+        self.amounts = list(amounts)
+        self.source = source
+        self.timings = {"open_seconds": 0.0, "busy_seconds": 0.0, "idle_seconds": 0.0, "total_seconds": 0.0}
+        self._jobs: "queue.Queue[Optional[Tuple[str, float, float]]]" = queue.Queue()
+        self._queued_rates: Dict[str, float] = {}
+        self._results: Dict[Tuple[str, float], Dict[float, float]] = {}
+        self._error: Optional[BaseException] = None
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="calculator-pipeline", daemon=True)
+        self._started = 0.0
+
+    def start(self) -> "CalculatorPipeline":
+        """Open the calculator in the background and start taking calculations."""
+        self._started = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def feed(self, results: List[Dict]) -> None:
+        """Queue the calculations of every pair seen for the first time in these web results."""
+        by_pair: Dict[str, List[Dict]] = {}
+        for result in results:
+            by_pair.setdefault(pair_key(result["from_currency"], result["to_currency"]), []).append(result)
+        for key, pair_results in by_pair.items():
+            # The rate structure_results will report for the pair
+            self._queue_pair(key, pair_rate(pair_results))
+
+    def finish(self, exchange_rates: Dict[str, float]) -> Dict:
+        """
+        Wait for the queued calculations and build the calculator results.
+
+        Args:
+            exchange_rates: Final rate per pair key, as taken from the structured web data
+
+        Returns:
+            Calculator results structured like BaseCalculator.calculate_conversions
+
+        Raises:
+            Exception: Whatever the calculator raised on the background thread
+        """
+        for key, rate in exchange_rates.items():
+            if self._queued_rates.get(key) != rate:
+                # Never fed, or the structured rate differs from the fed one
+                log_debug(f"Queueing {pair_label(key)} calculations with the final rate {rate:.10f}")
+                self._queue_pair(key, rate, force=True)
+        self._jobs.put(None)
+        self._thread.join()
+        self.timings["total_seconds"] = time.perf_counter() - self._started
+        if self._error:
+            raise self._error
+
+        calculator_results = self.calculator.create_results_structure(self.amounts, exchange_rates, self.source)
+        for key, rate in exchange_rates.items():
+            calculator_results[key]["conversions"] = dict(self._results.get((key, rate), {}))
+        log_info(f"Calculator pipeline: opened in {self.timings['open_seconds']:.2f} s, busy "
+                 f"{self.timings['busy_seconds']:.2f} s, waited {self.timings['idle_seconds']:.2f} s for web results")
+        return calculator_results
+
+    def cancel(self) -> None:
+        """Stop after the calculation in progress and close the calculator."""
+        with self._lock:
+            self._error = self._error or RuntimeError("Calculator pipeline cancelled")
+        self._jobs.put(None)
+        self._thread.join()
+
+    def _queue_pair(self, key: str, rate: float, force: bool = False) -> None:
+        """Queue all amounts of a pair with its rate, once per pair unless forced."""
+        with self._lock:
+            if key in self._queued_rates and not force:
+                return
+            self._queued_rates[key] = rate
+        log_debug(f"Queued {len(self.amounts)} {pair_label(key)} calculations (rate {rate:.10f})")
+        for amount in self.amounts:
+            self._jobs.put((key, amount, rate))
+
+    def _run(self) -> None:
+        """Calculator thread: open, calculate queued jobs until finish() or cancel(), close."""
+        try:
+            start = time.perf_counter()
+            self.calculator.acquire_calculator()
+            self.timings["open_seconds"] = time.perf_counter() - start
+            while True:
+                wait_start = time.perf_counter()
+                job = self._jobs.get()
+                self.timings["idle_seconds"] += time.perf_counter() - wait_start
+                if job is None or self._error:
+                    break
+                key, amount, rate = job
+                work_start = time.perf_counter()
+                result = self.calculator.perform_calculation(amount, rate)
+                self.timings["busy_seconds"] += time.perf_counter() - work_start
+                self._results.setdefault((key, rate), {})[amount] = result
+                self.calculator.log_calculation_result(amount, rate, result, pair_label(key))
+        except Exception as e:
+            log_warning(f"Calculator pipeline failed: {e}")
+            with self._lock:
+                self._error = self._error or e
+        finally:
+            self.calculator.release_calculator()
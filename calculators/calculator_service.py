@@ -1,23 +1,71 @@
-from typing import Dict, List
-from utils.logger import log_info, log_debug, log_error
-from utils.os_utils import detect_os, get_calculator_class
+import random
+from typing import Dict, List, Optional
+from utils.conversion_planner import pair_label
+from utils.logger import log_info, log_debug, log_error, log_warning
+from utils.os_utils import CALCULATOR_BACKENDS, default_calculator_backend, detect_os, get_calculator_class
+from utils.result_structure import pair_entries
+from utils.sampling import choose_sample
 from .base_calculator import BaseCalculator
+from .calculator_pipeline import CalculatorPipeline
+from .decimal_calculator import DecimalCalculator
 
 
 class CalculatorService:
     """
     Cross-platform calculator service that automatically detects the operating system
     and uses the appropriate calculator implementation.
+    
+    The backend picks the desktop calculator app ("gui"), on Linux GNOME Calculator's
+    command-line solver ("cli") - same engine, no display or keyboard automation - or the
+    in-process DecimalCalculator ("decimal") on any OS.
+    
+    In sampling mode only sample_size amounts go through the backend; every amount is also
+    computed by the DecimalCalculator reference, which fills in the rest. Each pair then lists
+    its "sampled" (backend) and "derived" (reference) amounts and a "cross_check" of the two
+    engines on the sample.
     """
     
-    def __init__(self):
-        self._calculator = None
-        self._initialize_calculator()
+    # Largest backend/reference difference that still counts as agreement
+    CROSS_CHECK_TOLERANCE = 0.01
+    
+    def __init__(self, backend: Optional[str] = None, sample_size: Optional[int] = None,
+                 sample_seed: Optional[int] = None, calculator: Optional[BaseCalculator] = None,
+                 **calculator_options):
+        """
+        The backend's calculator class is only imported and instantiated on first use, so a
+        service that never calculates needs neither the GUI automation packages nor a display.
+        
+        Args:
+            backend: Calculator backend, see get_calculator_class (default: default_calculator_backend)
+            sample_size: Amounts pushed through the backend per run (None: all of them)
+            sample_seed: Seed of the sample choice, for reproducible runs
+            calculator: Ready calculator to use as the backend instead of get_calculator_class's
+                (e.g. a stand-in for the GUI app); backend then only names it ("custom" by default)
+            calculator_options: Passed to the calculator class, e.g. places and rounding for "decimal"
+        """
+        self.backend = backend or ("custom" if calculator else default_calculator_backend())
+        if calculator is None and self.backend not in CALCULATOR_BACKENDS:
+            raise ValueError(f"Unsupported calculator backend '{self.backend}', expected one of {CALCULATOR_BACKENDS}")
+        self.calculator_options = calculator_options
+        self.sample_size = sample_size
+        self._sampler = random.Random(sample_seed)
+        self._reference = None
+        self._calculator = calculator
+        self._session = False
+    
+    @property
+    def calculator(self) -> BaseCalculator:
+        """The backend's calculator, initialized on first use."""
+        if self._calculator is None:
+            self._initialize_calculator()
+        return self._calculator
     
     def _initialize_calculator(self):
-        """Initialize the appropriate calculator based on the operating system."""
-        calculator_class = get_calculator_class()
-        self._calculator = calculator_class()
+        """Initialize the appropriate calculator based on the operating system and backend."""
+        calculator_class = get_calculator_class(self.backend)
+        self._calculator = calculator_class(**self.calculator_options)
+        if self._session:
+            self._calculator.open_session()
         log_info(f"Calculator service initialized for {self._calculator.get_platform_name()}")
     
     def calculate_conversions(self, amounts: List[float], exchange_rates: Dict, source: str) -> Dict:
@@ -26,17 +74,118 @@ class CalculatorService:
         
         Args:
             amounts: List of amounts to convert (e.g., [1000, 2000, 3000])
-            exchange_rates: Dict with 'eur' and 'usd' rates (e.g., {'eur': 0.00853, 'usd': 0.00988})
+            exchange_rates: Dict with a rate per pair key (e.g., {'eur': 0.00853, 'usd': 0.00988})
             source: Source of the exchange rates (e.g., 'XE.com')
             
         Returns:
             Dict with structured conversion results including calculated values
         """
-        if not self._calculator:
-            raise RuntimeError("Calculator service not properly initialized")
+        log_debug(f"Starting calculator conversions for {source} using {self.calculator.get_platform_name()}")
+        if not self._is_sampling(amounts):
+            return self.calculator.calculate_conversions(amounts, exchange_rates, source)
+        
+        sampled_amounts = self.choose_sample(amounts)
+        sampled = self.calculator.calculate_conversions(sampled_amounts, exchange_rates, source)
+        return self._merge_sampled_results(amounts, exchange_rates, source, sampled)
+    
+    def open_session(self) -> None:
+        """
+        Keep the calculator open across calculate_conversions calls and pipelines.
+        
+        It is launched on first use, health-checked before every later run (and relaunched
+        when it died) and closed by close_session(). Opening a session neither initializes
+        the backend nor launches anything.
+        """
+        self._session = True
+        if self._calculator:
+            self._calculator.open_session()
+        log_debug(f"{self.backend} calculator session opened")
+    
+    def close_session(self) -> None:
+        """Close the session's calculator, if it was ever used."""
+        self._session = False
+        if self._calculator:
+            self._calculator.close_session()
+    
+    def choose_sample(self, amounts: List[float]) -> List[float]:
+        """Pick the amounts pushed through the backend in sampling mode, keeping their original order."""
+        if not self._is_sampling(amounts):
+            return list(amounts)
+        sampled_amounts = choose_sample(amounts, self.sample_size, self._sampler)
+        log_info(f"Sampling {len(sampled_amounts)}/{len(amounts)} amounts through the "
+                 f"{self.calculator.get_platform_name()} calculator: {sampled_amounts}")
+        return sampled_amounts
+    
+    def _is_sampling(self, amounts: List[float]) -> bool:
+        """Whether only a sample of these amounts goes through the backend."""
+        return (bool(self.sample_size) and self.sample_size < len(amounts)
+                and self.backend != "decimal")
+    
+    def _merge_sampled_results(self, amounts: List[float], exchange_rates: Dict, source: str,
+                               sampled: Dict) -> Dict:
+        """Fill in the reference engine's results around the backend's sample and cross-check the two."""
+        if self._reference is None:
+            self._reference = DecimalCalculator()
+        results = self._reference.calculate_conversions(amounts, exchange_rates, source)
+        results["engines"] = {"sampled": self.calculator.get_platform_name(),
+                              "derived": self._reference.get_platform_name()}
+        
+        for key, entry in pair_entries(results):
+            label = pair_label(key)
+            backend_conversions = sampled[key]["conversions"]
+            differences = []
+            for amount, value in backend_conversions.items():
+                difference = abs(value - entry["conversions"][amount])
+                differences.append(difference)
+                if difference > self.CROSS_CHECK_TOLERANCE:
+                    log_warning(f"Calculator cross check mismatch for {amount} {label}: "
+                                f"{results['engines']['sampled']}={value:.4f}, reference={entry['conversions'][amount]:.4f}")
+            entry["conversions"].update(backend_conversions)
+            entry["sampled"] = [amount for amount in amounts if amount in backend_conversions]
+            entry["derived"] = [amount for amount in amounts if amount not in backend_conversions]
+            agreeing = sum(1 for difference in differences if difference <= self.CROSS_CHECK_TOLERANCE)
+            entry["cross_check"] = {
+                "tolerance": self.CROSS_CHECK_TOLERANCE,
+                "max_difference": max(differences, default=0.0),
+                "mean_difference": sum(differences) / len(differences) if differences else 0.0,
+                "agreement_rate": agreeing / len(differences) if differences else 1.0,
+                "passed": agreeing == len(differences)
+            }
+            log_info(f"{label}: {len(entry['sampled'])} calculated by {results['engines']['sampled']}, "
+                     f"{len(entry['derived'])} by {results['engines']['derived']}; "
+                     f"{agreeing}/{len(differences)} agree (max difference {entry['cross_check']['max_difference']:.6f})")
+        return results
+    
+    def start_pipeline(self, amounts: List[float], source: str) -> CalculatorPipeline:
+        """
+        Open the calculator in the background and take calculations as web rates arrive.
+        
+        Args:
+            amounts: Amounts to convert for every pair fed to the pipeline
+            source: Source of the exchange rates (e.g., 'Calculator')
+            
+        Returns:
+            The started CalculatorPipeline - feed() it web results, finish() it with the final rates
+        """
+        log_debug(f"Starting pipelined calculator conversions for {source} using {self.calculator.get_platform_name()}")
+        return CalculatorPipeline(self.calculator, self.choose_sample(amounts), source).start()
+    
+    def finish_pipeline(self, pipeline: CalculatorPipeline, amounts: List[float], exchange_rates: Dict) -> Dict:
+        """
+        Finish a pipeline from start_pipeline, completing a sampled run with the reference engine.
         
-        log_debug(f"Starting calculator conversions for {source} using {self._calculator.get_platform_name()}")
-        return self._calculator.calculate_conversions(amounts, exchange_rates, source)
+        Args:
+            pipeline: The started pipeline
+            amounts: All amounts of the run
+            exchange_rates: Final rate per pair key
+            
+        Returns:
+            Dict with structured conversion results, as calculate_conversions returns them
+        """
+        calculator_results = pipeline.finish(exchange_rates)
+        if pipeline.amounts == list(amounts):
+            return calculator_results
+        return self._merge_sampled_results(amounts, exchange_rates, pipeline.source, calculator_results)
     
     def get_calculator_info(self) -> Dict[str, str]:
         """
@@ -46,11 +195,15 @@ class CalculatorService:
             Dict containing platform name and implementation details
         """
         if not self._calculator:
-            return {"platform": "unknown", "status": "not initialized"}
+            return {"platform": "unknown", "status": "not initialized", "backend": self.backend,
+                    "sample_size": str(self.sample_size or "all"), "session": str(self._session)}
         
         return {
             "platform": self._calculator.get_platform_name(),
             "status": "initialized",
+            "backend": self.backend,
+            "sample_size": str(self.sample_size or "all"),
+            "session": str(self._calculator.session_active),
             "implementation": self._calculator.__class__.__name__
         }
     
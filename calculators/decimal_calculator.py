@@ -0,0 +1,187 @@
+import decimal
+from decimal import Decimal
+from typing import Dict, List, Optional
+from utils.conversion_planner import pair_label
+from utils.logger import log_debug
+from .base_calculator import BaseCalculator
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional - bulk sweeps then run through the Decimal loop
+    np = None
+
+
+class DecimalCalculator(BaseCalculator):
+    """
+    In-process reference calculator using decimal.Decimal.
+
+    Amounts and rates are taken as their shortest decimal representation (the digits a site
+    shows), multiplied exactly within the context precision and, when places is set, rounded
+    to that many decimals with the chosen rounding mode - e.g. places=2 with ROUND_HALF_UP to
+    match a site that displays cents. Sweeps of VECTORIZE_THRESHOLD amounts or more are
+    multiplied as one numpy array when numpy is installed: amounts and rate are scaled to
+    int64 integers, multiplied exactly and rounded with integer arithmetic, so the results
+    equal the Decimal loop's for every rounding mode except ROUND_05UP, which always loops.
+    """
+
+    # === Constants ===
+    ROUNDING_MODES = (decimal.ROUND_HALF_EVEN, decimal.ROUND_HALF_UP, decimal.ROUND_HALF_DOWN, decimal.ROUND_UP,
+                      decimal.ROUND_DOWN, decimal.ROUND_CEILING, decimal.ROUND_FLOOR, decimal.ROUND_05UP)
+    VECTORIZE_THRESHOLD = 1000
+    # Most decimals an amount may have on the integer path, and the int64/float limits it stays within
+    MAX_AMOUNT_DECIMALS = 6
+    MAX_INT64 = 2 ** 63 - 1
+    MAX_EXACT_FLOAT = 2 ** 53
+    CALCULATOR_TYPE = "Decimal reference"
+
+    def __init__(self, places: Optional[int] = None, rounding: str = decimal.ROUND_HALF_EVEN,
+                 precision: int = 28, vectorize: bool = True):
+        """
+        Args:
+            places: Decimal places results are rounded to (None keeps the exact product)
+            rounding: decimal rounding mode name, e.g. 'ROUND_HALF_UP'
+            precision: Significant digits of the Decimal context
+            vectorize: Use numpy for large sweeps when it is installed
+        """
+        super().__init__()
+        if rounding not in self.ROUNDING_MODES:
+            raise ValueError(f"Unsupported rounding mode '{rounding}', expected one of {self.ROUNDING_MODES}")
+        self.places = places
+        self.rounding = rounding
+        self.context = decimal.Context(prec=precision, rounding=rounding)
+        self.vectorize = vectorize and np is not None
+        self._quantum = Decimal(1).scaleb(-places) if places is not None else None
+
+    def get_platform_name(self) -> str:
+        return "Decimal"
+
+    def calculate_conversions(self, amounts: List[float], exchange_rates: Dict, source: str) -> Dict:
+        calculator_results = self.create_results_structure(amounts, exchange_rates, source)
+        self.acquire_calculator()
+        try:
+            for key, rate in exchange_rates.items():
+                label = pair_label(key)
+                self._log_calculation_start(label, rate)
+                results = self.calculate_bulk(amounts, rate)
+                calculator_results[key]["conversions"] = dict(zip(amounts, results))
+                if len(amounts) < self.VECTORIZE_THRESHOLD:
+                    for amount, result in zip(amounts, results):
+                        self.log_calculation_result(amount, rate, result, label)
+        finally:
+            self.release_calculator()
+        return calculator_results
+
+    def calculate_bulk(self, amounts: List[float], rate: float) -> List[float]:
+        """
+        Multiply every amount by one rate.
+
+        Args:
+            amounts: Amounts to convert
+            rate: Exchange rate
+
+        Returns:
+            The rounded products, in the order of amounts
+        """
+        if self._vectorized(len(amounts)):
+            products = self._multiply_scaled(amounts, rate)
+            if products is not None:
+                log_debug(f"Multiplied {len(amounts)} amounts as one numpy array")
+                return products
+        return [float(self.multiply(amount, rate)) for amount in amounts]
+
+    def multiply(self, amount: float, rate: float) -> Decimal:
+        """The exact product of amount and rate, rounded to places when configured."""
+        product = self.context.multiply(self._to_decimal(amount), self._to_decimal(rate))
+        if self._quantum is not None:
+            product = product.quantize(self._quantum, context=self.context)
+        return product
+
+    def _vectorized(self, count: int) -> bool:
+        return self.vectorize and count >= self.VECTORIZE_THRESHOLD and self.rounding != decimal.ROUND_05UP
+
+    def _multiply_scaled(self, amounts: List[float], rate: float) -> Optional[List[float]]:
+        """
+        The Decimal loop's results computed on int64 arrays, None when the numbers do not fit.
+
+        Each amount becomes amount * 10**amount_scale and the rate its digits as one integer, so
+        their product is the exact decimal product as an integer with amount_scale + rate_scale
+        decimals; dividing that by a power of ten with the rounding mode gives places decimals.
+        Products with more significant digits than the context precision are left to the loop.
+        """
+        values = np.asarray(amounts, dtype=np.float64)
+        limit = np.abs(values).max(initial=0.0)
+        for amount_scale in range(self.MAX_AMOUNT_DECIMALS + 1):
+            multiplier = 10 ** amount_scale
+            if limit * multiplier >= self.MAX_EXACT_FLOAT:
+                return None
+            scaled = np.round(values * multiplier)
+            # The integers are the amounts' digits only if they round-trip to the same floats
+            if np.array_equal(scaled / multiplier, values):
+                break
+        else:
+            return None
+        sign, digits, exponent = self._to_decimal(rate).as_tuple()
+        if not isinstance(exponent, int):
+            return None
+        rate_digits = int("".join(map(str, digits)) or "0") * (-1 if sign else 1)
+        rate_scale = max(-exponent, 0)
+        rate_digits *= 10 ** max(exponent, 0)
+        if int(limit * multiplier) * abs(rate_digits) > self.MAX_INT64:
+            return None
+
+        products = scaled.astype(np.int64) * np.int64(rate_digits)
+        # The Decimal loop rounds products longer than the context precision, which integers do not
+        if int(np.abs(products).max(initial=0)) >= 10 ** self.context.prec:
+            return None
+        scale = amount_scale + rate_scale
+        if self.places is not None and scale > self.places:
+            products = self._round_integer_division(products, 10 ** (scale - self.places))
+            scale = self.places
+        if np.abs(products).max(initial=0) >= self.MAX_EXACT_FLOAT or scale > 22:
+            return None
+        # Both operands are exact floats, so the division is the correctly rounded decimal
+        return (products.astype(np.float64) / float(10 ** scale)).tolist()
+
+    def _round_integer_division(self, numerators, divisor: int):
+        """numerators / divisor rounded to integers with the rounding mode (works on ints and int64 arrays)."""
+        quotients = numerators // divisor
+        remainders = numerators - quotients * divisor
+        # Floor division already rounded down; decide per mode where to step up instead
+        inexact = remainders > 0
+        above_half = 2 * remainders > divisor
+        tie = 2 * remainders == divisor
+        positive = numerators >= 0
+        negative = numerators < 0
+        step_up = {
+            decimal.ROUND_FLOOR: inexact & False,
+            decimal.ROUND_CEILING: inexact,
+            decimal.ROUND_DOWN: inexact & negative,
+            decimal.ROUND_UP: inexact & positive,
+            decimal.ROUND_HALF_UP: above_half | (tie & positive),
+            decimal.ROUND_HALF_DOWN: above_half | (tie & negative),
+            decimal.ROUND_HALF_EVEN: above_half | (tie & (quotients % 2 == 1)),
+        }[self.rounding]
+        return quotients + step_up
+
+    @staticmethod
+    def _to_decimal(number: float) -> Decimal:
+        # str() gives a float's shortest round-tripping digits, not its binary expansion
+        return number if isinstance(number, Decimal) else Decimal(str(number))
+
+    def _open_calculator(self) -> None:
+        self.calculator_open = True
+
+    def _close_calculator(self) -> None:
+        self.calculator_open = False
+
+    def perform_calculation(self, amount: float, rate: float) -> float:
+        return float(self.multiply(amount, rate))
+
+    def get_calculator_info(self) -> Dict[str, str]:
+        return {
+            "name": "decimal",
+            "type": self.CALCULATOR_TYPE,
+            "places": "exact" if self.places is None else str(self.places),
+            "rounding": self.rounding,
+            "vectorized": str(self.vectorize)
+        }
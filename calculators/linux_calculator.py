@@ -2,8 +2,11 @@
 import subprocess
 import time
 import pyautogui
-import pyperclip
 from typing import Dict, List
+from utils.conversion_planner import pair_label
+from utils.logger import log_warning
+from utils.x11_clipboard import X11Clipboard
+from utils.x11_windows import X11Windows
 from .base_calculator import BaseCalculator
 
 
@@ -13,15 +16,23 @@ class LinuxCalculator(BaseCalculator):
     # === Constants ===
     CALCULATOR_CMD = "gnome-calculator"
     CALCULATOR_KILL_CMD = "pkill"
-    WINDOW_SEARCH_CMD = ["wmctrl", "-l", "-p"]
-    WINDOW_ACTIVATE_CMD = "wmctrl"
     CALCULATOR_WINDOW_NAME = "Calculator"
+    WINDOW_TIMEOUT = 10
+    CLOSE_TIMEOUT = 5
+    RESULT_TIMEOUT = 5
+    RESULT_POLL_INTERVAL = 0.05
     CALCULATOR_VERSION = "3.38.0"
     CALCULATOR_TYPE = "Scientific"
 
     def __init__(self):
         super().__init__()
         self.calculator_process = None
+        # In-process X11 client (wmctrl when python-xlib or the display is unavailable), created on first use
+        self.windows = None
+        # Resolved once per launch, looked up again only when the window disappears
+        self.calculator_window = None
+        # Clipboard reader on the same X connection (pyperclip without python-xlib), created on first use
+        self.clipboard = None
 
     def get_platform_name(self) -> str:
         return "Linux"
@@ -34,43 +45,29 @@ class LinuxCalculator(BaseCalculator):
             return False
 
     def calculate_conversions(self, amounts: List[float], exchange_rates: Dict, source: str) -> Dict:
-        calculator_results = self._create_results_structure(amounts, exchange_rates, source)
-        self._open_calculator()
+        calculator_results = self.create_results_structure(amounts, exchange_rates, source)
+        self.acquire_calculator()
         try:
-            self._log_calculation_start("EUR", exchange_rates['eur'])
-            for amount in amounts:
-                result = self._perform_calculation(amount, exchange_rates["eur"])
-                calculator_results["eur"]["conversions"][amount] = result
-                self._log_calculation_result(amount, exchange_rates['eur'], result, "EUR")
-
-            self._log_calculation_start("USD", exchange_rates['usd'])
-            for amount in amounts:
-                result = self._perform_calculation(amount, exchange_rates["usd"])
-                calculator_results["usd"]["conversions"][amount] = result
-                self._log_calculation_result(amount, exchange_rates['usd'], result, "USD")
+            for key, rate in exchange_rates.items():
+                label = pair_label(key)
+                self._log_calculation_start(label, rate)
+                for amount in amounts:
+                    result = self.perform_calculation(amount, rate)
+                    calculator_results[key]["conversions"][amount] = result
+                    self.log_calculation_result(amount, rate, result, label)
         finally:
-            self._close_calculator()
+            self.release_calculator()
         return calculator_results
 
     def _open_calculator(self) -> None:
         try:
             subprocess.run([self.CALCULATOR_KILL_CMD, self.CALCULATOR_CMD], check=False)
-            time.sleep(1)
+            # A leftover window would be found instead of the new one
+            self._wait_for_window_gone()
             self.calculator_process = subprocess.Popen([self.CALCULATOR_CMD])
-            time.sleep(2)
-
-            window_list = subprocess.check_output(self.WINDOW_SEARCH_CMD).decode()
-            calculator_window = None
-            for line in window_list.split('\n'):
-                if self.CALCULATOR_WINDOW_NAME in line:
-                    calculator_window = line.split()[0]
-                    break
-
-            if not calculator_window:
-                raise RuntimeError("Could not find calculator window")
-
-            subprocess.run([self.WINDOW_ACTIVATE_CMD, "-ia", calculator_window], check=False)
-            time.sleep(1)
+            self.calculator_window = self._window_manager().wait_for_window(self.CALCULATOR_WINDOW_NAME,
+                                                                           self.WINDOW_TIMEOUT)
+            self._focus_calculator()
 
             if self.calculator_process.poll() is not None:
                 raise RuntimeError("Failed to start calculator")
@@ -78,45 +75,87 @@ class LinuxCalculator(BaseCalculator):
         except Exception as e:
             raise Exception(f"Failed to open calculator: {str(e)}")
 
+    def _window_manager(self):
+        if self.windows is None:
+            self.windows = X11Windows.create()
+        return self.windows
+
+    def _find_calculator_window(self):
+        windows = self._window_manager()
+        if self.calculator_window is None or not windows.window_exists(self.calculator_window):
+            self.calculator_window = windows.find_window(self.CALCULATOR_WINDOW_NAME)
+        return self.calculator_window
+
+    def _focus_calculator(self) -> None:
+        calculator_window = self._find_calculator_window()
+
+        if not calculator_window:
+            raise RuntimeError("Could not find calculator window")
+
+        windows = self._window_manager()
+        if not windows.is_active(calculator_window):
+            windows.activate(calculator_window)
+            windows.wait_until_active(calculator_window)
+
+    def _clipboard_channel(self):
+        if self.clipboard is None:
+            self.clipboard = X11Clipboard.create(self._window_manager().display)
+        return self.clipboard
+
+    def _copy_result(self) -> str:
+        # The calculator solves on a worker thread: a copy taken too early still holds the typed
+        # expression, so copy again until the display shows a number
+        clipboard = self._clipboard_channel()
+        deadline = time.monotonic() + self.RESULT_TIMEOUT
+        while True:
+            result = clipboard.copy_from(lambda: pyautogui.hotkey('ctrl', 'c')).strip()
+            if self._is_number(result) or time.monotonic() >= deadline:
+                return result
+            time.sleep(self.RESULT_POLL_INTERVAL)
+
+    @staticmethod
+    def _is_number(text: str) -> bool:
+        try:
+            float(text.replace(',', '.').replace(' ', ''))
+            return True
+        except ValueError:
+            return False
+
+    def is_healthy(self) -> bool:
+        if not self.calculator_process or self.calculator_process.poll() is not None:
+            return False
+        try:
+            return self._find_calculator_window() is not None
+        except Exception:
+            return False
+
     def _close_calculator(self) -> None:
+        self.calculator_window = None
         if self.calculator_process:
             self.calculator_process.terminate()
             self.calculator_process = None
-            time.sleep(1)
+            self._wait_for_window_gone()
+
+    def _wait_for_window_gone(self) -> None:
+        if not self._window_manager().wait_for_window_gone(self.CALCULATOR_WINDOW_NAME, self.CLOSE_TIMEOUT):
+            log_warning(f"Calculator window still open after {self.CLOSE_TIMEOUT} s")
 
-    def _perform_calculation(self, amount: float, rate: float) -> float:
+    def perform_calculation(self, amount: float, rate: float) -> float:
         try:
             if self.calculator_process.poll() is not None:
                 self._open_calculator()
 
-            window_list = subprocess.check_output(self.WINDOW_SEARCH_CMD).decode()
-            calculator_window = None
-            for line in window_list.split('\n'):
-                if self.CALCULATOR_WINDOW_NAME in line:
-                    calculator_window = line.split()[0]
-                    break
-
-            if not calculator_window:
-                raise RuntimeError("Could not find calculator window")
-
-            subprocess.run([self.WINDOW_ACTIVATE_CMD, "-ia", calculator_window], check=False)
-            time.sleep(1)
+            self._focus_calculator()
 
+            # Keystrokes reach the focused window in order, so they need no pauses in between
             pyautogui.hotkey('ctrl', 'a')
             pyautogui.press('delete')
-            time.sleep(1)
 
             calculation = f"{amount}*{str(rate).replace('.', ',')}"
             pyautogui.write(calculation)
-            time.sleep(1)
             pyautogui.press('enter')
-            time.sleep(2)
 
-            pyperclip.copy('')
-            pyautogui.hotkey('ctrl', 'c')
-            time.sleep(1)
-
-            result = pyperclip.paste().strip()
+            result = self._copy_result()
             if not result:
                 raise RuntimeError("No result copied from calculator")
 
@@ -130,36 +169,19 @@ class LinuxCalculator(BaseCalculator):
 
     def calculate(self, calculation: str) -> str:
         try:
-            self._open_calculator()
-
-            window_list = subprocess.check_output(self.WINDOW_SEARCH_CMD).decode()
-            calculator_window = None
-            for line in window_list.split('\n'):
-                if self.CALCULATOR_WINDOW_NAME in line:
-                    calculator_window = line.split()[0]
-                    break
+            self.acquire_calculator()
 
-            if not calculator_window:
-                raise RuntimeError("Could not find calculator window")
-
-            subprocess.run([self.WINDOW_ACTIVATE_CMD, "-ia", calculator_window], check=False)
-            time.sleep(1)
+            self._focus_calculator()
 
+            # Keystrokes reach the focused window in order, so they need no pauses in between
             pyautogui.hotkey('ctrl', 'a')
             pyautogui.press('delete')
-            time.sleep(1)
 
             calculation = calculation.replace('.', ',')
             pyautogui.write(calculation)
-            time.sleep(1)
             pyautogui.press('enter')
-            time.sleep(2)
-
-            pyperclip.copy('')
-            pyautogui.hotkey('ctrl', 'c')
-            time.sleep(1)
 
-            result = pyperclip.paste().strip()
+            result = self._copy_result()
             if not result:
                 raise RuntimeError("No result copied from calculator")
 
@@ -167,7 +189,7 @@ class LinuxCalculator(BaseCalculator):
         except Exception as e:
             raise Exception(f"Failed to perform calculation: {str(e)}")
         finally:
-            self._close_calculator()
+            self.release_calculator()
 
     def get_calculator_info(self) -> Dict[str, str]:
         return {
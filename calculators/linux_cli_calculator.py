@@ -0,0 +1,143 @@
+import os
+import shutil
+import subprocess
+from decimal import Decimal
+from typing import Dict, List, Tuple
+from utils.conversion_planner import pair_label
+from utils.logger import log_debug
+from .base_calculator import BaseCalculator
+
+
+class LinuxCliCalculator(BaseCalculator):
+    """
+    Linux calculator backed by gcalccmd, GNOME Calculator's command-line solver.
+
+    Same arithmetic engine as the gnome-calculator window, without a display, window manager,
+    keyboard automation or clipboard: one gcalccmd process stays open per calculate_conversions
+    call, expressions are written to its stdin in batches and the answers read back line by line.
+    """
+
+    # === Constants ===
+    CALCULATOR_CMD = "gcalccmd"
+    # gcalccmd writes through stdio, which is block-buffered on a pipe; stdbuf makes it flush every line
+    LINE_BUFFER_CMD = ["stdbuf", "-oL"]
+    # Expressions written before reading their answers - keeps both pipes well below their buffer size
+    BATCH_SIZE = 200
+    PROMPT = "> "
+    SUPERSCRIPT_DIGITS = str.maketrans("⁰¹²³⁴⁵⁶⁷⁸⁹⁻", "0123456789-")
+    CALCULATOR_TYPE = "Command line"
+
+    def __init__(self):
+        super().__init__()
+        self.calculator_process = None
+
+    def get_platform_name(self) -> str:
+        return "Linux"
+
+    def check_dependencies(self) -> bool:
+        return shutil.which(self.CALCULATOR_CMD) is not None
+
+    def calculate_conversions(self, amounts: List[float], exchange_rates: Dict, source: str) -> Dict:
+        calculator_results = self.create_results_structure(amounts, exchange_rates, source)
+        self.acquire_calculator()
+        try:
+            for key, rate in exchange_rates.items():
+                label = pair_label(key)
+                self._log_calculation_start(label, rate)
+                results = self.calculate_batch([(amount, rate) for amount in amounts])
+                for amount, result in zip(amounts, results):
+                    calculator_results[key]["conversions"][amount] = result
+                    self.log_calculation_result(amount, rate, result, label)
+        finally:
+            self.release_calculator()
+        return calculator_results
+
+    def calculate_batch(self, calculations: List[Tuple[float, float]]) -> List[float]:
+        """
+        Multiply (amount, rate) pairs on the open solver.
+
+        Args:
+            calculations: Pairs to multiply, in order
+
+        Returns:
+            The products, in the same order
+        """
+        results = []
+        for start in range(0, len(calculations), self.BATCH_SIZE):
+            batch = calculations[start:start + self.BATCH_SIZE]
+            self._write_expressions([f"{self._plain(amount)}*{self._plain(rate)}" for amount, rate in batch])
+            results.extend(self._read_result() for _ in batch)
+        return results
+
+    def _open_calculator(self) -> None:
+        if self.calculator_process and self.calculator_process.poll() is None:
+            return
+        if not self.check_dependencies():
+            raise RuntimeError(f"{self.CALCULATOR_CMD} not found - install gnome-calculator")
+        command = [self.CALCULATOR_CMD]
+        if shutil.which(self.LINE_BUFFER_CMD[0]):
+            command = self.LINE_BUFFER_CMD + command
+        # The C locale makes '.' the decimal separator both ways
+        env = {**os.environ, "LC_ALL": "C", "LANG": "C"}
+        self.calculator_process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                                   stderr=subprocess.STDOUT, text=True, bufsize=1, env=env)
+        self.calculator_open = True
+        log_debug(f"Started {' '.join(command)} (pid {self.calculator_process.pid})")
+
+    def is_healthy(self) -> bool:
+        return self.calculator_process is not None and self.calculator_process.poll() is None
+
+    def _close_calculator(self) -> None:
+        if not self.calculator_process:
+            return
+        try:
+            # An empty line ends gcalccmd's read loop
+            self.calculator_process.communicate("\n", timeout=5)
+        except (subprocess.TimeoutExpired, OSError, ValueError):
+            self.calculator_process.kill()
+            self.calculator_process.wait()
+        self.calculator_process = None
+        self.calculator_open = False
+
+    def perform_calculation(self, amount: float, rate: float) -> float:
+        if not self.calculator_process or self.calculator_process.poll() is not None:
+            self._open_calculator()
+        return self.calculate_batch([(amount, rate)])[0]
+
+    @staticmethod
+    def _plain(number: float) -> str:
+        # gcalccmd reads neither Python's exponent notation (1e-05) nor thousands separators
+        return format(Decimal(repr(number)), "f")
+
+    def _write_expressions(self, expressions: List[str]) -> None:
+        try:
+            self.calculator_process.stdin.write("".join(f"{expression}\n" for expression in expressions))
+            self.calculator_process.stdin.flush()
+        except OSError as e:
+            raise RuntimeError(f"{self.CALCULATOR_CMD} stopped accepting input: {e}")
+
+    def _read_result(self) -> float:
+        line = self.calculator_process.stdout.readline()
+        if not line:
+            raise RuntimeError(f"{self.CALCULATOR_CMD} exited with code {self.calculator_process.poll()}")
+        # Prompts are printed without a newline, so they prefix the answer they precede
+        result = line.strip()
+        while result.startswith(self.PROMPT.strip()):
+            result = result[len(self.PROMPT.strip()):].strip()
+        return self._parse_result(result)
+
+    def _parse_result(self, result: str) -> float:
+        text = result.replace("−", "-").replace(" ", "")
+        try:
+            if "×10" in text:
+                mantissa, exponent = text.split("×10", 1)
+                return float(mantissa) * 10 ** int(exponent.translate(self.SUPERSCRIPT_DIGITS))
+            return float(text)
+        except ValueError:
+            raise RuntimeError(f"Failed to parse calculator result: {result}")
+
+    def get_calculator_info(self) -> Dict[str, str]:
+        return {
+            "name": self.CALCULATOR_CMD,
+            "type": self.CALCULATOR_TYPE
+        }
@@ -3,6 +3,7 @@ import time
 import pyperclip
 from pywinauto import Application
 from typing import Dict, List
+from utils.conversion_planner import pair_label
 from utils.logger import log_info, log_debug, log_error, log_warning
 from .base_calculator import BaseCalculator
 
@@ -25,22 +26,18 @@ class WindowsCalculator(BaseCalculator):
         return "Windows"
 
     def calculate_conversions(self, amounts: List[float], exchange_rates: Dict, source: str) -> Dict:
-        calculator_results = self._create_results_structure(amounts, exchange_rates, source)
-        self._open_calculator()
+        calculator_results = self.create_results_structure(amounts, exchange_rates, source)
+        self.acquire_calculator()
         try:
-            self._log_calculation_start("EUR", exchange_rates['eur'])
-            for amount in amounts:
-                result = self._perform_calculation(amount, exchange_rates["eur"])
-                calculator_results["eur"]["conversions"][amount] = result
-                self._log_calculation_result(amount, exchange_rates['eur'], result, "EUR")
-
-            self._log_calculation_start("USD", exchange_rates['usd'])
-            for amount in amounts:
-                result = self._perform_calculation(amount, exchange_rates["usd"])
-                calculator_results["usd"]["conversions"][amount] = result
-                self._log_calculation_result(amount, exchange_rates['usd'], result, "USD")
+            for key, rate in exchange_rates.items():
+                label = pair_label(key)
+                self._log_calculation_start(label, rate)
+                for amount in amounts:
+                    result = self.perform_calculation(amount, rate)
+                    calculator_results[key]["conversions"][amount] = result
+                    self.log_calculation_result(amount, rate, result, label)
         finally:
-            self._close_calculator()
+            self.release_calculator()
 
         return calculator_results
 
@@ -68,6 +65,14 @@ class WindowsCalculator(BaseCalculator):
                 log_error(f"Alternative connection failed: {e2}")
                 self.calculator_open = False
 
+    def is_healthy(self) -> bool:
+        try:
+            return (self.calculator_open and self.app is not None and self.app.is_process_running()
+                    and self.calculator.exists(timeout=1))
+        except Exception as e:
+            log_debug(f"Calculator health check failed: {e}")
+            return False
+
     def _close_calculator(self):
         try:
             if self.calculator_open and self.calculator:
@@ -92,7 +97,7 @@ class WindowsCalculator(BaseCalculator):
             log_error(f"Error pasting number {number_str}: {e}")
             raise
 
-    def _perform_calculation(self, amount: float, rate: float) -> float:
+    def perform_calculation(self, amount: float, rate: float) -> float:
         try:
             if not self.calculator_open or not self.calculator:
                 raise Exception("Calculator not properly initialized")
@@ -1,6 +1,13 @@
 import pytest
 import os
 from datetime import datetime
+from calculators import CalculatorService
+from pages.base_page import BasePage
+from utils.browser_profile import BrowserProfile
+from utils.browser_server import BrowserServer
+from utils.context_pool import ContextPool
+from utils.os_utils import default_calculator_backend
+from utils.stub_server import StubConverterServer, StubSiteConfig
 
 
 @pytest.fixture(scope="session")
@@ -25,10 +32,181 @@ def browser_launch_args():
 @pytest.fixture(scope="session")
 def browser_context_args():
     """Configure browser context arguments."""
-    return {
+    context_args = {
         "viewport": {"width": 1280, "height": 720},
         "locale": "en-US",
     }
+    if os.getenv("HAR_MODE", "off") != "off":
+        # Service workers would bypass HAR recording/replay routes
+        context_args["service_workers"] = "block"
+    return context_args
+
+
+@pytest.fixture(scope="session")
+def browser(request, browser_name):
+    """
+    Session browser - a connection to the shared browser server when BROWSER_SERVER=true,
+    pytest-playwright's own launch otherwise. Both take pytest-playwright's launch options
+    (--headed, --slowmo, browser_type_launch_args). Tests still get a fresh context each.
+    The server is connected to once per session; if it dies mid-session, the next session
+    relaunches it.
+    """
+    server = BrowserServer.from_env()
+    if server and browser_name != "chromium":
+        print(f"BROWSER_SERVER ignored: the browser server runs Chromium, not {browser_name}")
+        server = None
+    if server:
+        playwright = request.getfixturevalue("playwright")
+        browser = server.connect(playwright, request.getfixturevalue("browser_type_launch_args"))
+        print(f"Browser server: {server.status()['endpoint']}")
+    else:
+        browser = request.getfixturevalue("launch_browser")()
+    
+    yield browser
+    
+    # Disconnects from a browser server without stopping it
+    browser.close()
+
+
+@pytest.fixture(scope="session")
+def browser_profile():
+    """Persistent browser state - controlled by BROWSER_PROFILE_DIR and BROWSER_STORAGE_STATE."""
+    profile = BrowserProfile.from_env()
+    print(f"Browser profile: user_data_dir={profile.user_data_dir}, storage_state={profile.storage_state_path}")
+    return profile
+
+
+@pytest.fixture(scope="session")
+def context_pool(request, browser_profile, browser_type_launch_args, browser_context_args):
+    """
+    Session-wide pool of browser contexts - controlled by CONTEXT_REUSE.
+    
+    Contexts come from the persistent profile when one is configured, launched with
+    pytest-playwright's launch options (--headed, --slowmo) like the session browser, and
+    from the session browser otherwise. With CONTEXT_REUSE=true released contexts stay warm
+    for the next test; their cookies and storage are cleared unless a browser profile asks
+    to keep them.
+    """
+    if browser_profile.user_data_dir:
+        browser_type = request.getfixturevalue("browser_type")
+        factory = lambda: browser_profile.launch_persistent(browser_type, **browser_type_launch_args,
+                                                            **browser_context_args)
+    else:
+        browser = request.getfixturevalue("browser")
+        factory = lambda: browser.new_context(**browser_context_args, **browser_profile.context_args())
+    reuse = _context_reuse()
+    print(f"Browser context pool: reuse={reuse}")
+    
+    pool = ContextPool.for_profile(factory, browser_profile, reuse=reuse)
+    yield pool
+    pool.close()
+
+
+@pytest.fixture
+def context(request, browser_profile):
+    """
+    Browser context for one test.
+    
+    By default a fresh context from pytest-playwright's new_context, so tracing, video and
+    failure screenshots work as usual; leased from the session pool when CONTEXT_REUSE=true
+    or a persistent profile directory is configured.
+    """
+    if _context_reuse() or browser_profile.user_data_dir:
+        with request.getfixturevalue("context_pool").lease() as context:
+            yield context
+        return
+    context = request.getfixturevalue("new_context")(**browser_profile.context_args())
+    yield context
+    browser_profile.save_storage_state(context)
+
+
+@pytest.fixture(scope="session")
+def stub_sites():
+    """Local stand-in converter sites - started when STUB_SITES=true, None otherwise."""
+    if os.getenv("STUB_SITES", "false").lower() != "true":
+        yield None
+        return
+    
+    config = StubSiteConfig(
+        latency_ms=int(os.getenv("STUB_LATENCY_MS", "50")),
+        jitter_ms=int(os.getenv("STUB_JITTER_MS", "0")),
+        tick_interval=float(os.getenv("STUB_TICK_INTERVAL", "0")),
+        failure_rate=float(os.getenv("STUB_FAILURE_RATE", "0")),
+    )
+    print(f"Stub sites config: latency_ms={config.latency_ms}, jitter_ms={config.jitter_ms}, "
+          f"tick_interval={config.tick_interval}, failure_rate={config.failure_rate}")
+    with StubConverterServer(config) as server:
+        yield server
+
+
+@pytest.fixture(scope="session")
+def calculator_service():
+    """
+    Calculator shared by every CurrencyConverter - controlled by the CALCULATOR_* environment variables.
+    
+    Nothing is imported or launched until the first calculation, so stub-only and web-only runs
+    never touch the calculator app. With CALCULATOR_SESSION=true (default) the app is launched
+    on first use, reused by every later source and test (relaunched if it fails its health
+    check) and closed at session end. Without CALCULATOR_BACKEND, runs against the stand-in
+    sites and runs without a display use the in-process Decimal reference.
+    """
+    backend = os.getenv("CALCULATOR_BACKEND")
+    if not backend:
+        stub_run = os.getenv("STUB_SITES", "false").lower() == "true"
+        backend = "decimal" if stub_run else default_calculator_backend()
+    options = {
+        "sample_size": int(os.getenv("CALCULATOR_SAMPLE_SIZE", "0")) or None,
+        "sample_seed": int(os.getenv("CALCULATOR_SAMPLE_SEED")) if os.getenv("CALCULATOR_SAMPLE_SEED") else None,
+    }
+    if backend == "decimal":
+        places = os.getenv("CALCULATOR_DECIMAL_PLACES")
+        options["places"] = int(places) if places else None
+        options["rounding"] = os.getenv("CALCULATOR_ROUNDING", "ROUND_HALF_EVEN")
+    session = os.getenv("CALCULATOR_SESSION", "true").lower() == "true"
+    print(f"Calculator config: backend={backend}, options={options}, session={session}")
+    
+    service = CalculatorService(backend, **options)
+    if session:
+        service.open_session()
+    yield service
+    service.close_session()
+
+
+@pytest.fixture(scope="session")
+def converter_options(stub_sites, calculator_service, browser_type_launch_args):
+    """Configure CurrencyConverter modes - controlled by environment variables."""
+    capture_rates = os.getenv("CAPTURE_RATES", "false").lower() == "true"
+    wise_wait_mode = os.getenv("WISE_WAIT_MODE", "value")
+    sample_size = int(os.getenv("SAMPLE_SIZE", "0")) or None
+    sample_seed = int(os.getenv("SAMPLE_SEED")) if os.getenv("SAMPLE_SEED") else None
+    page_count = int(os.getenv("PAGE_COUNT", "1"))
+    block_resources = os.getenv("BLOCK_RESOURCES", "false").lower() == "true"
+    har_mode = os.getenv("HAR_MODE", "off")
+    conversion_strategy = os.getenv("CONVERSION_STRATEGY", "steps")
+    http_sources = [source.strip() for source in os.getenv("HTTP_SOURCES", "").split(",") if source.strip()]
+    pipeline = os.getenv("CALCULATOR_PIPELINE", "false").lower() == "true"
+    
+    print(f"Converter config: capture_rates={capture_rates}, wise_wait_mode={wise_wait_mode}, "
+          f"sample_size={sample_size}, sample_seed={sample_seed}, page_count={page_count}, "
+          f"block_resources={block_resources}, har_mode={har_mode}, conversion_strategy={conversion_strategy}, "
+          f"http_sources={http_sources}, pipeline={pipeline}")
+    
+    return {
+        "capture_rates": capture_rates,
+        "wise_wait_mode": wise_wait_mode,
+        "sample_size": sample_size,
+        "sample_seed": sample_seed,
+        "page_count": page_count,
+        "block_resources": block_resources,
+        "har_mode": har_mode,
+        "conversion_strategy": conversion_strategy,
+        "http_sources": http_sources,
+        "pipeline": pipeline,
+        "calculator": calculator_service,
+        # Playwright launches headless unless --headed (or browser_type_launch_args) says otherwise
+        "headed": not browser_type_launch_args.get("headless", True),
+        "site_urls": stub_sites.site_urls() if stub_sites else None,
+    }
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -61,8 +239,15 @@ def verification_collector():
     return collect_result
 
 
+def pytest_sessionstart(session):
+    """Hook that runs before any test - start the wait and locator statistics from zero."""
+    BasePage.reset_stats()
+
+
 def pytest_sessionfinish(session, exitstatus):
     """Hook that runs after all tests complete to print summary."""
+    _print_wait_savings()
+    _print_locator_report()
     if verification_results_storage:
         try:
             # Print summary
@@ -82,6 +267,33 @@ def pytest_sessionfinish(session, exitstatus):
             print(f"\nError generating consolidated report summary: {str(e)}")
 
 
+def _context_reuse() -> bool:
+    """Whether tests share warm browser contexts (CONTEXT_REUSE, off by default)."""
+    return os.getenv("CONTEXT_REUSE", "false").lower() == "true"
+
+
+def _print_wait_savings():
+    """Print how much wall-clock time the adaptive page waits saved against the fixed sleeps they replaced."""
+    savings = BasePage.wait_savings()
+    if not savings["waits"]:
+        return
+    print(f"\nAdaptive waits: {savings['waits']} waits took {savings['seconds']:.2f} s "
+          f"({savings['timed_out']} timed out); they replaced {savings['replaced_seconds']:.2f} s of fixed sleeps, "
+          f"saving {savings['saved_seconds']:.2f} s")
+
+
+def _print_locator_report():
+    """Print which fallback of every self-healing page locator matched."""
+    matches = BasePage.locator_report()
+    if not matches:
+        return
+    print(f"\nPage locators ({sum(1 for m in matches if m['fallback'])} resolved through a fallback):")
+    for match in matches:
+        label = f"fallback {match['fallback']}" if match["fallback"] else "primary"
+        print(f"  {match['source']} {match['locator']}: {label} '{match['selector']}' "
+              f"({match['seconds'] * 1000:.0f} ms)")
+
+
 def _get_test_logs() -> str:
     """Read the current test logs."""
     try:
@@ -1,21 +1,531 @@
-from playwright.sync_api import Page
-from typing import Dict, List
+from playwright.sync_api import Locator, Page, Response, TimeoutError as PlaywrightTimeoutError
+from typing import Callable, Dict, List, Optional, Tuple
+import os
+import random
 import re
+import threading
+import time
+from urllib.parse import urlparse
+from utils.logger import log_info, log_debug, log_warning
+from utils.conversion_planner import count_selections, plan_conversions
+from utils.locator_chain import LocatorCache, LocatorChain, is_css_selector
+from utils.rate_payloads import RateTable, rate_from_tables
+from utils.route_profile import RouteProfile
+from utils.sampling import choose_sample, merge_sampled_results
 
 
 class BasePage:
     """Base page with common currency conversion logic."""
     
-    def __init__(self, page: Page):
+    URL = ""
+    SOURCE_NAME = ""
+    TARGET_CURRENCIES = ()
+    
+    # Network rate capture - subclasses set the pattern of their rate/quote endpoints
+    RATE_RESPONSE_PATTERN = None
+    RATE_CAPTURE_TIMEOUT = 5000
+    
+    # Largest allowed difference between a sampled UI conversion and the locally derived value
+    SPOT_CHECK_TOLERANCE = 0.02
+    
+    # Route profile - requests aborted before navigation when resource blocking is on.
+    # Hosts outside ROUTE_ALLOWED_DOMAINS count as third-party; an empty tuple allows every host.
+    ROUTE_ALLOWED_DOMAINS = ()
+    ROUTE_BLOCKED_DOMAINS = (
+        "doubleclick.net", "google-analytics.com", "googletagmanager.com", "googlesyndication.com",
+        "facebook.net", "hotjar.com", "segment.io", "optimizely.com",
+    )
+    ROUTE_BLOCKED_RESOURCE_TYPES = ("image", "media", "font")
+    
+    # Consent banner button, accepted once when priming a persistent browser profile
+    CONSENT_BUTTON = None
+    
+    # HAR record/replay - traffic is stored per source in HAR_DIR/<HAR_NAME>.har
+    HAR_MODES = ("off", "record", "replay")
+    HAR_DIR = "hars"
+    HAR_NAME = ""
+    
+    # Self-healing locators - LocatorChain attributes resolve to their first fallback present on the
+    # page, trying the previous run's winner (LocatorCache) first; matches are listed by locator_report()
+    LOCATOR_TIMEOUT = 30000
+    locator_cache: Optional[LocatorCache] = None
+    _locator_matches: Dict[str, Dict] = {}
+    
+    # Result extraction - the converted amount is read from EXTRACT_AMOUNT_SELECTOR (input value or text);
+    # when EXTRACT_RATE_SELECTOR is set, its nodes are searched for a '1 FROM = x TO' rate line
+    EXTRACT_AMOUNT_SELECTOR = None
+    EXTRACT_RATE_SELECTOR = None
+    
+    # Reads and parses the result in one page.evaluate round-trip, mirroring
+    # extract_number_from_text and the rate line parsing of earlier versions
+    EXTRACTION_SCRIPT = r"""([amountSelector, rateSelector, fromCurrency]) => {
+        const parseNumber = (text) => {
+            const match = (text || "").replace(/[, ]/g, "").match(/[\d.]+/);
+            const value = match ? parseFloat(match[0]) : 0;
+            return Number.isFinite(value) ? value : 0;
+        };
+        const amountNode = amountSelector ? document.querySelector(amountSelector) : null;
+        const amountText = !amountNode ? "" : amountNode.matches("input, textarea") ? amountNode.value : amountNode.textContent;
+        let rateText = "";
+        let rate = 0;
+        if (rateSelector && fromCurrency) {
+            const escaped = fromCurrency.replace(/[.*+?^${}()|[\]\\]/g, "\\$&");
+            const pattern = new RegExp("1\\s+" + escaped + "\\s*=\\s*([\\d,]+\\.?\\d*)", "i");
+            for (const node of document.querySelectorAll(rateSelector)) {
+                const match = (node.textContent || "").match(pattern);
+                if (match) {
+                    rate = parseFloat(match[1].replace(/,/g, "")) || 0;
+                    if (rate) {
+                        rateText = node.textContent;
+                        break;
+                    }
+                }
+            }
+        }
+        return {amountText: amountText || "", amount: parseNumber(amountText), rateText, rate};
+    }"""
+    
+    # Adaptive waits - condition-based replacements for fixed sleeps. Each wait is recorded with how
+    # long it took and how much of the sleep it replaced it saved; process-wide totals in wait_savings()
+    WAIT_TIMEOUT = 10000
+    STABLE_VALUE_MS = 300
+    
+    # Text of a node - the value for inputs, the text content otherwise ("" when missing)
+    READ_TEXT_SCRIPT = """(selector) => {
+        const node = document.querySelector(selector);
+        if (!node) return "";
+        return (node.matches("input, textarea") ? node.value : node.textContent) || "";
+    }"""
+    
+    # Resolves once the node's text is non-empty and differs from the previous text
+    TEXT_CHANGED_SCRIPT = """([selector, previous]) => {
+        const node = document.querySelector(selector);
+        if (!node) return false;
+        const text = node.matches("input, textarea") ? node.value : node.textContent;
+        return !!text && text !== previous;
+    }"""
+    
+    # Resolves true once the node's text has been non-empty and unchanged for stableMs, false on timeout
+    VALUE_STABLE_SCRIPT = """([selector, stableMs, timeout]) => new Promise((resolve) => {
+        const read = () => {
+            const node = document.querySelector(selector);
+            if (!node) return "";
+            return (node.matches("input, textarea") ? node.value : node.textContent) || "";
+        };
+        const start = performance.now();
+        let last = read();
+        let since = start;
+        const check = () => {
+            const now = performance.now();
+            const text = read();
+            if (text !== last) {
+                last = text;
+                since = now;
+            }
+            if (last && now - since >= stableMs) {
+                resolve(true);
+            } else if (now - start >= timeout) {
+                resolve(false);
+            } else {
+                setTimeout(check, 20);
+            }
+        };
+        check();
+    })"""
+    
+    # Wall-clock totals of every adaptive wait in this process, shared by all page objects; _stats_lock
+    # guards them and _locator_matches, since sharded and concurrent scrapes record from several threads
+    WAIT_TOTALS = {"waits": 0, "seconds": 0.0, "replaced_seconds": 0.0, "saved_seconds": 0.0, "timed_out": 0}
+    _wait_totals = dict(WAIT_TOTALS)
+    _stats_lock = threading.Lock()
+    
+    # Conversion strategies - "steps" drives every amount from Python, "batch" hands the whole
+    # amount list to BATCH_CONVERSION_SCRIPT and gets every result back in one call
+    CONVERSION_STRATEGIES = ("steps", "batch")
+    BATCH_AMOUNT_INPUT = None
+    BATCH_RESULT_TIMEOUT = 10000
+    
+    # Enters each amount, waits for the result node to change and extracts it with EXTRACTION_SCRIPT.
+    # Changes are picked up by a MutationObserver; input values change without DOM mutations, so an
+    # input result node is additionally checked once per animation frame.
+    BATCH_CONVERSION_SCRIPT = r"""async ([inputSelector, extractArgs, amounts, timeout]) => {
+        const extract = """ + EXTRACTION_SCRIPT + r""";
+        const input = document.querySelector(inputSelector);
+        if (!input) {
+            throw new Error("Amount input " + inputSelector + " not found");
+        }
+        const setValue = Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, "value").set;
+        const readResult = () => extract(extractArgs).amountText;
+        const resultIsInput = () => {
+            const node = extractArgs[0] ? document.querySelector(extractArgs[0]) : null;
+            return !!node && node.matches("input, textarea");
+        };
+
+        const waitForResult = (previous, expectChange) => new Promise((resolve) => {
+            let done = false;
+            let observer = null;
+            let timer = null;
+            const finish = (timedOut) => {
+                done = true;
+                observer.disconnect();
+                clearTimeout(timer);
+                resolve(timedOut);
+            };
+            const check = () => {
+                const text = readResult();
+                if (!done && text && (!expectChange || text !== previous)) {
+                    finish(false);
+                }
+            };
+            const poll = () => {
+                check();
+                if (!done) {
+                    requestAnimationFrame(poll);
+                }
+            };
+            observer = new MutationObserver(check);
+            observer.observe(document.body, {subtree: true, childList: true, characterData: true, attributes: true});
+            timer = setTimeout(() => finish(true), timeout);
+            if (resultIsInput()) {
+                poll();
+            } else {
+                check();
+            }
+        });
+
+        const results = [];
+        for (const amount of amounts) {
+            const start = performance.now();
+            const previous = readResult();
+            const unchanged = parseFloat((input.value || "").replace(/[, ]/g, "")) === amount;
+            input.focus();
+            setValue.call(input, String(amount));
+            input.dispatchEvent(new Event("input", {bubbles: true}));
+            input.dispatchEvent(new Event("change", {bubbles: true}));
+            input.blur();
+            const timedOut = await waitForResult(previous, !unchanged);
+            results.push(Object.assign(extract(extractArgs), {timedOut, ms: performance.now() - start}));
+        }
+        return results;
+    }"""
+    
+    def __init__(self, page: Page, capture_rates: bool = False, sample_size: Optional[int] = None,
+                 sample_seed: Optional[int] = None, block_resources: bool = False, har_mode: str = "off",
+                 url: Optional[str] = None, conversion_strategy: str = "steps"):
         self.page = page
+        self.url = url or self.URL
+        self.timings: List[Dict] = []
+        self.sample_size = sample_size
+        self._sampler = random.Random(sample_seed)
+        self._selected_from_currency = None
+        self._selected_to_currency = None
+        self.capture_rates = capture_rates and self.RATE_RESPONSE_PATTERN is not None
+        self.captured_rate_tables: List[RateTable] = []
+        self._rate_capture_missed = False
+        if self.capture_rates:
+            self.page.on("response", self._capture_rate_response)
+        if har_mode not in self.HAR_MODES:
+            raise ValueError(f"Unsupported HAR mode '{har_mode}', expected one of {self.HAR_MODES}")
+        self.har_mode = har_mode
+        if conversion_strategy not in self.CONVERSION_STRATEGIES:
+            raise ValueError(f"Unsupported conversion strategy '{conversion_strategy}', "
+                             f"expected one of {self.CONVERSION_STRATEGIES}")
+        self.conversion_strategy = conversion_strategy
+        # The page's own host is first-party even when it is served from elsewhere (e.g. stand-in sites)
+        self.route_profile = (self.create_route_profile(urlparse(self.url).hostname or "")
+                              if block_resources else None)
+        self._route_installed = False
+        self._resolved_selectors: Dict[Tuple[str, bool], str] = {}
+        # Called with each pair's results as soon as the pair is complete, e.g. CalculatorPipeline.feed
+        self.result_listener: Optional[Callable[[List[Dict]], None]] = None
+    
+    @classmethod
+    def create_route_profile(cls, *extra_allowed_domains: str) -> RouteProfile:
+        """Build the route profile from the page class's allow/deny lists."""
+        allowed = cls.ROUTE_ALLOWED_DOMAINS + tuple(d for d in extra_allowed_domains if d)
+        return RouteProfile(allowed, cls.ROUTE_BLOCKED_DOMAINS, cls.ROUTE_BLOCKED_RESOURCE_TYPES)
+    
+    @classmethod
+    def har_path(cls) -> str:
+        """Path of the source's HAR file."""
+        return os.path.join(cls.HAR_DIR, f"{cls.HAR_NAME or cls.SOURCE_NAME.lower()}.har")
+    
+    def _har_route_options(self) -> Optional[Dict]:
+        """
+        Arguments for page.route_from_har in the current HAR mode.
+        
+        Recording updates the HAR (written when the context closes); replaying serves
+        everything from it and aborts requests it does not contain, so no request
+        reaches the network.
+        """
+        if self.har_mode == "off":
+            return None
+        path = self.har_path()
+        if self.har_mode == "record":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            log_info(f"  Recording {self.SOURCE_NAME} traffic to {path}")
+            return {"har": path, "update": True, "update_content": "embed"}
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"No HAR recorded for {self.SOURCE_NAME} at {path} - run with HAR_MODE=record first")
+        log_info(f"  Replaying {self.SOURCE_NAME} traffic from {path}")
+        return {"har": path, "not_found": "abort"}
     
     def navigate_to(self, url: str) -> None:
-        """Navigate to URL without sleeps."""
+        """Navigate to URL without sleeps, applying HAR routing and the route profile first when enabled."""
+        self._install_routes()
+        start = time.perf_counter()
         self.page.goto(url, timeout=30000)
         self.page.wait_for_load_state("domcontentloaded")
+        self._record_navigation(url, time.perf_counter() - start)
+    
+    def _install_routes(self) -> None:
+        """Install HAR routing and the route profile once, before the first navigation."""
+        if self._route_installed:
+            return
+        har_options = self._har_route_options()
+        if har_options:
+            self.page.route_from_har(**har_options)
+        if self.route_profile:
+            self.page.route("**/*", self.route_profile.handle_route)
+        self._route_installed = True
+    
+    def accept_consent(self, timeout: int = 5000) -> bool:
+        """Accept the site's consent banner if it shows up within the timeout."""
+        if not self.CONSENT_BUTTON:
+            return False
+        try:
+            # Optional element - any fallback is clicked directly instead of resolving the chain first
+            consent = self.CONSENT_BUTTON
+            self._any_of(consent.selectors if isinstance(consent, LocatorChain) else (consent,)).first.click(
+                timeout=timeout)
+            log_info(f"  Accepted {self.SOURCE_NAME} consent banner")
+            return True
+        except PlaywrightTimeoutError:
+            log_debug(f"  No {self.SOURCE_NAME} consent banner shown")
+            return False
+    
+    def _record_navigation(self, url: str, seconds: float) -> None:
+        """Record page load time together with what the route profile blocked so far."""
+        if not self.route_profile:
+            self.record_timing("navigation", seconds, url=url, blocked_requests=0)
+            return
+        stats = self.route_profile.stats
+        self.record_timing("navigation", seconds, url=url, blocked_requests=stats["blocked_requests"],
+                           blocked_by_reason=dict(stats["blocked_by_reason"]))
+        log_info(f"  {self.SOURCE_NAME} loaded in {seconds:.2f} s, route profile blocked "
+                 f"{stats['blocked_requests']} of {stats['blocked_requests'] + stats['allowed_requests']} requests")
+    
+    def record_timing(self, name: str, seconds: float, **details) -> Dict:
+        """Record how long a page operation actually took."""
+        timing = {"name": name, "seconds": seconds, **details}
+        self.timings.append(timing)
+        return timing
+    
+    def get_timings(self, name: str = None) -> List[Dict]:
+        """Get recorded timings, optionally filtered by operation name."""
+        if name is None:
+            return list(self.timings)
+        return [t for t in self.timings if t["name"] == name]
+    
+    def locator(self, chain, timeout: Optional[float] = None) -> Locator:
+        """Playwright locator of a LocatorChain's matching fallback (or of a plain selector)."""
+        return self.page.locator(self.resolve_selector(chain, timeout=timeout))
+    
+    def resolve_selector(self, chain, css: bool = False, timeout: Optional[float] = None) -> Optional[str]:
+        """
+        Resolve a LocatorChain to the selector of its first fallback present on the page.
+        
+        All fallbacks are awaited together, so a broken primary selector costs a few count()
+        round-trips instead of its full timeout. The match is kept for the page object's lifetime
+        and remembered for the next run.
+        
+        Args:
+            chain: LocatorChain, or a plain selector (returned unchanged)
+            css: Only consider plain CSS fallbacks - for selectors handed to in-page scripts
+            timeout: How long to wait for any fallback to appear, in ms (default LOCATOR_TIMEOUT)
+            
+        Returns:
+            The matching selector, or the first candidate when none appeared in time
+        """
+        if not isinstance(chain, LocatorChain):
+            return chain
+        if (chain.name, css) in self._resolved_selectors:
+            return self._resolved_selectors[(chain.name, css)]
+        candidates = self._selector_candidates(chain, css)
+        start = time.perf_counter()
+        try:
+            self._any_of(candidates).first.wait_for(
+                state="attached", timeout=self.LOCATOR_TIMEOUT if timeout is None else timeout)
+            winner = next((selector for selector in candidates if self.page.locator(selector).count()), None)
+        except PlaywrightTimeoutError:
+            winner = None
+        return self._remember_selector(chain, css, candidates, winner, time.perf_counter() - start)
+    
+    def _selector_candidates(self, chain: LocatorChain, css: bool) -> Tuple[str, ...]:
+        """A chain's fallbacks in trial order - the remembered winner first."""
+        selectors = chain.css_selectors if css else chain.selectors
+        if not selectors:
+            raise ValueError(f"{chain!r} has no CSS fallback usable by in-page scripts")
+        cached = self._locator_cache().winner(self.SOURCE_NAME, chain.name)
+        if cached in selectors:
+            selectors = (cached,) + tuple(s for s in selectors if s != cached)
+        return selectors
+    
+    def _any_of(self, selectors: Tuple[str, ...]) -> Locator:
+        """Locator matching any of the selectors."""
+        combined = self.page.locator(selectors[0])
+        for selector in selectors[1:]:
+            combined = combined.or_(self.page.locator(selector))
+        return combined
+    
+    def _remember_selector(self, chain: LocatorChain, css: bool, candidates: Tuple[str, ...],
+                           winner: Optional[str], seconds: float) -> str:
+        """Keep a chain's match for this page object, the next run and locator_report()."""
+        if winner is None:
+            # Not remembered - the caller's own wait on the first candidate reports the failure
+            log_warning(f"  No {self.SOURCE_NAME} {chain.name} fallback appeared: {', '.join(candidates)}")
+            return candidates[0]
+        self._resolved_selectors[(chain.name, css)] = winner
+        cache = self._locator_cache()
+        cached = cache.winner(self.SOURCE_NAME, chain.name)
+        # A CSS-only resolution must not displace a non-CSS winner of the full chain
+        if not (css and cached and not is_css_selector(cached)):
+            cache.remember(self.SOURCE_NAME, chain.name, winner)
+        
+        fallback = chain.selectors.index(winner)
+        self.record_timing("locator", seconds, locator=chain.name, selector=winner, fallback=fallback,
+                           tries=candidates.index(winner) + 1)
+        with BasePage._stats_lock:
+            BasePage._locator_matches[f"{self.SOURCE_NAME} {chain.name}"] = {
+                "source": self.SOURCE_NAME, "locator": chain.name, "selector": winner, "fallback": fallback,
+                "seconds": seconds
+            }
+        if fallback:
+            log_warning(f"  {self.SOURCE_NAME} {chain.name}: primary selector '{chain.primary}' matched nothing, "
+                        f"fallback {fallback} '{winner}' matched in {seconds * 1000:.0f} ms")
+        else:
+            log_debug(f"  {self.SOURCE_NAME} {chain.name} resolved to '{winner}' in {seconds * 1000:.0f} ms")
+        return winner
+    
+    def _locator_cache(self) -> LocatorCache:
+        """This page object's locator cache - the process-wide one unless locator_cache is set."""
+        return self.locator_cache or LocatorCache.shared()
+    
+    def _script_selector(self, chain) -> Optional[str]:
+        """CSS selector for in-page scripts - the resolved fallback, or the first CSS one before resolution."""
+        if not isinstance(chain, LocatorChain):
+            return chain
+        return self._resolved_selectors.get((chain.name, True)) or chain.css_selectors[0]
+    
+    def _resolve_script_selectors(self, *chains) -> None:
+        """Resolve the CSS fallbacks of chains an in-page script is about to query."""
+        for chain in chains:
+            self.resolve_selector(chain, css=True)
+    
+    @classmethod
+    def locator_report(cls) -> List[Dict]:
+        """
+        Process-wide locator matches.
+        
+        Returns:
+            One dict per resolved chain with source, locator name, matching selector, its fallback
+            index (0 = primary) and the seconds the resolution took
+        """
+        with BasePage._stats_lock:
+            matches = list(BasePage._locator_matches.values())
+        return sorted(matches, key=lambda m: (m["source"], m["locator"]))
+    
+    def read_text(self, selector) -> str:
+        """Current value (inputs) or text of the first node matching a chain or CSS selector, "" when there is none."""
+        return self.page.evaluate(self.READ_TEXT_SCRIPT, self.resolve_selector(selector, css=True))
+    
+    def wait_until_text_changes(self, selector, previous: str, timeout: Optional[float] = None,
+                                replaces: float = 0.0) -> bool:
+        """
+        Wait until a node shows non-empty text (or input value) different from the previous one.
+        
+        Args:
+            selector: LocatorChain or CSS selector of the node
+            previous: Text before the action that should change it
+            timeout: Timeout in ms (default WAIT_TIMEOUT)
+            replaces: Seconds of the fixed sleep this wait replaces, for the savings totals
+            
+        Returns:
+            True when the text changed, False on timeout
+        """
+        selector = self.resolve_selector(selector, css=True)
+        timeout = self.WAIT_TIMEOUT if timeout is None else timeout
+        start = time.perf_counter()
+        try:
+            self.page.wait_for_function(self.TEXT_CHANGED_SCRIPT, arg=[selector, previous], timeout=timeout)
+            changed = True
+        except PlaywrightTimeoutError:
+            log_warning(f"'{selector}' did not change from '{previous}' within {timeout} ms")
+            changed = False
+        self._record_wait("text_changes", selector, time.perf_counter() - start, not changed, replaces)
+        return changed
+    
+    def wait_until_value_stable(self, selector, stable_ms: Optional[float] = None,
+                                timeout: Optional[float] = None, replaces: float = 0.0) -> bool:
+        """
+        Wait until a node's text (or input value) is non-empty and has not changed for stable_ms.
+        
+        Args:
+            selector: LocatorChain or CSS selector of the node
+            stable_ms: How long the text must stay unchanged (default STABLE_VALUE_MS)
+            timeout: Timeout in ms (default WAIT_TIMEOUT)
+            replaces: Seconds of the fixed sleep this wait replaces, for the savings totals
+            
+        Returns:
+            True when the text settled, False on timeout
+        """
+        selector = self.resolve_selector(selector, css=True)
+        stable_ms = self.STABLE_VALUE_MS if stable_ms is None else stable_ms
+        timeout = self.WAIT_TIMEOUT if timeout is None else timeout
+        start = time.perf_counter()
+        stable = self.page.evaluate(self.VALUE_STABLE_SCRIPT, [selector, stable_ms, timeout])
+        if not stable:
+            log_warning(f"'{selector}' did not settle for {stable_ms} ms within {timeout} ms")
+        self._record_wait("value_stable", selector, time.perf_counter() - start, not stable, replaces)
+        return stable
+    
+    def _record_wait(self, kind: str, selector: str, seconds: float, timed_out: bool, replaces: float) -> None:
+        """Record an adaptive wait on this page and in the process-wide totals."""
+        saved = replaces - seconds if replaces else 0.0
+        self.record_timing("wait", seconds, kind=kind, selector=selector, timed_out=timed_out,
+                           replaced_seconds=replaces, saved_seconds=saved)
+        with BasePage._stats_lock:
+            totals = BasePage._wait_totals
+            totals["waits"] += 1
+            totals["seconds"] += seconds
+            totals["replaced_seconds"] += replaces
+            totals["saved_seconds"] += saved
+            totals["timed_out"] += timed_out
+        log_debug(f"      Waited {seconds * 1000:.0f} ms for {kind} on '{selector}'"
+                  f"{f' (replaces a {replaces:.1f} s sleep)' if replaces else ''}")
+    
+    @classmethod
+    def wait_savings(cls) -> Dict:
+        """
+        Process-wide adaptive wait totals.
+        
+        Returns:
+            Dict with the number of waits, the seconds they took, the seconds of fixed sleeps they
+            replaced, the wall-clock seconds saved against those sleeps and the number of timed out waits
+        """
+        with BasePage._stats_lock:
+            return dict(BasePage._wait_totals)
+    
+    @classmethod
+    def reset_stats(cls) -> None:
+        """Clear the process-wide wait totals and locator matches, e.g. at the start of a test session."""
+        with BasePage._stats_lock:
+            BasePage._wait_totals = dict(BasePage.WAIT_TOTALS)
+            BasePage._locator_matches = {}
     
     def create_result(self, amount: float, from_currency: str, to_currency: str, 
-                     converted_amount: float, exchange_rate: float, source: str) -> Dict:
+                     converted_amount: float, exchange_rate: float, source: str,
+                     method: str = "dom") -> Dict:
         """Create standardized result dictionary."""
         return {
             "amount": amount,
@@ -23,9 +533,96 @@ class BasePage:
             "to_currency": to_currency,
             "converted_amount": converted_amount,
             "exchange_rate": exchange_rate,
-            "source": source
+            "source": source,
+            "method": method
         }
     
+    def parse_rate_payload(self, payload) -> List[RateTable]:
+        """Parse a rate/quote JSON payload into rate tables - overridden by capturing subclasses."""
+        return []
+    
+    def _is_rate_response(self, response: Response) -> bool:
+        """Check whether a network response comes from the site's rate/quote endpoint."""
+        return (self.RATE_RESPONSE_PATTERN is not None
+                and bool(self.RATE_RESPONSE_PATTERN.search(response.url))
+                and response.ok)
+    
+    def _capture_rate_response(self, response: Response) -> None:
+        """Response listener storing rate tables from recognized JSON responses."""
+        if not self._is_rate_response(response):
+            return
+        try:
+            payload = response.json()
+        except Exception as e:
+            log_debug(f"      Ignoring unreadable rate response {response.url}: {e}")
+            return
+        self._store_rate_payload(payload, response.url)
+    
+    def _store_rate_payload(self, payload, url: str) -> None:
+        """Keep the rate tables found in a captured payload."""
+        tables = self.parse_rate_payload(payload)
+        if tables:
+            self.captured_rate_tables.extend(tables)
+            log_debug(f"      Captured {len(tables)} rate table(s) from {url}")
+    
+    def wait_for_captured_rate(self, from_currency: str, to_currency: str,
+                               timeout: float = None) -> Optional[float]:
+        """
+        Wait for a captured network rate for the pair.
+        
+        Returns:
+            The full-precision rate, or None when capture is off or no recognizable response arrived
+        """
+        if not self.capture_rates:
+            return None
+        timeout = self.RATE_CAPTURE_TIMEOUT if timeout is None else timeout
+        if self._rate_capture_missed and not self.captured_rate_tables:
+            # The site already stayed silent once - don't pay the timeout again
+            timeout = 0
+        deadline = time.perf_counter() + timeout / 1000
+        
+        rate = rate_from_tables(self.captured_rate_tables, from_currency, to_currency)
+        while rate is None:
+            remaining = (deadline - time.perf_counter()) * 1000
+            if remaining <= 0:
+                break
+            try:
+                response = self.page.wait_for_event(
+                    "response",
+                    predicate=lambda r: self._is_rate_response(r) or rate_from_tables(
+                        self.captured_rate_tables, from_currency, to_currency) is not None,
+                    timeout=remaining)
+                self._capture_rate_response(response)
+            except PlaywrightTimeoutError:
+                pass
+            rate = rate_from_tables(self.captured_rate_tables, from_currency, to_currency)
+        if rate is None and not self.captured_rate_tables:
+            self._rate_capture_missed = True
+        return rate
+    
+    def get_captured_conversions(self, amounts: List[float], from_currency: str, to_currency: str,
+                                 timeout: float = None) -> List[Dict]:
+        """
+        Build conversions from a captured network rate without touching the DOM.
+        
+        Returns:
+            One result per amount, or an empty list so the caller falls back to DOM scraping
+        """
+        rate = self.wait_for_captured_rate(from_currency, to_currency, timeout)
+        return self._build_captured_results(amounts, from_currency, to_currency, rate)
+    
+    def _build_captured_results(self, amounts: List[float], from_currency: str, to_currency: str,
+                                rate: Optional[float]) -> List[Dict]:
+        """Create results from a captured rate, or an empty list when there is none."""
+        if rate is None:
+            if self.capture_rates:
+                log_debug(f"  No {from_currency} → {to_currency} rate response captured, using DOM scraping")
+            return []
+        log_debug(f"  Captured {from_currency} → {to_currency} rate from network: {rate:.12f}")
+        return [self.create_result(amount, from_currency, to_currency, amount * rate, rate,
+                                   self.SOURCE_NAME, method="network")
+                for amount in amounts]
+    
     def calculate_exchange_rate(self, converted_amount: float, original_amount: float) -> float:
         """Calculate exchange rate from amounts."""
         if converted_amount > 0 and original_amount > 0:
@@ -40,6 +637,222 @@ class BasePage:
         match = re.search(r'([\d.]+)', clean_text)
         return float(match.group(1)) if match else 0.0
     
+    def _extract_data(self, original_amount: float) -> tuple:
+        """
+        Extract converted amount and exchange rate in a single browser round-trip.
+        
+        Returns:
+            (converted amount, exchange rate); the rate is calculated from the amounts when the
+            page shows no rate line
+        """
+        try:
+            self._resolve_script_selectors(self.EXTRACT_AMOUNT_SELECTOR, self.EXTRACT_RATE_SELECTOR)
+            extracted = self.page.evaluate(self.EXTRACTION_SCRIPT, self._extraction_args())
+        except Exception as e:
+            log_debug(f"      Failed to extract conversion: {e}")
+            extracted = {}
+        return self._finish_extraction(extracted, original_amount)
+    
+    def _extraction_args(self) -> list:
+        """Arguments of EXTRACTION_SCRIPT."""
+        return [self._script_selector(self.EXTRACT_AMOUNT_SELECTOR), self._script_selector(self.EXTRACT_RATE_SELECTOR),
+                self._selected_from_currency or "RSD"]
+    
+    def _finish_extraction(self, extracted: Dict, original_amount: float) -> tuple:
+        """Turn EXTRACTION_SCRIPT output into (converted amount, rate), calculating the rate when none was shown."""
+        converted_amount = float(extracted.get("amount") or 0.0)
+        exchange_rate = float(extracted.get("rate") or 0.0)
+        log_debug(f"      Extracted converted amount: {converted_amount} (from '{extracted.get('amountText', '')}')")
+        if exchange_rate:
+            log_debug(f"      Extracted exchange rate: {exchange_rate}")
+        else:
+            exchange_rate = self.calculate_exchange_rate(converted_amount, original_amount)
+            log_debug(f"      Calculated exchange rate: {exchange_rate}")
+        return converted_amount, exchange_rate
+    
+    def collect_pair_conversions(self, amounts: List[float], from_currency: str, to_currency: str) -> List[Dict]:
+        """
+        Collect conversions for one currency pair.
+        
+        Uses a captured network rate when available, otherwise drives the UI for every amount.
+        In sampling mode only a sample goes through the UI and the rest is derived from one rate.
+        """
+        captured = self.get_captured_conversions(amounts, from_currency, to_currency)
+        if self.sample_size:
+            return self._collect_sampled_conversions(amounts, from_currency, to_currency, captured)
+        
+        if captured:
+            log_info(f"  {from_currency} → {to_currency} rate captured from network, skipping DOM scraping")
+            return captured
+        
+        self._ensure_pair(from_currency, to_currency)
+        log_info(f"  Starting {from_currency} → {to_currency} conversions...")
+        results = self._convert_amounts(amounts, from_currency, to_currency)
+        log_info(f"  {from_currency} → {to_currency} conversions completed")
+        return results
+    
+    def _collect_sampled_conversions(self, amounts: List[float], from_currency: str, to_currency: str,
+                                     captured: List[Dict]) -> List[Dict]:
+        """Fetch the rate once, derive all amounts locally and spot check a sample through the UI."""
+        sampled_amounts = choose_sample(amounts, self.sample_size, self._sampler)
+        log_info(f"  Sampling {len(sampled_amounts)}/{len(amounts)} {from_currency} → {to_currency} "
+                 f"amounts through the UI: {sampled_amounts}")
+        
+        self._ensure_pair(from_currency, to_currency)
+        sampled = self._convert_amounts(sampled_amounts, from_currency, to_currency)
+        return merge_sampled_results(amounts, from_currency, to_currency, self.SOURCE_NAME, sampled, captured,
+                                     self.SPOT_CHECK_TOLERANCE)
+    
+    def submit_conversion(self, amount: float, from_currency: str, to_currency: str):
+        """Select the pair if needed and enter an amount without waiting for its result."""
+        self._ensure_pair(from_currency, to_currency)
+        return self._submit_amount(amount, to_currency)
+    
+    def read_conversion(self, amount: float, from_currency: str, to_currency: str, pending) -> Dict:
+        """Wait for a submitted amount's result and read it."""
+        return self._read_amount(amount, to_currency, pending)
+    
+    @property
+    def selected_pair(self) -> Tuple[Optional[str], Optional[str]]:
+        """The (from, to) currencies currently selected on the page."""
+        return self._selected_from_currency, self._selected_to_currency
+    
+    def _ensure_pair(self, from_currency: str, to_currency: str) -> None:
+        """Select the FROM and TO currencies unless they are already selected."""
+        if self._selected_from_currency != from_currency:
+            self._select_from_currency(from_currency)
+            self._selected_from_currency = from_currency
+        if self._selected_to_currency != to_currency:
+            self._select_to_currency(to_currency)
+            self._selected_to_currency = to_currency
+    
+    def _prepare_pair(self, from_currency: str, to_currency: str) -> None:
+        """Hook run before a pair's conversions are collected - overridden where selecting early helps."""
+        pass
+    
+    def _select_from_currency(self, currency: str) -> None:
+        """Select the FROM currency - to be implemented by subclasses."""
+        raise NotImplementedError("Subclasses must implement _select_from_currency")
+    
+    def _select_to_currency(self, currency: str) -> None:
+        """Select the TO currency - to be implemented by subclasses."""
+        raise NotImplementedError("Subclasses must implement _select_to_currency")
+    
+    def _convert_amounts(self, amounts: List[float], from_currency: str, to_currency: str) -> List[Dict]:
+        """Convert amounts through the UI with the configured strategy, timing the whole pair."""
+        start = time.perf_counter()
+        if self.conversion_strategy == "batch":
+            results = self._convert_amounts_in_page(amounts, from_currency, to_currency)
+        else:
+            results = self._convert_amounts_stepwise(amounts, from_currency, to_currency)
+        self._record_conversion_timing(time.perf_counter() - start, amounts, from_currency, to_currency)
+        return results
+    
+    def _convert_amounts_stepwise(self, amounts: List[float], from_currency: str, to_currency: str) -> List[Dict]:
+        """Convert amounts one after another, entering each and awaiting its result from Python."""
+        results = []
+        for i, amount in enumerate(amounts, 1):
+            log_debug(f"    Processing {to_currency} conversion {i}/{len(amounts)}: {amount} {from_currency}")
+            pending = self._submit_amount(amount, to_currency)
+            results.append(self._read_amount(amount, to_currency, pending))
+        return results
+    
+    def _convert_amounts_in_page(self, amounts: List[float], from_currency: str, to_currency: str) -> List[Dict]:
+        """Convert all amounts with BATCH_CONVERSION_SCRIPT in a single browser call."""
+        log_debug(f"    Handing {len(amounts)} {from_currency} → {to_currency} amounts to the in-page driver")
+        self._resolve_script_selectors(self.BATCH_AMOUNT_INPUT, self.EXTRACT_AMOUNT_SELECTOR, self.EXTRACT_RATE_SELECTOR)
+        extracted = self.page.evaluate(self.BATCH_CONVERSION_SCRIPT, self._batch_args(amounts))
+        return self._build_batch_results(amounts, from_currency, to_currency, extracted)
+    
+    def _batch_args(self, amounts: List[float]) -> list:
+        """Arguments of BATCH_CONVERSION_SCRIPT."""
+        if not self.BATCH_AMOUNT_INPUT:
+            raise NotImplementedError(f"{type(self).__name__} does not support the batch conversion strategy")
+        return [self._script_selector(self.BATCH_AMOUNT_INPUT), self._extraction_args(), list(amounts),
+                self.BATCH_RESULT_TIMEOUT]
+    
+    def _build_batch_results(self, amounts: List[float], from_currency: str, to_currency: str,
+                             extracted: List[Dict]) -> List[Dict]:
+        """Create results from the in-page driver's per-amount output."""
+        results = []
+        for amount, item in zip(amounts, extracted):
+            if item.get("timedOut"):
+                log_warning(f"No result change for {amount} {from_currency} → {to_currency} "
+                            f"within {self.BATCH_RESULT_TIMEOUT} ms")
+            converted_amount, rate = self._finish_extraction(item, amount)
+            log_debug(f"    Result: {amount} {from_currency} = {converted_amount:.4f} {to_currency} "
+                      f"(rate: {rate:.8f}, {item.get('ms', 0):.0f} ms in page)")
+            results.append(self.create_result(amount, from_currency, to_currency, converted_amount, rate,
+                                              self.SOURCE_NAME))
+        return results
+    
+    def _record_conversion_timing(self, seconds: float, amounts: List[float], from_currency: str,
+                                  to_currency: str) -> None:
+        """Record a pair's UI conversion time, for comparing conversion strategies."""
+        if not amounts:
+            return
+        self.record_timing("conversions", seconds, strategy=self.conversion_strategy, count=len(amounts),
+                           from_currency=from_currency, to_currency=to_currency)
+        log_info(f"  {len(amounts)} {from_currency} → {to_currency} conversions took {seconds:.2f} s "
+                 f"({seconds / len(amounts) * 1000:.0f} ms each, {self.conversion_strategy} strategy)")
+    
+    def conversion_timing_summary(self) -> Dict:
+        """Total UI conversion time and count per strategy used on this page."""
+        summary: Dict[str, Dict] = {}
+        for timing in self.get_timings("conversions"):
+            entry = summary.setdefault(timing["strategy"], {"seconds": 0.0, "count": 0})
+            entry["seconds"] += timing["seconds"]
+            entry["count"] += timing["count"]
+        for entry in summary.values():
+            entry["ms_per_conversion"] = entry["seconds"] / entry["count"] * 1000
+        return summary
+    
+    def open_converter(self) -> None:
+        """Navigate to the converter and prepare it for input - to be implemented by subclasses."""
+        raise NotImplementedError("Subclasses must implement open_converter")
+    
+    def _submit_amount(self, amount: float, currency: str):
+        """Enter an amount without waiting for its result - to be implemented by subclasses."""
+        raise NotImplementedError("Subclasses must implement _submit_amount")
+    
+    def _read_amount(self, amount: float, currency: str, pending) -> Dict:
+        """Wait for a submitted amount's result and read it - to be implemented by subclasses."""
+        raise NotImplementedError("Subclasses must implement _read_amount")
+    
+    def get_conversions(self, pairs: List[Tuple[str, str]], amounts: List[float]) -> List[Dict]:
+        """
+        Get conversions of every amount for any list of (from, to) currency pairs.
+        
+        The converter is opened once and the pairs are worked through in plan_conversions order,
+        so every extra pair costs dropdown selections rather than a page setup.
+        
+        Args:
+            pairs: Currency pairs, e.g. [("RSD", "EUR"), ("EUR", "USD")]
+            amounts: Amounts to convert for every pair
+            
+        Returns:
+            Flat list of result dictionaries, pair by pair in execution order
+        """
+        plan = plan_conversions(pairs, self.selected_pair)
+        log_info(f"  Starting {self.SOURCE_NAME} browser operations for {len(plan)} pair(s)...")
+        log_debug(f"  Pair plan: {plan} (at most {count_selections(plan, self.selected_pair)} dropdown selections)")
+        self.open_converter()
+        
+        results = []
+        for from_currency, to_currency in plan:
+            self._prepare_pair(from_currency, to_currency)
+            pair_results = self.collect_pair_conversions(amounts, from_currency, to_currency)
+            self._emit_results(pair_results)
+            results.extend(pair_results)
+        
+        log_info(f"  {self.SOURCE_NAME} browser operations completed - {len(results)} conversions collected")
+        return results
+    
+    def _emit_results(self, results: List[Dict]) -> None:
+        """Hand a completed pair's results to the result listener, if one is set."""
+        if self.result_listener and results:
+            self.result_listener(results)
+    
     def get_rsd_conversions(self, amounts: List[float]) -> List[Dict]:
-        """Template method - to be implemented by subclasses."""
-        raise NotImplementedError("Subclasses must implement get_rsd_conversions") 
\ No newline at end of file
+        """Get RSD to TARGET_CURRENCIES conversions."""
+        return self.get_conversions([("RSD", currency) for currency in self.TARGET_CURRENCIES], amounts) 
\ No newline at end of file
@@ -1,136 +1,273 @@
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
+import re
 import time
+from urllib.parse import parse_qs, urlparse
+from playwright.sync_api import Page, Response, TimeoutError as PlaywrightTimeoutError
 from .base_page import BasePage
-from utils.logger import log_info, log_debug
+from utils.locator_chain import LocatorChain
+from utils.logger import log_info, log_debug, log_warning
+from utils.rate_payloads import RateTable, parse_wise_rates, rate_from_tables
 
 
 class WisePage(BasePage):
     """Wise.com page object."""
     
     URL = "https://wise.com/gb/currency-converter/"
+    SOURCE_NAME = "Wise.com"
+    TARGET_CURRENCIES = ("EUR", "USD")
     
-    # Currency Selection Locators
-    FROM_CURRENCY_BUTTON = "#source-inputSelectedCurrency"
-    FROM_CURRENCY_SEARCH = "#source-inputSelectedCurrencySearch"
-    TO_CURRENCY_BUTTON = "#target-inputSelectedCurrency"
-    TO_CURRENCY_SEARCH = "#target-inputSelectedCurrencySearch"
+    # Currency Selection Locators - each locator is an ordered fallback chain (BasePage.resolve_selector);
+    # the currency buttons are labelled with the selected code, source first
+    FROM_CURRENCY_BUTTON = LocatorChain("#source-inputSelectedCurrency", "role=button[name=/^[A-Z]{3}$/] >> nth=0")
+    FROM_CURRENCY_SEARCH = LocatorChain("#source-inputSelectedCurrencySearch",
+                                        "input[id$='SelectedCurrencySearch']:visible")
+    TO_CURRENCY_BUTTON = LocatorChain("#target-inputSelectedCurrency", "role=button[name=/^[A-Z]{3}$/] >> nth=1")
+    TO_CURRENCY_SEARCH = LocatorChain("#target-inputSelectedCurrencySearch",
+                                      "input[id$='SelectedCurrencySearch']:visible")
     
-    # Dropdown Options (XPath)
-    DROPDOWN_RSD = "//section[contains(@class, 'np-select-input-listbox-container')]//div[contains(@class, 'd-inline') and contains (text(), 'RSD')]"
-    DROPDOWN_EUR = "//section[contains(@class, 'np-select-input-listbox-container')]//div[contains(@class, 'd-inline') and contains (text(), 'EUR')]"
-    DROPDOWN_USD = "//section[contains(@class, 'np-select-input-listbox-container')]//div[contains(@class, 'd-inline') and contains (text(), 'USD')]"
+    # Dropdown Option (XPath) - formatted with the currency code
+    DROPDOWN_OPTION_TEMPLATE = "//section[contains(@class, 'np-select-input-listbox-container')]//div[contains(@class, 'd-inline') and contains (text(), '{currency}')]"
     
     # Amount Input/Output Locators
-    AMOUNT_INPUT = "#source-input"
-    RESULT_INPUT = "#target-input"
+    AMOUNT_INPUT = LocatorChain("#source-input", "[data-testid='source-amount'] input", "role=textbox >> nth=0")
+    RESULT_INPUT = LocatorChain("#target-input", "[data-testid='target-amount'] input", "role=textbox >> nth=1")
+    
+    # Single round-trip extraction (BasePage._extract_data) - Wise shows no rate line, so the rate is calculated
+    EXTRACT_AMOUNT_SELECTOR = RESULT_INPUT
+    
+    # In-page batch driver (conversion_strategy="batch") - replaces the wait modes for whole amount lists
+    BATCH_AMOUNT_INPUT = AMOUNT_INPUT
+    
+    # Quote synchronization
+    WAIT_MODES = ("value", "response", "static")
+    QUOTE_RESPONSE_PATTERN = re.compile(r"wise\.com/(rates/live|gateway/v\d+/(quotes|price|comparisons))")
+    QUOTE_RESPONSE_TIMEOUT = 3000
+    QUOTE_VALUE_TIMEOUT = 10000
+    # Fixed sleeps (s) of the legacy static mode - it now waits for the target value to settle, and
+    # every quote wait reports its savings against these
+    STATIC_WAITS = {"EUR": 0.5, "USD": 1}
+    # Relative difference between a shown quote and amount x known rate that still counts as the
+    # amount's quote - covers the two shown decimals and live rate drift, far below the step
+    # between amounts or currencies
+    QUOTE_VALUE_TOLERANCE = 0.002
+    
+    # Resolves once the target shows expected (within a relative tolerance) or, without an
+    # expectation, a non-empty value different from previous
+    QUOTE_VALUE_SCRIPT = """([selector, previous, expected, tolerance]) => {
+        const node = document.querySelector(selector);
+        const text = node ? (node.matches("input, textarea") ? node.value : node.textContent) : "";
+        if (!text) return false;
+        if (expected === null) return text !== previous;
+        const value = parseFloat(text.replace(/[, ]/g, ""));
+        return Math.abs(value - expected) <= Math.max(Math.abs(expected) * tolerance, 0.01);
+    }"""
+    
+    # Live rate endpoints doubling as the network rate capture source
+    RATE_RESPONSE_PATTERN = QUOTE_RESPONSE_PATTERN
+    RATE_CAPTURE_TIMEOUT = 3000
+    
+    # Route profile - Wise serves its app bundles from wise.com and transferwise.com hosts
+    ROUTE_ALLOWED_DOMAINS = ("wise.com", "transferwise.com")
+    
+    # Cookie consent banner
+    CONSENT_BUTTON = LocatorChain("button:has-text('Accept')", "role=button[name=/accept/i]")
+    
+    # Recorded traffic file for HAR replay
+    HAR_NAME = "wise"
+    
+    def __init__(self, page: Page, wait_mode: str = "value", capture_rates: bool = False,
+                 sample_size: Optional[int] = None, sample_seed: Optional[int] = None, block_resources: bool = False,
+                 har_mode: str = "off", url: Optional[str] = None, conversion_strategy: str = "steps"):
+        super().__init__(page, capture_rates=capture_rates, sample_size=sample_size, sample_seed=sample_seed,
+                         block_resources=block_resources, har_mode=har_mode, url=url,
+                         conversion_strategy=conversion_strategy)
+        if wait_mode not in self.WAIT_MODES:
+            raise ValueError(f"Unsupported wait mode '{wait_mode}', expected one of {self.WAIT_MODES}")
+        self.wait_mode = wait_mode
+        # Last read rate per (from, to) pair - the next amount's quote must be consistent with it
+        self._quote_rates: Dict[Tuple[str, str], float] = {}
 
-    def get_rsd_conversions(self, amounts: List[float]) -> List[Dict]:
-        """Get RSD to EUR and USD conversions with static sleeps."""
-        log_info("  Starting Wise.com browser operations...")
-        results = []
-        
-        # Navigate to Wise.com
-        log_debug(f"  Navigating to: {self.URL}")
-        self.navigate_to(self.URL)
+    def get_conversions(self, pairs: List[Tuple[str, str]], amounts: List[float]) -> List[Dict]:
+        """Get conversions for the pairs, waiting on each quote instead of fixed sleeps."""
+        results = super().get_conversions(pairs, amounts)
+        self._log_quote_latency_summary()
+        return results
+    
+    def open_converter(self) -> None:
+        """Navigate to Wise.com."""
+        log_debug(f"  Navigating to: {self.url}")
+        self.navigate_to(self.url)
         log_info("  Successfully loaded Wise.com currency converter")
+    
+    def _prepare_pair(self, from_currency: str, to_currency: str) -> None:
+        """Select the pair up front - selecting it makes Wise fetch its live rate."""
+        self._ensure_pair(from_currency, to_currency)
+    
+    def parse_rate_payload(self, payload) -> List[RateTable]:
+        """Parse Wise.com live rate and quote payloads."""
+        return parse_wise_rates(payload)
+    
+    def _select_from_currency(self, currency: str) -> None:
+        """Select the FROM currency from the dropdown."""
+        log_debug(f"  Setting up FROM currency ({currency})...")
+        self._pick_currency(self.FROM_CURRENCY_BUTTON, self.FROM_CURRENCY_SEARCH, currency)
+        log_info(f"  FROM currency set to {currency}")
+    
+    def _select_to_currency(self, currency: str) -> None:
+        """Select the TO currency from the dropdown."""
+        log_debug(f"  Setting up TO currency ({currency})...")
+        self._pick_currency(self.TO_CURRENCY_BUTTON, self.TO_CURRENCY_SEARCH, currency)
+        log_info(f"  TO currency set to {currency}")
+    
+    def _pick_currency(self, button_selector: LocatorChain, search_selector: LocatorChain, currency: str) -> None:
+        """Open a currency dropdown, search the currency and click its option."""
+        self.locator(button_selector).click()
+        log_debug("  Currency dropdown opened")
+        self.locator(search_selector).fill(currency)
+        log_debug(f"  Typed '{currency}' in currency search")
+        self.page.locator(self.DROPDOWN_OPTION_TEMPLATE.format(currency=currency)).click()
+    
+    def _submit_amount(self, amount: float, currency: str) -> Dict:
+        """Enter an amount, returning what is needed to await its quote."""
+        amount_input = self.locator(self.AMOUNT_INPUT)
+        amount_input.wait_for(state="visible")
+        from_currency = self._selected_from_currency
+        pending = {
+            "previous_value": self.locator(self.RESULT_INPUT).input_value(),
+            "unchanged_amount": self.extract_number_from_text(amount_input.input_value()) == amount,
+            # The target value to wait for is amount x this rate, once the pair's rate is known
+            "expected_rate": self._known_rate(from_currency, currency),
+            "start": time.perf_counter(),
+            "response_seen": False
+        }
         
-        # Select RSD for FROM currency
-        log_debug("  Setting up FROM currency (RSD)...")
-        from_currency_button = self.page.locator(self.FROM_CURRENCY_BUTTON)
-        from_currency_button.click()
-        log_debug("  FROM currency dropdown opened")
-        from_currency_button_search = self.page.locator(self.FROM_CURRENCY_SEARCH)
-        from_currency_button_search.fill("RSD")
-        log_debug("  Typed 'RSD' in FROM currency search")
-        dd_rsd = self.page.locator(self.DROPDOWN_RSD)
-        dd_rsd.click()
-        log_info("  FROM currency set to RSD")
-
-        
-        # RSD → EUR conversions (ascending order: 1000, 2000, 3000)
-        log_debug("  Setting up TO currency (EUR)...")
-        to_currency_button = self.page.locator(self.TO_CURRENCY_BUTTON)
-        to_currency_button.click()
-        log_debug("  TO currency dropdown opened")
-        to_currency_button_search = self.page.locator(self.TO_CURRENCY_SEARCH)
-        to_currency_button_search.fill("EUR")
-        log_debug("  Typed 'EUR' in TO currency search")
-        dd_eur = self.page.locator(self.DROPDOWN_EUR)
-        dd_eur.click()
-        log_info("  TO currency set to EUR")
-
+        # Value mode learns the rate of a pair's first amount from its quote as well
+        if self.wait_mode == "response" or (self.wait_mode == "value" and pending["expected_rate"] is None):
+            try:
+                with self.page.expect_response(lambda r: self._is_quote_response(r, currency, amount),
+                                               timeout=self.QUOTE_RESPONSE_TIMEOUT) as response_info:
+                    self._fill_amount(amount_input, amount)
+                pending["response_seen"] = True
+                pending["expected_rate"] = self._quote_rate(response_info.value, from_currency,
+                                                            currency) or pending["expected_rate"]
+            except PlaywrightTimeoutError:
+                log_debug("    No quote response observed, falling back to target value change")
+        else:
+            self._fill_amount(amount_input, amount)
+        return pending
+    
+    def _read_amount(self, amount: float, currency: str, pending: Dict) -> Dict:
+        """Wait until Wise shows the submitted amount's quote and read the target input."""
+        log_debug("    Waiting for conversion to complete...")
+        legacy_sleep = self.STATIC_WAITS.get(currency, 1)
+        if self.wait_mode == "static":
+            timed_out = not self.wait_until_value_stable(self.RESULT_INPUT, timeout=self.QUOTE_VALUE_TIMEOUT,
+                                                         replaces=legacy_sleep)
+        else:
+            # An unchanged amount may already show its quote, so any value passes unless the rate is known
+            previous = None if pending["unchanged_amount"] else pending["previous_value"]
+            timed_out = not self.wait_for_quote_value(amount, pending["expected_rate"], previous,
+                                                      replaces=legacy_sleep)
         
-        log_info("  Starting RSD → EUR conversions...")
-        for i, amount in enumerate(amounts, 1):
-            log_debug(f"    Processing EUR conversion {i}/3: {amount} RSD")
-            amount_input = self.page.locator(self.AMOUNT_INPUT)
-            amount_input.wait_for(state="visible")
-            amount_input.clear()
-            amount_input.fill(str(amount))
-            log_debug(f"    Amount {amount} entered")
-            
-            # Static wait for conversion
-            time.sleep(0.5)
-            log_debug("    Waiting for conversion to complete...")
-            
-            # Extract data and create result
-            converted_amount, rate = self._extract_data(amount)
-            result = self.create_result(amount, "RSD", "EUR", converted_amount, rate, "Wise.com")
-            results.append(result)
-            log_debug(f"    WISE EXTRACTION - Amount: {amount} RSD")
-            log_debug(f"    WISE EXTRACTION - Converted: {converted_amount:.8f} EUR")
-            log_debug(f"    WISE EXTRACTION - Rate: {rate:.10f} (full precision)")
-            log_debug(f"    Result: {amount} RSD = {converted_amount:.4f} EUR (rate: {rate:.8f})")
-        log_info("  RSD → EUR conversions completed")
+        elapsed = time.perf_counter() - pending["start"]
+        self.record_timing("wise_quote", elapsed, amount=amount, to_currency=currency, mode=self.wait_mode,
+                           response_seen=pending["response_seen"], timed_out=timed_out)
+        from_currency = self._selected_from_currency
+        log_debug(f"    Quote for {amount} {from_currency} → {currency} settled in {elapsed * 1000:.0f} ms")
         
-        # RSD → USD conversions (ascending order: 1000, 2000, 3000)
-        log_debug("  Switching TO currency to USD...")
-        to_currency_button.click()
-        to_currency_button_search.fill("USD")
-        log_debug("  Typed 'USD' in TO currency search")
-        dd_usd = self.page.locator(self.DROPDOWN_USD)
-        dd_usd.click()
-        log_info("  TO currency changed to USD")
+        # Extract data and create result
+        converted_amount, rate = self._extract_data(amount)
+        # Only quotes large enough that their two shown decimals keep the rate within the tolerance
+        if not timed_out and converted_amount * self.QUOTE_VALUE_TOLERANCE >= 0.01:
+            self._quote_rates[(from_currency, currency)] = rate
+        result = self.create_result(amount, from_currency, currency, converted_amount, rate, self.SOURCE_NAME)
+        log_debug(f"    WISE EXTRACTION - Amount: {amount} {from_currency}")
+        log_debug(f"    WISE EXTRACTION - Converted: {converted_amount:.8f} {currency}")
+        log_debug(f"    WISE EXTRACTION - Rate: {rate:.10f} (full precision)")
+        log_debug(f"    Result: {amount} {from_currency} = {converted_amount:.4f} {currency} (rate: {rate:.8f})")
+        return result
+    
+    def wait_for_quote_value(self, amount: float, expected_rate: Optional[float], previous: Optional[str],
+                             replaces: float = 0.0) -> bool:
+        """
+        Wait until the target input shows the quote of an amount.
         
-        log_info("  Starting RSD → USD conversions...")
-        for i, amount in enumerate(amounts, 1):
-            log_debug(f"    Processing USD conversion {i}/3: {amount} RSD")
-            amount_input = self.page.locator(self.AMOUNT_INPUT)
-            amount_input.clear()
-            amount_input.fill(str(amount))
-            log_debug(f"    Amount {amount} entered")
+        Args:
+            amount: Submitted source amount
+            expected_rate: Pair rate when known - the value must then be amount x rate within
+                QUOTE_VALUE_TOLERANCE, which no earlier amount's or other currency's quote is
+            previous: Value that must have been replaced when the rate is unknown (None: any value)
+            replaces: Seconds of the fixed sleep this wait replaces, for the savings totals
             
-            # Static wait for conversion
-            time.sleep(1)
-            log_debug("    Waiting for conversion to complete...")
-            
-            # Extract data and create result
-            converted_amount, rate = self._extract_data(amount)
-            result = self.create_result(amount, "RSD", "USD", converted_amount, rate, "Wise.com")
-            results.append(result)
-            log_debug(f"    WISE EXTRACTION - Amount: {amount} RSD")
-            log_debug(f"    WISE EXTRACTION - Converted: {converted_amount:.8f} USD")
-            log_debug(f"    WISE EXTRACTION - Rate: {rate:.10f} (full precision)")
-            log_debug(f"    Result: {amount} RSD = {converted_amount:.4f} USD (rate: {rate:.8f})")
-        log_info("  RSD → USD conversions completed")
-        
-        log_info(f"  Wise.com browser operations completed - {len(results)} conversions collected")
-        return results
+        Returns:
+            True when the quote showed up, False on timeout
+        """
+        selector = self.resolve_selector(self.RESULT_INPUT, css=True)
+        expected = amount * expected_rate if expected_rate else None
+        start = time.perf_counter()
+        try:
+            self.page.wait_for_function(self.QUOTE_VALUE_SCRIPT,
+                                        arg=[selector, previous, expected, self.QUOTE_VALUE_TOLERANCE],
+                                        timeout=self.QUOTE_VALUE_TIMEOUT)
+            shown = True
+        except PlaywrightTimeoutError:
+            target = f"{expected:.2f}" if expected is not None else f"a value other than '{previous}'"
+            log_warning(f"Wise did not show {target} for {amount} within {self.QUOTE_VALUE_TIMEOUT} ms")
+            shown = False
+        self._record_wait("quote_value", selector, time.perf_counter() - start, not shown, replaces)
+        return shown
     
-    def _extract_data(self, original_amount: float) -> tuple:
-        """Extract converted amount and exchange rate."""
-        converted_amount = 0.0
-        
-        # Get converted amount from target input
+    def _known_rate(self, from_currency: str, to_currency: str) -> Optional[float]:
+        """The pair's rate from captured rate responses or its previous quote, None before either."""
+        captured = rate_from_tables(self.captured_rate_tables, from_currency, to_currency)
+        return captured or self._quote_rates.get((from_currency, to_currency))
+    
+    def _is_quote_response(self, response: Response, currency: str, amount: float) -> bool:
+        """Whether a response is Wise's quote for this target currency (and amount, when the request states one)."""
+        if not self._is_rate_response(response):
+            return False
+        fields = self._request_fields(response.request)
+        target = fields.get("target") or fields.get("targetcurrency")
+        if not isinstance(target, str) or target.upper() != currency:
+            return False
+        stated = fields.get("amount", fields.get("sourceamount"))
+        try:
+            return stated is None or float(stated) == amount
+        except (TypeError, ValueError):
+            return False
+    
+    def _quote_rate(self, response: Response, from_currency: str, to_currency: str) -> Optional[float]:
+        """The pair rate a quote response carries, None when it is unreadable."""
         try:
-            target_value = self.page.locator(self.RESULT_INPUT).input_value() or ""
-            converted_amount = self.extract_number_from_text(target_value)
-            log_debug(f"      Extracted converted amount: {converted_amount}")
+            return rate_from_tables(self.parse_rate_payload(response.json()), from_currency, to_currency)
         except Exception as e:
-            log_debug(f"      Failed to extract converted amount: {e}")
-        
-        # Calculate exchange rate using base class method
-        exchange_rate = self.calculate_exchange_rate(converted_amount, original_amount)
-        log_debug(f"      Calculated exchange rate: {exchange_rate}")
-        
-        return converted_amount, exchange_rate 
\ No newline at end of file
+            log_debug(f"      Unreadable quote response {response.url}: {e}")
+            return None
+    
+    @staticmethod
+    def _request_fields(request) -> Dict:
+        """Query parameters and JSON body fields of a request, with lower-case names."""
+        fields = {name.lower(): values[0] for name, values in parse_qs(urlparse(request.url).query).items()}
+        try:
+            body = request.post_data_json
+        except Exception:
+            body = None
+        if isinstance(body, dict):
+            fields.update({str(name).lower(): value for name, value in body.items()})
+        return fields
+    
+    def _fill_amount(self, amount_input, amount: float) -> None:
+        """Replace the source amount."""
+        amount_input.clear()
+        amount_input.fill(str(amount))
+        log_debug(f"    Amount {amount} entered")
+    
+    def _log_quote_latency_summary(self) -> None:
+        """Log observed quote latency for this run."""
+        quote_timings = self.get_timings("wise_quote")
+        if not quote_timings:
+            return
+        latencies = [t["seconds"] * 1000 for t in quote_timings]
+        log_info(f"  Wise.com quote latency ({self.wait_mode} wait): "
+                 f"avg {sum(latencies) / len(latencies):.0f} ms, max {max(latencies):.0f} ms "
+                 f"over {len(latencies)} quotes")
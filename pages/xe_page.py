@@ -1,172 +1,204 @@
-from typing import Dict, List
+from typing import Dict, List, Optional
 import re
 import time
+from urllib.parse import urlencode, urljoin
+from playwright.sync_api import Page
 from .base_page import BasePage
+from utils.locator_chain import LocatorChain
 from utils.logger import log_info, log_debug
+from utils.rate_payloads import RateTable, parse_xe_midmarket
 
 
 class XEPage(BasePage):
     """XE.com page object."""
     
     URL = "https://www.xe.com/"
+    SOURCE_NAME = "XE.com"
+    TARGET_CURRENCIES = ("EUR", "USD")
     
-    # Currency Selection Locators
-    FROM_CURRENCY_INPUT = "#midmarketFromCurrency input[placeholder='Type to search...']"
-    TO_CURRENCY_INPUT = "#midmarketToCurrency input[placeholder='Type to search...']"
+    # Currency Selection Locators - each locator is an ordered fallback chain (BasePage.resolve_selector)
+    FROM_CURRENCY_INPUT = LocatorChain("#midmarketFromCurrency input[placeholder='Type to search...']",
+                                       "#midmarketFromCurrency input", "role=combobox >> nth=0")
+    TO_CURRENCY_INPUT = LocatorChain("#midmarketToCurrency input[placeholder='Type to search...']",
+                                     "#midmarketToCurrency input", "role=combobox >> nth=1")
     
-    # Search Options
-    SERBIA_OPTION = "Serbia"
-    EUR_OPTION = "EUR Euro"
-    USD_OPTION = "US Dollar"
+    # Search text and option name per currency - other currencies are searched and picked by their code
+    CURRENCY_OPTIONS = {
+        "RSD": ("Serbia", "Serbia"),
+        "EUR": ("Euro", "EUR Euro"),
+        "USD": ("USD", "US Dollar"),
+    }
     
     # Action Button
-    CONVERT_BUTTON = "button:has-text('Convert')"
+    CONVERT_BUTTON = LocatorChain("button:has-text('Convert')", "role=button[name='Convert']", "text=Convert")
     
-    # Amount and Result Locators
-    AMOUNT_INPUT = "#amount"
-    CONVERSION_FIELD = "[data-testid='conversion']"
-    RESULT_ELEMENTS = "[data-testid='conversion'] .sc-708e65be-1"
+    # Fixed sleep (s) that used to follow a currency switch - now a wait for the result to change
+    CURRENCY_SWITCH_SLEEP = 2
+    
+    # Amount and Result Locators - the result's hashed class changes with XE releases, so it falls back
+    # to the result line's position in the conversion panel
+    AMOUNT_INPUT = LocatorChain("#amount", "input[inputmode='decimal']", "role=textbox[name='Amount']")
+    CONVERSION_FIELD = LocatorChain("[data-testid='conversion']", "div:has(> [class='[grid-area:conversion]'])")
+    RESULT_ELEMENTS = LocatorChain("[data-testid='conversion'] .sc-708e65be-1",
+                                   "[data-testid='conversion'] [class='[grid-area:conversion]'] > p:nth-of-type(2)",
+                                   "[data-testid='conversion'] p:nth-of-type(2)")
+    
+    # Single round-trip extraction (BasePage._extract_data)
+    EXTRACT_AMOUNT_SELECTOR = RESULT_ELEMENTS
+    EXTRACT_RATE_SELECTOR = CONVERSION_FIELD
+    
+    # In-page batch driver (conversion_strategy="batch")
+    BATCH_AMOUNT_INPUT = AMOUNT_INPUT
+    
+    # Deep links (conversion_strategy="deep_link") - the converter page opened with amount and pair
+    # preset in the query, one navigation per conversion instead of the dropdown flow
+    CONVERSION_STRATEGIES = BasePage.CONVERSION_STRATEGIES + ("deep_link",)
+    DEEP_LINK_PATH = "currencyconverter/convert/"
+    DEEP_LINK_TIMEOUT = 15000
     
     # Dynamic XPath pattern for result validation
     RESULT_XPATH_TEMPLATE = "(//div[@class='[grid-area:conversion]']//p[contains(text(),'{amount}')])[1]"
     
-    def get_rsd_conversions(self, amounts: List[float]) -> List[Dict]:
-        """Get RSD to EUR and USD conversions with consistent flow."""
-        log_info("  Starting XE.com browser operations...")
-        results = []
-        
-        # Navigate to XE.com
-        log_debug(f"  Navigating to: {self.URL}")
-        self.navigate_to(self.URL)
+    # Midmarket rate endpoint used by the converter widget
+    RATE_RESPONSE_PATTERN = re.compile(r"xe\.com/api/protected/(midmarket-converter|live-currency-pairs-rates)")
+    
+    # Route profile - the converter only needs xe.com's own documents, scripts and API
+    ROUTE_ALLOWED_DOMAINS = ("xe.com",)
+    
+    # Cookie consent banner
+    CONSENT_BUTTON = LocatorChain("button:has-text('Accept')", "role=button[name=/accept/i]")
+    
+    # Recorded traffic file for HAR replay
+    HAR_NAME = "xe"
+    
+    def __init__(self, page: Page, capture_rates: bool = False, sample_size: Optional[int] = None,
+                 sample_seed: Optional[int] = None, block_resources: bool = False, har_mode: str = "off",
+                 url: Optional[str] = None, conversion_strategy: str = "steps"):
+        super().__init__(page, capture_rates=capture_rates, sample_size=sample_size, sample_seed=sample_seed,
+                         block_resources=block_resources, har_mode=har_mode, url=url,
+                         conversion_strategy=conversion_strategy)
+        self._converter_ready = False
+    
+    def open_converter(self) -> None:
+        """Navigate to XE.com."""
+        if self.conversion_strategy == "deep_link":
+            log_debug("  Deep link mode - every conversion opens its own converter URL")
+            return
+        log_debug(f"  Navigating to: {self.url}")
+        self.navigate_to(self.url)
         log_info("  Successfully loaded XE.com homepage")
+    
+    def parse_rate_payload(self, payload) -> List[RateTable]:
+        """Parse XE.com midmarket rate payloads."""
+        return parse_xe_midmarket(payload)
+    
+    def deep_link_url(self, amount: float, from_currency: str, to_currency: str) -> str:
+        """Converter URL showing the conversion of an amount directly."""
+        query = urlencode({"Amount": amount, "From": from_currency, "To": to_currency})
+        return f"{urljoin(self.url, self.DEEP_LINK_PATH)}?{query}"
+    
+    def _ensure_pair(self, from_currency: str, to_currency: str) -> None:
+        """Select the pair in the dropdowns - deep links carry it in the URL instead."""
+        if self.conversion_strategy == "deep_link":
+            self._selected_from_currency, self._selected_to_currency = from_currency, to_currency
+            return
+        super()._ensure_pair(from_currency, to_currency)
+    
+    def _select_from_currency(self, currency: str) -> None:
+        """Select the FROM currency."""
+        log_debug(f"  Setting up FROM currency ({currency})...")
+        previous = self.read_text(self.RESULT_ELEMENTS) if self._converter_ready else None
+        self._pick_currency(self.FROM_CURRENCY_INPUT, currency)
+        log_info(f"  FROM currency set to {currency}")
+        if self._converter_ready:
+            self._wait_for_currency_switch(previous)
+    
+    def _select_to_currency(self, currency: str) -> None:
+        """Select the TO currency, pressing Convert the first time the converter is used."""
+        log_debug(f"  Setting up TO currency ({currency})...")
+        previous = self.read_text(self.RESULT_ELEMENTS) if self._converter_ready else None
+        self._pick_currency(self.TO_CURRENCY_INPUT, currency)
         
-        # Select Serbia (RSD) for FROM currency
-        log_debug("  Setting up FROM currency (Serbia/RSD)...")
-        from_input = self.page.locator(self.FROM_CURRENCY_INPUT)
-        from_input.click()
-        log_debug("  FROM currency input clicked")
-        from_input.fill(self.SERBIA_OPTION)
-        log_debug(f"  Typed '{self.SERBIA_OPTION}' in FROM currency search")
-        self.page.get_by_role("option", name=self.SERBIA_OPTION).click()
-        log_info("  FROM currency set to Serbia (RSD)")
-        
-        # Select EUR for TO currency
-        log_debug("  Setting up TO currency (EUR)...")
-        to_input = self.page.locator(self.TO_CURRENCY_INPUT)
-        to_input.wait_for(state="visible")
-        to_input.click()
-        log_debug("  TO currency input clicked")
-        to_input.fill("Euro")
-        log_debug("  Typed 'Euro' in TO currency search")
-        self.page.get_by_role("option", name=self.EUR_OPTION).first.click()
-        log_info("  TO currency set to EUR")
-        
-        # Click Convert button once
-        log_debug("  Clicking Convert button...")
-        convert_button = self.page.locator(self.CONVERT_BUTTON)
-        convert_button.wait_for(state="visible")
-        convert_button.click()
-        log_info("  Convert button clicked, waiting for conversion rate...")
-        
-        # Wait for conversion rate to appear (confirms page is ready)
-        conversion_field = self.page.locator(self.CONVERSION_FIELD).first
-        conversion_field.wait_for(state="visible", timeout=10000)
-        log_info("  Conversion interface is ready")
-        
-        # Get amount input
-        amount_input = self.page.locator(self.AMOUNT_INPUT)
-        
-        # RSD → EUR conversions: 1000, 2000, 3000
-        log_info("  Starting RSD → EUR conversions...")
-        for i, amount in enumerate(amounts, 1):
-            log_debug(f"    Processing EUR conversion {i}/3: {amount} RSD")
-            amount_input.clear()
-            amount_input.fill(str(amount))
-            log_debug(f"    Amount {amount} entered")
-
-            conversion_field.click()
-            formated_amount = amount_input.get_attribute("value", timeout=500)
-            xpath = self.RESULT_XPATH_TEMPLATE.format(amount=formated_amount)
-            self.page.locator(xpath).wait_for(state="visible")
-            log_debug(f"    Conversion result visible for {amount} RSD")
-
-            # Extract data and create result
-            converted_amount, rate = self._extract_data(amount)
-            result = self.create_result(amount, "RSD", "EUR", converted_amount, rate, "XE.com")
-            results.append(result)
-            log_debug(f"    XE EXTRACTION - Amount: {amount} RSD")
-            log_debug(f"    XE EXTRACTION - Converted: {converted_amount:.8f} EUR")
-            log_debug(f"    XE EXTRACTION - Rate: {rate:.10f} (full precision)")
-            log_debug(f"    Result: {amount} RSD = {converted_amount:.4f} EUR (rate: {rate:.8f})")
-        log_info("  RSD → EUR conversions completed")
-
-        # Change to USD
-        log_debug("  Switching TO currency to USD...")
-        to_input.click()
-        to_input.fill("USD")
-        log_debug("  Typed 'USD' in TO currency search")
-        self.page.get_by_role("option", name=self.USD_OPTION).click()
-        log_info("  TO currency changed to USD")
-        time.sleep(2)  # Short wait for currency change
-        
-        # Clear amount input and enter test data again: 1000, 2000, 3000
-        log_info("  Starting RSD → USD conversions...")
-        for i, amount in enumerate(amounts, 1):
-            log_debug(f"    Processing USD conversion {i}/3: {amount} RSD")
-            amount_input.clear()
-            amount_input.fill(str(amount))
-            log_debug(f"    Amount {amount} entered")
+        if not self._converter_ready:
+            log_info(f"  TO currency set to {currency}")
             
-            conversion_field.click()
-            formated_amount = amount_input.get_attribute("value", timeout=500)
-            xpath = self.RESULT_XPATH_TEMPLATE.format(amount=formated_amount)
-            self.page.locator(xpath).wait_for(state="visible")
-            log_debug(f"    Conversion result visible for {amount} RSD")
+            # Click Convert button once
+            log_debug("  Clicking Convert button...")
+            convert_button = self.locator(self.CONVERT_BUTTON)
+            convert_button.wait_for(state="visible")
+            convert_button.click()
+            log_info("  Convert button clicked, waiting for conversion rate...")
             
-            # Extract data and create result
-            converted_amount, rate = self._extract_data(amount)
-            result = self.create_result(amount, "RSD", "USD", converted_amount, rate, "XE.com")
-            results.append(result)
-            log_debug(f"    XE EXTRACTION - Amount: {amount} RSD")
-            log_debug(f"    XE EXTRACTION - Converted: {converted_amount:.8f} USD")
-            log_debug(f"    XE EXTRACTION - Rate: {rate:.10f} (full precision)")
-            log_debug(f"    Result: {amount} RSD = {converted_amount:.4f} USD (rate: {rate:.8f})")
-        log_info("  RSD → USD conversions completed")
+            # Wait for conversion rate to appear (confirms page is ready)
+            self.locator(self.CONVERSION_FIELD).first.wait_for(state="visible", timeout=10000)
+            log_info("  Conversion interface is ready")
+            self._converter_ready = True
+            return
         
-        log_info(f"  XE.com browser operations completed - {len(results)} conversions collected")
-        return results
+        log_info(f"  TO currency changed to {currency}")
+        self._wait_for_currency_switch(previous)
     
-    def _extract_data(self, original_amount: float) -> tuple:
-        """Extract converted amount and exchange rate."""
-        converted_amount = 0.0
-        exchange_rate = 0.0
-        
-        # Try to get converted amount
-        try:
-            result_elements = self.page.locator(self.RESULT_ELEMENTS)
-            if result_elements.count() > 0:
-                text = result_elements.first.text_content() or ""
-                converted_amount = self.extract_number_from_text(text)
-                log_debug(f"      Extracted converted amount: {converted_amount}")
-        except Exception as e:
-            log_debug(f"      Failed to extract converted amount: {e}")
-        
-        # Try to get exchange rate
-        try:
-            rate_elements = self.page.locator(self.CONVERSION_FIELD)
-            for i in range(rate_elements.count()):
-                text = rate_elements.nth(i).text_content() or ""
-                match = re.search(r'1\s+RSD\s*=\s*([\d,]+\.?\d*)', text, re.IGNORECASE)
-                if match:
-                    exchange_rate = float(match.group(1).replace(',', ''))
-                    log_debug(f"      Extracted exchange rate: {exchange_rate}")
-                    break
-        except Exception as e:
-            log_debug(f"      Failed to extract exchange rate: {e}")
+    def _wait_for_currency_switch(self, previous: str) -> None:
+        """Wait for the result to show the new currency instead of sleeping."""
+        self.wait_until_text_changes(self.RESULT_ELEMENTS, previous, replaces=self.CURRENCY_SWITCH_SLEEP)
+    
+    def _currency_option(self, currency: str) -> tuple:
+        """Search text and option name of a currency in XE's comboboxes."""
+        return self.CURRENCY_OPTIONS.get(currency, (currency, currency))
+    
+    def _pick_currency(self, input_selector: LocatorChain, currency: str) -> None:
+        """Search a currency combobox and click the matching option."""
+        search_text, option_name = self._currency_option(currency)
+        currency_input = self.locator(input_selector)
+        currency_input.wait_for(state="visible")
+        currency_input.click()
+        currency_input.fill(search_text)
+        log_debug(f"  Typed '{search_text}' in currency search")
+        self.page.get_by_role("option", name=option_name).first.click()
+    
+    def _submit_amount(self, amount: float, currency: str):
+        """Enter an amount and return XE's formatted version of it (deep links: start the navigation)."""
+        if self.conversion_strategy == "deep_link":
+            return self._open_deep_link(amount, currency)
+        amount_input = self.locator(self.AMOUNT_INPUT)
+        amount_input.clear()
+        amount_input.fill(str(amount))
+        log_debug(f"    Amount {amount} entered")
         
-        # Fallback calculation using base class method
-        if exchange_rate == 0.0:
-            exchange_rate = self.calculate_exchange_rate(converted_amount, original_amount)
-            log_debug(f"      Calculated fallback exchange rate: {exchange_rate}")
+        self.locator(self.CONVERSION_FIELD).first.click()
+        return amount_input.get_attribute("value", timeout=500)
+    
+    def _open_deep_link(self, amount: float, currency: str) -> Dict:
+        """Start navigating to an amount's deep link, returning once the response has committed."""
+        url = self.deep_link_url(amount, self._selected_from_currency, currency)
+        self._install_routes()
+        start = time.perf_counter()
+        self.page.goto(url, wait_until="commit", timeout=30000)
+        log_debug(f"    Opened deep link {url}")
+        return {"url": url, "start": start}
+    
+    def _wait_for_deep_link_result(self, amount: float, currency: str, pending: Dict) -> None:
+        """Wait until a deep link's page shows its result and record the time since navigation started."""
+        self.locator(self.RESULT_ELEMENTS, timeout=self.DEEP_LINK_TIMEOUT).first.wait_for(
+            state="visible", timeout=self.DEEP_LINK_TIMEOUT)
+        self.record_timing("deep_link", time.perf_counter() - pending["start"], amount=amount,
+                           to_currency=currency, url=pending["url"])
+    
+    def _read_amount(self, amount: float, currency: str, pending) -> Dict:
+        """Wait for the submitted amount's result and scrape it."""
+        if self.conversion_strategy == "deep_link":
+            self._wait_for_deep_link_result(amount, currency, pending)
+        else:
+            xpath = self.RESULT_XPATH_TEMPLATE.format(amount=pending)
+            self.page.locator(xpath).wait_for(state="visible")
+        from_currency = self._selected_from_currency
+        log_debug(f"    Conversion result visible for {amount} {from_currency}")
         
-        return converted_amount, exchange_rate
+        # Extract data and create result
+        converted_amount, rate = self._extract_data(amount)
+        result = self.create_result(amount, from_currency, currency, converted_amount, rate, self.SOURCE_NAME)
+        log_debug(f"    XE EXTRACTION - Amount: {amount} {from_currency}")
+        log_debug(f"    XE EXTRACTION - Converted: {converted_amount:.8f} {currency}")
+        log_debug(f"    XE EXTRACTION - Rate: {rate:.10f} (full precision)")
+        log_debug(f"    Result: {amount} {from_currency} = {converted_amount:.4f} {currency} (rate: {rate:.8f})")
+        return result
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Persistent browser profile management.
+  info     - show what the profile stores
+  clear    - invalidate it (--cache-only keeps cookies and consent)
+  prime    - visit the converter pages once and accept their consent banners
+  measure  - compare cold (empty cache) and warm navigation time
+The profile is taken from BROWSER_PROFILE_DIR / BROWSER_STORAGE_STATE or --profile-dir / --storage-state.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from playwright.sync_api import sync_playwright
+from pages.xe_page import XEPage
+from pages.wise_page import WisePage
+from utils.browser_profile import BrowserProfile
+from utils.route_profile import measure_navigation
+
+
+PAGE_CLASSES = (XEPage, WisePage)
+CONTEXT_ARGS = {"viewport": {"width": 1280, "height": 720}, "locale": "en-US"}
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Manage the persistent browser profile")
+    parser.add_argument("command", choices=("info", "clear", "prime", "measure"))
+    parser.add_argument("--profile-dir", default=os.getenv("BROWSER_PROFILE_DIR"))
+    parser.add_argument("--storage-state", default=os.getenv("BROWSER_STORAGE_STATE"))
+    parser.add_argument("--cache-only", action="store_true", help="clear: only drop cached files")
+    parser.add_argument("--headed", action="store_true")
+    return parser.parse_args()
+
+
+def show_info(profile):
+    """Print what the profile stores."""
+    for key, value in profile.info().items():
+        if key.endswith("_bytes"):
+            value = f"{value / (1024 * 1024):.1f} MiB"
+        print(f"  {key}: {value}")
+
+
+def clear_profile(profile, cache_only):
+    """Remove the profile or just its caches."""
+    removed = profile.clear(cache_only=cache_only)
+    for path in removed:
+        print(f"  removed {path}")
+    if not removed:
+        print("  nothing to clear")
+
+
+def prime_profile(profile, headed):
+    """Load every converter page once so the cache is filled and consent is stored."""
+    with sync_playwright() as playwright:
+        context, close = open_context(playwright, profile, headed)
+        try:
+            for page_class in PAGE_CLASSES:
+                converter_page = page_class(context.new_page())
+                converter_page.navigate_to(page_class.URL)
+                converter_page.accept_consent()
+                converter_page.page.wait_for_load_state("networkidle")
+            profile.save_storage_state(context)
+        finally:
+            close()
+    print("  profile primed")
+
+
+def measure_cold_warm(profile, headed):
+    """Navigate every converter page on an emptied cache, then again on the warm one."""
+    if not profile.user_data_dir:
+        # No profile configured - measure on a throwaway one
+        profile = BrowserProfile(tempfile.mkdtemp(prefix="browser_profile_"))
+    profile.clear(cache_only=True)
+
+    with sync_playwright() as playwright:
+        for run in ("cold", "warm"):
+            context, close = open_context(playwright, profile, headed)
+            try:
+                for page_class in PAGE_CLASSES:
+                    measured = measure_navigation(context.new_page(), page_class.URL)
+                    print(f"  {page_class.SOURCE_NAME:<10} {run}: {measured['load_seconds']:.2f} s, "
+                          f"{measured['requests']} requests, {measured['bytes'] / 1024:.0f} KiB transferred")
+            finally:
+                close()
+
+
+def open_context(playwright, profile, headed):
+    """
+    Open the profile's persistent context, or a fresh one loading its storage state.
+    Returns the context and the function closing it.
+    """
+    if profile.user_data_dir:
+        context = profile.launch_persistent(playwright.chromium, headless=not headed, **CONTEXT_ARGS)
+        return context, context.close
+    browser = playwright.chromium.launch(headless=not headed)
+    return browser.new_context(**CONTEXT_ARGS, **profile.context_args()), browser.close
+
+
+def main():
+    """Run the requested command."""
+    args = parse_args()
+    profile = BrowserProfile(args.profile_dir, args.storage_state)
+    if not profile.enabled and args.command != "measure":
+        print("No profile configured - set BROWSER_PROFILE_DIR or BROWSER_STORAGE_STATE")
+        sys.exit(1)
+
+    print(f"Browser profile {args.command}:")
+    if args.command == "info":
+        show_info(profile)
+    elif args.command == "clear":
+        clear_profile(profile, args.cache_only)
+    elif args.command == "prime":
+        prime_profile(profile, args.headed)
+    else:
+        measure_cold_warm(profile, args.headed)
+
+
+if __name__ == "__main__":
+    main()
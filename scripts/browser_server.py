@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Long-lived browser server shared by pytest runs (BROWSER_SERVER=true).
+  start    - launch the browser unless it is running
+  stop     - terminate it
+  restart  - stop and start again
+  status   - show whether it is running, its endpoint and uptime
+  clear    - stop it and remove its profile directory
+The server directory is taken from BROWSER_SERVER_DIR or --dir.
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from playwright.sync_api import sync_playwright
+from utils.browser_server import BrowserServer
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Manage the shared browser server")
+    parser.add_argument("command", choices=("start", "stop", "restart", "status", "clear"))
+    parser.add_argument("--dir", default=os.getenv("BROWSER_SERVER_DIR") or BrowserServer.DEFAULT_DIR)
+    parser.add_argument("--headed", action="store_true")
+    return parser.parse_args()
+
+
+def chromium_executable():
+    """Path of Playwright's Chromium build."""
+    with sync_playwright() as playwright:
+        return playwright.chromium.executable_path
+
+
+def show_status(server):
+    """Print the server status."""
+    for key, value in server.status().items():
+        if key == "uptime_seconds":
+            value = f"{value:.0f} s"
+        print(f"  {key}: {value}")
+
+
+def main():
+    """Run the requested command."""
+    args = parse_args()
+    server = BrowserServer(args.dir, headless=not args.headed)
+
+    print(f"Browser server {args.command}:")
+    if args.command in ("stop", "restart"):
+        print("  stopped" if server.stop() else "  was not running")
+    if args.command in ("start", "restart"):
+        server.ensure_running(chromium_executable())
+        show_status(server)
+    elif args.command == "status":
+        show_status(server)
+    elif args.command == "clear":
+        server.clear()
+        print(f"  removed {server.state_dir}")
+
+
+if __name__ == "__main__":
+    main()
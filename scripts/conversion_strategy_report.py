@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Conversion strategy report for the converter pages.
+Converts the same amounts with every conversion strategy a page offers (step by step,
+in-page batch driver and, on XE.com, deep links) and prints the time per conversion of each,
+plus the largest difference from the step-by-step results.
+Runs against the local stand-in sites unless --live is given.
+
+Example:
+  python scripts/conversion_strategy_report.py --amounts 50 --latency-ms 50
+"""
+
+import argparse
+import os
+import sys
+from contextlib import ExitStack
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from playwright.sync_api import sync_playwright
+from pages.xe_page import XEPage
+from pages.wise_page import WisePage
+from utils.stub_server import StubConverterServer, StubSiteConfig
+
+
+PAGE_CLASSES = {"xe.com": XEPage, "wise.com": WisePage}
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Compare the conversion strategies of the converter pages")
+    parser.add_argument("--amounts", type=int, default=20, help="number of amounts per currency pair")
+    parser.add_argument("--sources", nargs="+", default=list(PAGE_CLASSES), choices=list(PAGE_CLASSES))
+    parser.add_argument("--live", action="store_true", help="use the real websites instead of the stand-in sites")
+    parser.add_argument("--latency-ms", type=int, default=50)
+    parser.add_argument("--headed", action="store_true")
+    return parser.parse_args()
+
+
+def main():
+    """Run both strategies for every requested source and print the comparison."""
+    args = parse_args()
+    amounts = [1000 + 10 * i for i in range(args.amounts)]
+
+    with ExitStack() as stack:
+        site_urls = {}
+        if not args.live:
+            server = stack.enter_context(StubConverterServer(StubSiteConfig(latency_ms=args.latency_ms, seed=1)))
+            site_urls = server.site_urls()
+        playwright = stack.enter_context(sync_playwright())
+        browser = playwright.chromium.launch(headless=not args.headed)
+        try:
+            for source in args.sources:
+                runs = {strategy: run_strategy(browser, PAGE_CLASSES[source], strategy, amounts, site_urls.get(source))
+                        for strategy in PAGE_CLASSES[source].CONVERSION_STRATEGIES}
+                print_report(source, runs)
+        finally:
+            browser.close()
+
+
+def run_strategy(browser, page_class, strategy, amounts, url):
+    """Convert the amounts with one strategy in a fresh context, returning its timing summary and results."""
+    context = browser.new_context(viewport={"width": 1280, "height": 720}, locale="en-US")
+    try:
+        page_object = page_class(context.new_page(), url=url, conversion_strategy=strategy)
+        results = page_object.get_rsd_conversions(amounts)
+        return {"summary": page_object.conversion_timing_summary()[strategy], "results": results}
+    finally:
+        context.close()
+
+
+def print_report(source, runs):
+    """Print one source's comparison against the step-by-step strategy."""
+    steps = runs["steps"]
+    print("=" * 60)
+    print(f"{source} ({steps['summary']['count']} conversions per strategy)")
+    for strategy, run in runs.items():
+        summary = run["summary"]
+        difference = max(abs(a["converted_amount"] - b["converted_amount"])
+                         for a, b in zip(steps["results"], run["results"]))
+        print(f"  {strategy:<9} {summary['seconds']:>7.2f} s  ({summary['ms_per_conversion']:.0f} ms per conversion, "
+              f"{steps['summary']['seconds'] / summary['seconds']:.1f}x, largest difference {difference:.6f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Browser vs HTTP rate acquisition benchmark.
+Reads the same rate through a page object (Chromium plus network rate capture) and through the
+browser-free HTTP rate source, and prints the startup time (until the first rate) and the average
+latency of further rate reads for both paths. Runs against the local stand-in sites unless --live is given.
+
+Example:
+  python scripts/rate_path_benchmark.py --reads 20 --latency-ms 50
+"""
+
+import argparse
+import os
+import sys
+import time
+from contextlib import ExitStack
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from playwright.sync_api import sync_playwright
+from utils.currency_converter import CurrencyConverter
+from utils.http_rate_source import KeepAliveClient
+from utils.stub_server import StubConverterServer, StubSiteConfig
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Compare browser and HTTP rate acquisition")
+    parser.add_argument("--reads", type=int, default=10, help="rate reads after the first one")
+    parser.add_argument("--sources", nargs="+", default=list(CurrencyConverter.SOURCES),
+                        choices=list(CurrencyConverter.SOURCES))
+    parser.add_argument("--pair", nargs=2, default=["RSD", "EUR"], metavar=("FROM", "TO"))
+    parser.add_argument("--live", action="store_true", help="use the real websites instead of the stand-in sites")
+    parser.add_argument("--latency-ms", type=int, default=50)
+    return parser.parse_args()
+
+
+def main():
+    """Measure both paths for every requested source."""
+    args = parse_args()
+    pair = tuple(args.pair)
+    with ExitStack() as stack:
+        site_urls = {}
+        if not args.live:
+            server = stack.enter_context(StubConverterServer(StubSiteConfig(latency_ms=args.latency_ms, seed=1)))
+            site_urls = server.site_urls()
+        for source in args.sources:
+            url = site_urls.get(source)
+            browser = measure_browser(CurrencyConverter.SOURCES[source], url, pair, args.reads)
+            http = measure_http(CurrencyConverter.HTTP_SOURCES[source], url, pair, args.reads)
+            print_result(source, pair, browser, http)
+
+
+def measure_browser(page_class, url, pair, reads):
+    """Launch Chromium and read the rate through the page object's network rate capture."""
+    start = time.perf_counter()
+    with sync_playwright() as playwright:
+        browser = playwright.chromium.launch(headless=True)
+        try:
+            page_object = page_class(browser.new_page(), capture_rates=True, url=url)
+            rate = read_browser_rate(page_object, pair)
+            startup = time.perf_counter() - start
+            latencies = []
+            for _ in range(reads):
+                read_start = time.perf_counter()
+                read_browser_rate(page_object, pair)
+                latencies.append(time.perf_counter() - read_start)
+        finally:
+            browser.close()
+    return {"startup": startup, "latencies": latencies, "rate": rate}
+
+
+def read_browser_rate(page_object, pair):
+    """Reload the converter and return the freshly captured (or scraped) rate."""
+    page_object.captured_rate_tables.clear()
+    page_object._selected_from_currency = page_object._selected_to_currency = None
+    return page_object.get_conversions([pair], [1])[0]["exchange_rate"]
+
+
+def measure_http(source_class, url, pair, reads):
+    """Read the rate from the source's rate endpoint over a keep-alive client."""
+    start = time.perf_counter()
+    with KeepAliveClient() as client:
+        rate_source = source_class(client, url=url)
+        rate = rate_source.get_rate(*pair)
+        startup = time.perf_counter() - start
+        latencies = []
+        for _ in range(reads):
+            read_start = time.perf_counter()
+            rate_source.get_rate(*pair)
+            latencies.append(time.perf_counter() - read_start)
+        connections = client.stats["connections_opened"]
+    return {"startup": startup, "latencies": latencies, "rate": rate, "connections": connections}
+
+
+def print_result(source, pair, browser, http):
+    """Print one source's comparison."""
+    print("=" * 60)
+    print(f"{source} {pair[0]} → {pair[1]}")
+    for name, run in (("browser", browser), ("http", http)):
+        average = sum(run["latencies"]) / len(run["latencies"]) * 1000 if run["latencies"] else 0.0
+        print(f"  {name:<8} startup {run['startup']:>6.2f} s   per rate {average:>7.1f} ms   rate {run['rate']:.10f}")
+    print(f"  HTTP used {http['connections']} connection(s) for {len(http['latencies']) + 1} reads")
+
+
+if __name__ == "__main__":
+    main()
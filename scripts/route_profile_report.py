@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Route profile report for the converter pages.
+Loads every page once without and once with its resource-blocking route profile
+and prints the requests, bytes and load time saved.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from playwright.sync_api import sync_playwright
+from pages.xe_page import XEPage
+from pages.wise_page import WisePage
+from utils.route_profile import compare_route_profile
+
+
+PAGE_CLASSES = (XEPage, WisePage)
+
+
+def main():
+    """Compare every converter page with and without its route profile."""
+    headed = os.getenv("BROWSER_HEADED", "false").lower() == "true"
+    with sync_playwright() as playwright:
+        browser = playwright.chromium.launch(headless=not headed)
+        try:
+            for page_class in PAGE_CLASSES:
+                print_report(compare_route_profile(browser, page_class, viewport={"width": 1280, "height": 720},
+                                                   locale="en-US"))
+        finally:
+            browser.close()
+
+
+def print_report(report):
+    """Print one source's comparison."""
+    baseline, profiled = report["baseline"], report["profiled"]
+    print("=" * 60)
+    print(f"{report['source']}")
+    print(f"  Requests:  {baseline['requests']:>6} -> {profiled['requests']:>6}  "
+          f"(saved {report['requests_saved']}, blocked {profiled['blocked_requests']})")
+    print(f"  Bytes:     {baseline['bytes'] / 1024:>6.0f} -> {profiled['bytes'] / 1024:>6.0f} KiB  "
+          f"(saved {report['bytes_saved'] / 1024:.0f} KiB)")
+    print(f"  Load time: {baseline['load_seconds']:>6.2f} -> {profiled['load_seconds']:>6.2f} s  "
+          f"(change {report['load_seconds_change']:+.2f} s)")
+
+
+if __name__ == "__main__":
+    main()
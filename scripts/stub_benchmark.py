@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Load test of the web conversion flow against the local stand-in converter sites.
+Runs CurrencyConverter's scraping (no calculator) for many amounts and reports throughput,
+so page-object changes can be benchmarked without touching the real websites.
+
+Example:
+  python scripts/stub_benchmark.py --amounts 1000 --page-count 4 --latency-ms 50
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from playwright.sync_api import sync_playwright
+from pages.base_page import BasePage
+from utils.currency_converter import CurrencyConverter
+from utils.stub_server import StubConverterServer, StubSiteConfig
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark CurrencyConverter against stand-in sites")
+    parser.add_argument("--amounts", type=int, default=200, help="number of amounts per currency pair")
+    parser.add_argument("--sources", nargs="+", default=["xe.com", "wise.com"], choices=["xe.com", "wise.com"])
+    parser.add_argument("--page-count", type=int, default=1)
+    parser.add_argument("--wise-wait-mode", default="value", choices=["value", "response", "static"])
+    parser.add_argument("--capture-rates", action="store_true")
+    parser.add_argument("--sample-size", type=int, default=None)
+    parser.add_argument("--latency-ms", type=int, default=50)
+    parser.add_argument("--jitter-ms", type=int, default=0)
+    parser.add_argument("--tick-interval", type=float, default=0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--headed", action="store_true")
+    return parser.parse_args()
+
+
+def main():
+    """Run every requested source against the stand-in sites and print throughput."""
+    args = parse_args()
+    amounts = [1000 + 10 * i for i in range(args.amounts)]
+    config = StubSiteConfig(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                            tick_interval=args.tick_interval, failure_rate=args.failure_rate, seed=1)
+
+    with StubConverterServer(config) as server, sync_playwright() as playwright:
+        browser = playwright.chromium.launch(headless=not args.headed)
+        try:
+            for source in args.sources:
+                context = browser.new_context(viewport={"width": 1280, "height": 720}, locale="en-US")
+                try:
+                    converter = CurrencyConverter(context.new_page(), capture_rates=args.capture_rates,
+                                                  wise_wait_mode=args.wise_wait_mode, sample_size=args.sample_size,
+                                                  page_count=args.page_count, site_urls=server.site_urls())
+                    start = time.perf_counter()
+                    web_data = converter.get_web_data(source, amounts)
+                    elapsed = time.perf_counter() - start
+                finally:
+                    context.close()
+                print_result(source, web_data, elapsed, server)
+        finally:
+            browser.close()
+        print(f"Stand-in sites served {server.stats['requests']} requests, "
+              f"{server.stats['failures']} injected failures")
+        savings = BasePage.wait_savings()
+        print(f"Adaptive waits: {savings['waits']} waits in {savings['seconds']:.2f} s, "
+              f"saving {savings['saved_seconds']:.2f} s against the fixed sleeps they replaced")
+
+
+def print_result(source, web_data, elapsed, server):
+    """Print throughput and accuracy for one source."""
+    conversions = 0
+    worst = 0.0
+    for currency in ("eur", "usd"):
+        rate = server.rate("RSD", currency.upper())
+        for amount, converted in web_data[currency]["conversions"].items():
+            conversions += 1
+            worst = max(worst, abs(converted - amount * rate))
+    print("=" * 60)
+    print(f"{source}: {conversions} conversions in {elapsed:.2f} s "
+          f"({conversions / elapsed:.1f} conversions/s)")
+    print(f"  Largest difference from the stand-in rate: {worst:.6f}")
+
+
+if __name__ == "__main__":
+    main()
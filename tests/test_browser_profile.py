@@ -0,0 +1,110 @@
+"""
+Browser Profile Tests
+Checks stored state handling of BrowserProfile on disk - no browser needed.
+"""
+
+import json
+import os
+from utils.browser_profile import BrowserProfile
+from utils.logger import log_info
+
+
+STATE = {"cookies": [{"name": "consent", "domain": ".xe.com"}, {"name": "session", "domain": "wise.com"},
+                     {"name": "locale", "domain": "www.xe.com"}],
+         "origins": []}
+
+
+def write_file(path: str, size: int) -> None:
+    """Create a file of size bytes, with its directories."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(b"x" * size)
+
+
+def create_profile(tmp_path) -> BrowserProfile:
+    """Profile with a user-data directory (100 bytes of cookies, 300 bytes of caches) and a storage state file."""
+    profile = BrowserProfile(str(tmp_path / "profile"), str(tmp_path / "state" / "storage.json"))
+    write_file(os.path.join(profile.user_data_dir, "Default", "Cookies"), 100)
+    write_file(os.path.join(profile.user_data_dir, "Default", "Cache", "data_0"), 200)
+    write_file(os.path.join(profile.user_data_dir, "Default", "Code Cache", "js", "index"), 100)
+    os.makedirs(os.path.dirname(profile.storage_state_path))
+    with open(profile.storage_state_path, "w", encoding="utf-8") as f:
+        json.dump(STATE, f)
+    return profile
+
+
+class FakeBrowserType:
+    """BrowserType recording persistent launches."""
+
+    def __init__(self):
+        self.launches = []
+
+    def launch_persistent_context(self, user_data_dir, **options):
+        self.launches.append((user_data_dir, options))
+        return FakeContext()
+
+
+class FakeContext:
+    """Persistent context collecting restored cookies."""
+
+    def __init__(self):
+        self.cookies = []
+
+    def add_cookies(self, cookies):
+        self.cookies.extend(cookies)
+
+
+class TestBrowserProfile:
+    """Test class for BrowserProfile."""
+
+    def test_context_args_load_stored_state_once_it_exists(self, tmp_path):
+        """context_args only points new contexts at a storage state file that was saved before."""
+        profile = BrowserProfile(storage_state_path=str(tmp_path / "storage.json"))
+        assert profile.enabled and profile.context_args() == {}
+
+        (tmp_path / "storage.json").write_text(json.dumps(STATE))
+        assert profile.context_args() == {"storage_state": str(tmp_path / "storage.json")}
+        assert not BrowserProfile().enabled and BrowserProfile().context_args() == {}
+        log_info("✓ Stored state is loaded once it exists")
+
+    def test_clear_cache_only_keeps_cookies(self, tmp_path):
+        """cache_only drops the cache folders and keeps the rest of the profile and the storage state."""
+        profile = create_profile(tmp_path)
+        removed = profile.clear(cache_only=True)
+
+        assert sorted(removed) == sorted([os.path.join(profile.user_data_dir, "Default", "Cache"),
+                                          os.path.join(profile.user_data_dir, "Default", "Code Cache")])
+        assert os.path.exists(os.path.join(profile.user_data_dir, "Default", "Cookies"))
+        assert os.path.exists(profile.storage_state_path)
+        log_info("✓ Cache-only clear keeps cookies and consent")
+
+    def test_clear_removes_profile_and_storage_state(self, tmp_path):
+        """A full clear removes the user-data directory and the storage state file."""
+        profile = create_profile(tmp_path)
+        removed = profile.clear()
+
+        assert removed == [profile.user_data_dir, profile.storage_state_path]
+        assert not os.path.exists(profile.user_data_dir) and not os.path.exists(profile.storage_state_path)
+        assert profile.clear() == []
+        log_info("✓ Full clear removes every stored state")
+
+    def test_info_reports_sizes_and_cookie_domains(self, tmp_path):
+        """info sums the profile and cache sizes and lists the stored cookies' domains."""
+        profile = create_profile(tmp_path)
+        details = profile.info()
+
+        assert details["profile_bytes"] == 400 and details["cache_bytes"] == 300
+        assert details["cookies"] == 3
+        assert details["cookie_domains"] == ["wise.com", "www.xe.com", "xe.com"]
+        assert BrowserProfile().info() == {"user_data_dir": None, "storage_state_path": None}
+        log_info("✓ Profile info reports sizes and cookies")
+
+    def test_launch_persistent_restores_stored_cookies(self, tmp_path):
+        """Persistent contexts get the launch options and the storage state's cookies."""
+        profile = create_profile(tmp_path)
+        browser_type = FakeBrowserType()
+        context = profile.launch_persistent(browser_type, slow_mo=25, locale="en-US")
+
+        assert browser_type.launches == [(profile.user_data_dir, {"slow_mo": 25, "locale": "en-US"})]
+        assert context.cookies == STATE["cookies"]
+        log_info("✓ Persistent launch restores stored cookies")
@@ -0,0 +1,144 @@
+"""
+Browser Server Tests
+Checks the shared browser server's state file, ownership checks and restart decisions - runs a
+stand-in browser that only serves the DevTools version endpoint, no Chromium needed.
+"""
+
+import os
+import signal
+import subprocess
+import sys
+import textwrap
+import pytest
+from utils.browser_server import BrowserServer
+from utils.logger import log_info
+
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="the stand-in browser is a POSIX script")
+
+# Stand-in Chromium: answers /json/version on a free port and reports it in the profile's
+# DevToolsActivePort file, as Chromium does with --remote-debugging-port=0
+FAKE_BROWSER = textwrap.dedent("""
+    import os
+    import sys
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200 if self.path == "/json/version" else 404)
+            self.end_headers()
+            self.wfile.write(b"{}")
+
+        def log_message(self, *args):
+            pass
+
+    user_data_dir = next(arg.split("=", 1)[1] for arg in sys.argv if arg.startswith("--user-data-dir="))
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    with open(os.path.join(user_data_dir, "DevToolsActivePort"), "w") as f:
+        f.write(f"{server.server_port}\\n/devtools/browser/fake\\n")
+    server.serve_forever()
+""")
+
+
+@pytest.fixture
+def fake_browser(tmp_path):
+    """Path of the stand-in browser executable."""
+    script = tmp_path / "chromium"
+    script.write_text(f"#!{sys.executable}\n" + FAKE_BROWSER, encoding="utf-8")
+    script.chmod(0o755)
+    return str(script)
+
+
+@pytest.fixture
+def server(tmp_path):
+    """Browser server in a temporary directory, stopped after the test."""
+    server = BrowserServer(str(tmp_path / "server"))
+    yield server
+    server.stop()
+
+
+def finished_pid() -> int:
+    """Pid of a process that has exited and been reaped."""
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+class TestBrowserServer:
+    """Test class for BrowserServer."""
+
+    def test_start_status_and_stop(self, server, fake_browser):
+        """A started server is running on its stored endpoint until it is stopped."""
+        assert server.status() == {"running": False}
+
+        status = server.start(fake_browser)
+        assert status["running"] and status["headless"] and status["uptime_seconds"] >= 0
+        assert status["endpoint"] == f"ws://127.0.0.1:{status['port']}/devtools/browser/fake"
+        assert server.start(fake_browser)["pid"] == status["pid"]
+
+        assert server.stop()
+        assert server.status() == {"running": False} and not os.path.exists(server.state_path)
+        assert not server.stop()
+        log_info("✓ Browser server starts once and stops")
+
+    def test_owns_port_rejects_foreign_and_dead_processes(self, server, fake_browser):
+        """The stored pid only counts while it is alive, runs our profile and the port file names its port."""
+        state = server.start(fake_browser)
+        assert server._owns_port(state)
+
+        assert not server._owns_port({**state, "port": state["port"] + 1})
+        assert not server._owns_port({**state, "pid": finished_pid()})
+        # Alive, but not a browser on our user data directory
+        assert not server._owns_port({**state, "pid": os.getpid()})
+        os.remove(os.path.join(server.user_data_dir, "DevToolsActivePort"))
+        assert not server._owns_port(state) and not server.status()["running"]
+        os.kill(state["pid"], signal.SIGTERM)
+        log_info("✓ Only our own browser owns the stored port")
+
+    def test_stale_state_is_not_running(self, server, fake_browser):
+        """A state file whose pid is gone reports the server as not running and is cleared by stop()."""
+        state = server.start(fake_browser)
+        server._write_state({**state, "pid": finished_pid()})
+
+        status = server.status()
+        assert not status["running"] and status["uptime_seconds"] == 0.0
+        # The browser behind the stale pid is not ours to kill
+        assert not server.stop() and server._endpoint_answers(state["port"])
+        os.kill(state["pid"], signal.SIGTERM)
+        log_info("✓ Stale state is reported as not running")
+
+    def test_ensure_running_reuses_a_matching_server(self, server, fake_browser):
+        """A running server with the same headless mode and switches is reused."""
+        endpoint = server.ensure_running(fake_browser)
+        pid = server.status()["pid"]
+
+        assert BrowserServer(server.state_dir).ensure_running(fake_browser) == endpoint
+        assert server.status()["pid"] == pid
+        log_info("✓ Matching server is reused")
+
+    def test_ensure_running_restarts_on_other_launch_options(self, server, fake_browser):
+        """Another headless mode or other switches restart the server."""
+        server.ensure_running(fake_browser)
+        first = server.status()
+
+        headed = BrowserServer(server.state_dir, headless=False)
+        headed.ensure_running(fake_browser)
+        second = server.status()
+        assert second["pid"] != first["pid"] and not second["headless"]
+        assert not server._endpoint_answers(first["port"])
+
+        BrowserServer(server.state_dir, headless=False, args=["--lang=en-US"]).ensure_running(fake_browser)
+        third = server.status()
+        assert third["pid"] != second["pid"] and third["args"] == ["--lang=en-US"]
+        log_info("✓ Server restarts for other launch options")
+
+    def test_ensure_running_relaunches_a_dead_server(self, server, fake_browser):
+        """A server that died since it was started is relaunched."""
+        server.ensure_running(fake_browser)
+        first = server.status()
+        os.kill(first["pid"], signal.SIGTERM)
+
+        server.ensure_running(fake_browser)
+        second = server.status()
+        assert second["running"] and second["pid"] != first["pid"]
+        log_info("✓ Dead server is relaunched")
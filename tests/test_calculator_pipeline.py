@@ -0,0 +1,86 @@
+"""
+Calculator Pipeline Tests
+Checks how web results are queued to the calculator thread - runs on the decimal backend, no browser needed.
+"""
+
+import pytest
+from calculators import CalculatorPipeline, CalculatorService, DecimalCalculator
+from utils.currency_converter import CurrencyConverter
+from utils.logger import log_info
+
+
+AMOUNTS = [1000, 2000]
+EUR_RATE = 0.008525
+USD_RATE = 0.009871
+
+
+class RecordingCalculator(DecimalCalculator):
+    """Decimal calculator that records every (amount, rate) it is asked to multiply."""
+
+    def __init__(self):
+        super().__init__(places=2)
+        self.calls = []
+
+    def perform_calculation(self, amount: float, rate: float) -> float:
+        self.calls.append((amount, rate))
+        return super().perform_calculation(amount, rate)
+
+
+def web_results(to_currency: str, rate: float) -> list:
+    """One pair's web results as a page reports them."""
+    return [{"amount": amount, "from_currency": "RSD", "to_currency": to_currency,
+             "converted_amount": amount * rate, "exchange_rate": rate} for amount in AMOUNTS]
+
+
+class TestCalculatorPipeline:
+    """Test class for CalculatorPipeline."""
+
+    def test_feed_queues_each_pair_once(self):
+        """Feeding a pair again - even with another rate - does not queue its amounts twice."""
+        calculator = RecordingCalculator()
+        pipeline = CalculatorPipeline(calculator, AMOUNTS, "Calculator").start()
+        pipeline.feed(web_results("EUR", EUR_RATE))
+        pipeline.feed(web_results("EUR", EUR_RATE) + web_results("USD", USD_RATE))
+        pipeline.feed(web_results("USD", 0.01))
+        results = pipeline.finish({"eur": EUR_RATE, "usd": USD_RATE})
+
+        assert sorted(calculator.calls) == sorted([(a, EUR_RATE) for a in AMOUNTS] + [(a, USD_RATE) for a in AMOUNTS])
+        assert results["eur"]["conversions"] == {1000: 8.52, 2000: 17.05}
+        assert results["usd"]["conversions"] == {1000: 9.87, 2000: 19.74}
+        log_info("✓ Every pair is calculated once")
+
+    def test_finish_requeues_a_pair_whose_rate_changed(self):
+        """A final rate that differs from the fed one is calculated again, and only its results are reported."""
+        calculator = RecordingCalculator()
+        pipeline = CalculatorPipeline(calculator, AMOUNTS, "Calculator").start()
+        pipeline.feed(web_results("EUR", 0.0085))
+        results = pipeline.finish({"eur": EUR_RATE, "usd": USD_RATE})
+
+        assert [call for call in calculator.calls if call[1] == EUR_RATE] == [(a, EUR_RATE) for a in AMOUNTS]
+        assert len(calculator.calls) == 3 * len(AMOUNTS)
+        assert results["eur"]["exchange_rate"] == EUR_RATE
+        assert results["eur"]["conversions"] == {1000: 8.52, 2000: 17.05}
+        assert results["usd"]["conversions"] == {1000: 9.87, 2000: 19.74}
+        log_info("✓ Changed and never-fed pairs are queued by finish")
+
+    def test_calculator_error_is_raised_by_finish(self):
+        """An error on the calculator thread surfaces when the pipeline is finished."""
+        class FailingCalculator(DecimalCalculator):
+            def perform_calculation(self, amount: float, rate: float) -> float:
+                raise RuntimeError("calculator crashed")
+
+        pipeline = CalculatorPipeline(FailingCalculator(), AMOUNTS, "Calculator").start()
+        pipeline.feed(web_results("EUR", EUR_RATE))
+
+        with pytest.raises(RuntimeError, match="calculator crashed"):
+            pipeline.finish({"eur": EUR_RATE})
+        log_info("✓ Calculator errors are raised by finish")
+
+    def test_gui_pipeline_is_refused_with_a_headed_browser(self):
+        """The GUI calculator cannot share the desktop focus with a visible browser; other backends can."""
+        with pytest.raises(ValueError):
+            CurrencyConverter(None, pipeline=True, headed=True, calculator=CalculatorService("gui"))
+
+        assert CurrencyConverter(None, pipeline=True, headed=True, calculator=CalculatorService("decimal")).pipeline
+        assert CurrencyConverter(None, pipeline=True, headed=False, calculator=CalculatorService("gui")).pipeline
+        log_info("✓ GUI pipeline is refused next to a headed browser")
@@ -0,0 +1,93 @@
+"""
+Calculator Sampling Tests
+Checks CalculatorService's sampling mode and cross check against the reference engine - no GUI needed.
+"""
+
+import pytest
+from calculators import CalculatorService, DecimalCalculator
+from utils.logger import log_info
+
+
+AMOUNTS = [1000, 2000, 3000, 4000, 5000]
+RATES = {"eur": 0.0085318237, "eur_usd": 1.0845}
+
+
+class CentCalculator(DecimalCalculator):
+    """Stand-in for a calculator app that shows two decimals."""
+
+    def __init__(self, offset: float = 0.0):
+        super().__init__(places=2)
+        self.offset = offset
+        self.amounts = []
+
+    def get_platform_name(self) -> str:
+        return "Cent"
+
+    def calculate_bulk(self, amounts: list, rate: float) -> list:
+        self.amounts.extend(amounts)
+        return [result + self.offset for result in super().calculate_bulk(amounts, rate)]
+
+
+def sampling_service(calculator: CentCalculator, sample_seed: int = 7) -> CalculatorService:
+    """A service pushing two amounts through the stand-in calculator."""
+    return CalculatorService(sample_size=2, sample_seed=sample_seed, calculator=calculator)
+
+
+class TestCalculatorSampling:
+    """Test class for CalculatorService sampling mode."""
+
+    def test_seeded_sample_is_reproducible(self):
+        """The same seed picks the same amounts, in their original order."""
+        first = sampling_service(CentCalculator()).choose_sample(AMOUNTS)
+        second = sampling_service(CentCalculator()).choose_sample(AMOUNTS)
+
+        assert first == second
+        assert len(first) == 2 and first == sorted(first) and set(first) <= set(AMOUNTS)
+        log_info(f"✓ Seeded sample is reproducible: {first}")
+
+    def test_sample_goes_through_backend_and_reference_fills_the_rest(self):
+        """Only the sample reaches the backend; every other amount comes from the reference engine."""
+        calculator = CentCalculator()
+        service = sampling_service(calculator)
+        results = service.calculate_conversions(AMOUNTS, RATES, "XE.com")
+        reference = DecimalCalculator().calculate_conversions(AMOUNTS, RATES, "XE.com")
+
+        assert results["engines"] == {"sampled": "Cent", "derived": "Decimal"}
+        for key in RATES:
+            entry = results[key]
+            assert entry["sampled"] == sorted(set(calculator.amounts))
+            assert sorted(entry["sampled"] + entry["derived"]) == AMOUNTS
+            for amount in entry["derived"]:
+                assert entry["conversions"][amount] == reference[key]["conversions"][amount]
+            for amount in entry["sampled"]:
+                assert entry["conversions"][amount] == round(amount * RATES[key], 2)
+        log_info("✓ Backend sample and reference amounts are merged")
+
+    def test_rounding_differences_pass_the_cross_check(self):
+        """Two-decimal backend results stay within CROSS_CHECK_TOLERANCE of the reference."""
+        results = sampling_service(CentCalculator()).calculate_conversions(AMOUNTS, RATES, "XE.com")
+        cross_check = results["eur"]["cross_check"]
+
+        assert cross_check["passed"] and cross_check["agreement_rate"] == 1.0
+        assert 0 < cross_check["max_difference"] <= 0.005
+        assert cross_check["tolerance"] == CalculatorService.CROSS_CHECK_TOLERANCE
+        log_info(f"✓ Cross check passes (max difference {cross_check['max_difference']:.6f})")
+
+    def test_differences_beyond_tolerance_fail_the_cross_check(self):
+        """A backend off by more than the tolerance fails the cross check."""
+        results = sampling_service(CentCalculator(offset=0.05)).calculate_conversions(AMOUNTS, RATES, "XE.com")
+        cross_check = results["eur"]["cross_check"]
+
+        assert not cross_check["passed"] and cross_check["agreement_rate"] == 0.0
+        assert cross_check["max_difference"] == pytest.approx(0.05, abs=0.006)
+        log_info("✓ Cross check fails beyond the tolerance")
+
+    def test_no_sampling_for_decimal_backend_or_small_runs(self):
+        """The decimal backend and runs not larger than the sample calculate every amount themselves."""
+        decimal_results = CalculatorService("decimal", sample_size=2).calculate_conversions(AMOUNTS, RATES, "XE.com")
+        calculator = CentCalculator()
+        small_results = sampling_service(calculator).calculate_conversions(AMOUNTS[:2], RATES, "XE.com")
+
+        assert "engines" not in decimal_results and len(decimal_results["eur"]["conversions"]) == len(AMOUNTS)
+        assert "engines" not in small_results and sorted(set(calculator.amounts)) == AMOUNTS[:2]
+        log_info("✓ Sampling is skipped where it cannot save anything")
@@ -0,0 +1,105 @@
+"""
+Calculator Session Tests
+Checks how a calculator session reuses, health-checks and relaunches the calculator - runs on the
+decimal backend, no calculator app needed.
+"""
+
+from calculators import CalculatorService, DecimalCalculator
+from utils.logger import log_info
+
+
+RATES = {"eur": 0.008525}
+
+
+class FlakyCalculator(DecimalCalculator):
+    """Decimal calculator counting opens and closes, whose health check fails on demand."""
+
+    def __init__(self):
+        super().__init__(places=2)
+        self.opened = 0
+        self.closed = 0
+        self.healthy = True
+
+    def _open_calculator(self) -> None:
+        super()._open_calculator()
+        self.opened += 1
+        self.healthy = True
+
+    def _close_calculator(self) -> None:
+        super()._close_calculator()
+        self.closed += 1
+
+    def is_healthy(self) -> bool:
+        return self.calculator_open and self.healthy
+
+
+class TestCalculatorSession:
+    """Test class for BaseCalculator.acquire_calculator and release_calculator."""
+
+    def test_without_session_every_run_opens_and_closes(self):
+        """Outside a session each run launches the calculator and closes it again."""
+        calculator = FlakyCalculator()
+        calculator.calculate_conversions([1000], RATES, "XE.com")
+        calculator.calculate_conversions([2000], RATES, "Wise.com")
+
+        assert (calculator.opened, calculator.closed) == (2, 2)
+        assert calculator.session_launches == 0 and not calculator.calculator_open
+        log_info("✓ Runs outside a session open and close the calculator")
+
+    def test_session_reuses_a_healthy_calculator(self):
+        """A session launches on first use, reuses the healthy calculator and closes it once at the end."""
+        calculator = FlakyCalculator()
+        calculator.open_session()
+        assert calculator.opened == 0
+
+        for source in ("XE.com", "Wise.com", "XE.com"):
+            calculator.calculate_conversions([1000], RATES, source)
+        assert (calculator.opened, calculator.closed) == (1, 0) and calculator.session_launches == 1
+
+        calculator.close_session()
+        assert calculator.closed == 1 and not calculator.calculator_open
+        calculator.close_session()
+        assert calculator.closed == 1
+        log_info("✓ Session reuses one healthy calculator")
+
+    def test_failed_health_check_relaunches(self):
+        """A calculator failing its health check is closed and relaunched, and the launch is counted once."""
+        calculator = FlakyCalculator()
+        calculator.open_session()
+        calculator.acquire_calculator()
+        calculator.release_calculator()
+
+        calculator.healthy = False
+        calculator.acquire_calculator()
+        assert (calculator.opened, calculator.closed) == (2, 1) and calculator.session_launches == 2
+        assert calculator.is_healthy()
+
+        calculator.release_calculator()
+        calculator.acquire_calculator()
+        assert calculator.opened == 2 and calculator.session_launches == 2
+        calculator.close_session()
+        log_info("✓ Unhealthy calculator is relaunched once")
+
+    def test_session_that_never_calculated_opens_nothing(self):
+        """Closing a session without any run neither launches nor closes the calculator."""
+        calculator = FlakyCalculator()
+        calculator.open_session()
+        calculator.close_session()
+
+        assert (calculator.opened, calculator.closed) == (0, 0)
+        log_info("✓ Unused session launches nothing")
+
+    def test_service_session_spans_runs(self):
+        """CalculatorService sessions keep the injected calculator open across sources."""
+        calculator = FlakyCalculator()
+        service = CalculatorService(calculator=calculator)
+        service.open_session()
+        service.calculate_conversions([1000, 2000], RATES, "XE.com")
+        calculator.healthy = False
+        results = service.calculate_conversions([1000, 2000], RATES, "Wise.com")
+
+        assert results["eur"]["conversions"] == {1000: 8.52, 2000: 17.05}
+        assert calculator.opened == 2 and calculator.session_launches == 2
+        service.close_session()
+        assert calculator.closed == 2 and service.get_calculator_info()["session"] == "False"
+        log_info("✓ Service session relaunches the unhealthy calculator between sources")
@@ -0,0 +1,213 @@
+"""
+Context Pool Tests
+Checks leasing, reuse and state clearing of pooled browser contexts - no browser needed.
+"""
+
+import os
+import re
+import shutil
+import subprocess
+import sys
+import textwrap
+from utils.browser_profile import BrowserProfile
+from utils.context_pool import ContextPool
+from utils.logger import log_info
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Test module run against a copy of the repo's conftest: the browser fixtures are replaced by fakes,
+# so the context and context_pool fixtures run without a browser
+FIXTURE_TESTS = textwrap.dedent("""
+    import os
+    import pytest
+
+    class FakeContext:
+        def __init__(self, kind):
+            self.kind, self.pages, self.cookies, self.closed = kind, [], ["consent"], False
+        def clear_cookies(self):
+            self.cookies = []
+        def add_cookies(self, cookies):
+            self.cookies += cookies
+        def storage_state(self, path):
+            open(path, "w").write("{}")
+        def close(self):
+            self.closed = True
+
+    class FakeBrowser:
+        def new_context(self, **options):
+            return FakeContext("browser")
+        def close(self):
+            pass
+
+    class FakeBrowserType:
+        launches = []
+        def launch_persistent_context(self, user_data_dir, **options):
+            self.launches.append(options)
+            return FakeContext("persistent")
+
+    @pytest.fixture(scope="session")
+    def browser():
+        return FakeBrowser()
+
+    @pytest.fixture(scope="session")
+    def browser_type():
+        return FakeBrowserType()
+
+    @pytest.fixture
+    def new_context():
+        return lambda **options: FakeContext("new_context")
+
+    seen = []
+
+    @pytest.mark.parametrize("run", [1, 2])
+    def test_context(context, run):
+        seen.append(context)
+        print(f"CONTEXT kind={context.kind} reused={len(seen) == 2 and seen[0] is seen[1]}")
+        if FakeBrowserType.launches:
+            print(f"CONTEXT launch={sorted(FakeBrowserType.launches[0].items())}")
+""")
+
+
+class FakePage:
+    """Page with origin storage, as far as the pool touches it."""
+
+    def __init__(self, context, url: str = "https://www.xe.com/"):
+        self.context = context
+        self.url = url
+
+    def evaluate(self, script: str):
+        if self.url == "about:blank":
+            raise RuntimeError("localStorage is not available on about:blank")
+        self.context.storage.pop(self.url, None)
+
+    def close(self):
+        self.context.pages.remove(self)
+
+
+class FakeContext:
+    """BrowserContext with cookies, per-origin storage and pages."""
+
+    def __init__(self):
+        self.cookies = ["consent"]
+        self.storage = {}
+        self.pages = []
+        self.closed = False
+
+    def new_page(self, url: str = "https://www.xe.com/") -> FakePage:
+        page = FakePage(self, url)
+        self.pages.append(page)
+        self.storage[url] = {"preference": "1"}
+        return page
+
+    def clear_cookies(self):
+        self.cookies = []
+
+    def close(self):
+        self.closed = True
+
+
+class TestContextPool:
+    """Test class for ContextPool."""
+
+    def test_released_context_is_reused_with_its_state_cleared(self):
+        """With reuse on, the next lease gets the same context without pages, cookies or storage."""
+        pool = ContextPool(FakeContext)
+        with pool.lease() as context:
+            context.new_page()
+            context.new_page("about:blank")
+        with pool.lease() as reused:
+            assert reused is context
+            assert reused.pages == [] and reused.cookies == [] and reused.storage == {"about:blank": {"preference": "1"}}
+
+        assert not context.closed
+        assert pool.close() == {"created": 1, "reused": 1}
+        assert context.closed
+        log_info("✓ Warm context is reused with cookies and storage cleared")
+
+    def test_without_reuse_every_lease_gets_a_fresh_context(self):
+        """With reuse off, released contexts are closed and never handed out again."""
+        saved = []
+        pool = ContextPool(FakeContext, reuse=False, on_release=saved.append)
+        with pool.lease() as first:
+            pass
+        with pool.lease() as second:
+            pass
+
+        assert first is not second and first.closed and second.closed
+        assert saved == [first, second]
+        assert pool.close() == {"created": 2, "reused": 0}
+        log_info("✓ Every lease gets a fresh context when reuse is off")
+
+    def test_concurrent_leases_get_separate_contexts(self):
+        """A context is only handed out again after it was released."""
+        pool = ContextPool(FakeContext)
+        first, second = pool.acquire(), pool.acquire()
+        pool.release(first)
+        third = pool.acquire()
+
+        assert first is not second and third is first
+        pool.close()
+        assert first.closed and second.closed
+        log_info("✓ Leased contexts are not shared")
+
+    def test_profile_pool_keeps_state_and_saves_it(self, tmp_path):
+        """A configured profile keeps cookies and storage and gets the storage state saved on release."""
+        profile = BrowserProfile(user_data_dir=str(tmp_path / "profile"))
+        pool = ContextPool.for_profile(FakeContext, profile)
+        with pool.lease() as context:
+            context.new_page()
+
+        assert not pool.clear_state and pool.on_release == profile.save_storage_state
+        assert context.cookies == ["consent"] and context.storage
+        assert ContextPool.for_profile(FakeContext, BrowserProfile()).clear_state
+        log_info("✓ Profile pools keep their state")
+
+
+def run_context_fixture(tmp_path, *options: str, **env) -> str:
+    """Run FIXTURE_TESTS with the repo's conftest, pytest options and env; returns the CONTEXT lines it printed."""
+    shutil.copy(os.path.join(ROOT, "conftest.py"), tmp_path / "conftest.py")
+    (tmp_path / "test_fixture.py").write_text(FIXTURE_TESTS)
+    run_env = {key: value for key, value in os.environ.items()
+               if key not in ("CONTEXT_REUSE", "BROWSER_PROFILE_DIR", "BROWSER_STORAGE_STATE", "BROWSER_SERVER")}
+    run_env.update(env, PYTHONPATH=ROOT)
+    command = [sys.executable, "-m", "pytest", "-q", "-s", "-p", "no:cacheprovider", "test_fixture.py", *options]
+    completed = subprocess.run(command, cwd=tmp_path, env=run_env, capture_output=True, text=True, timeout=120)
+    assert completed.returncode == 0, completed.stdout + completed.stderr
+    return "\n".join(re.findall(r"CONTEXT [^\n]*", completed.stdout))
+
+
+class TestContextFixture:
+    """Test class for the conftest context fixture paths, with fake browser fixtures."""
+
+    def test_default_uses_pytest_playwright_new_context(self, tmp_path):
+        """Without CONTEXT_REUSE every test gets its own context from new_context."""
+        output = run_context_fixture(tmp_path)
+
+        assert output.count("kind=new_context") == 2 and "reused=True" not in output
+        log_info("✓ Default context comes from new_context")
+
+    def test_reuse_leases_from_the_pool(self, tmp_path):
+        """CONTEXT_REUSE=true hands the same warm browser context to consecutive tests."""
+        output = run_context_fixture(tmp_path, CONTEXT_REUSE="true")
+
+        assert output.count("kind=browser") == 2 and "reused=True" in output
+        log_info("✓ CONTEXT_REUSE leases warm contexts from the pool")
+
+    def test_profile_dir_leases_persistent_contexts(self, tmp_path):
+        """BROWSER_PROFILE_DIR makes the pool launch persistent contexts."""
+        output = run_context_fixture(tmp_path, BROWSER_PROFILE_DIR=str(tmp_path / "profile"),
+                                     BROWSER_STORAGE_STATE=str(tmp_path / "state.json"))
+
+        assert output.count("kind=persistent") == 2
+        assert (tmp_path / "state.json").exists()
+        log_info("✓ BROWSER_PROFILE_DIR leases persistent contexts")
+
+    def test_profile_dir_uses_pytest_playwright_launch_options(self, tmp_path):
+        """Persistent contexts are launched with --headed/--slowmo like the session browser, not BROWSER_HEADED."""
+        output = run_context_fixture(tmp_path, "--slowmo", "25", BROWSER_PROFILE_DIR=str(tmp_path / "profile"),
+                                     BROWSER_HEADED="true", BROWSER_SLOW_MO="500")
+
+        assert "('slow_mo', 25)" in output
+        assert "headless" not in output and "500" not in output
+        log_info("✓ Persistent contexts take pytest-playwright's launch options")
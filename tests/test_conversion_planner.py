@@ -0,0 +1,65 @@
+"""
+Conversion Planner Tests
+Checks pair ordering, selection counting and pair keys - no browser needed.
+"""
+
+import itertools
+import pytest
+from utils.conversion_planner import count_selections, pair_key, pair_label, plan_conversions, split_pair_key
+from utils.logger import log_info
+
+
+PAIRS = [("RSD", "EUR"), ("EUR", "USD"), ("RSD", "USD"), ("EUR", "GBP")]
+
+
+class TestConversionPlanner:
+    """Test class for plan_conversions, count_selections and the pair key scheme."""
+
+    def test_plan_groups_pairs_by_source_currency(self):
+        """Pairs sharing a source are consecutive and duplicates are dropped."""
+        plan = plan_conversions(PAIRS + [("RSD", "EUR")])
+
+        assert plan == [("RSD", "EUR"), ("RSD", "USD"), ("EUR", "USD"), ("EUR", "GBP")]
+        log_info("✓ Pairs are grouped by source currency")
+
+    def test_plan_starts_from_the_selected_pair(self):
+        """The selected source goes first, and the selected target first within it."""
+        plan = plan_conversions(PAIRS, selected=("EUR", "GBP"))
+
+        assert plan[:2] == [("EUR", "GBP"), ("EUR", "USD")]
+        assert count_selections(plan, ("EUR", "GBP")) == 3
+        log_info("✓ Plan continues from the current selection")
+
+    @pytest.mark.parametrize("selected", [None, ("RSD", "USD"), ("EUR", "USD")])
+    def test_plan_needs_no_more_selections_than_any_order(self, selected):
+        """No ordering of the pairs needs fewer dropdown selections than the plan."""
+        plan = plan_conversions(PAIRS, selected)
+        fewest = min(count_selections(list(order), selected) for order in itertools.permutations(PAIRS))
+
+        assert sorted(plan) == sorted(PAIRS)
+        assert count_selections(plan, selected) == fewest
+        log_info(f"✓ Plan from {selected} needs the fewest selections ({fewest})")
+
+    def test_count_selections(self):
+        """Each changed dropdown counts once per step."""
+        assert count_selections([]) == 0
+        assert count_selections([("RSD", "EUR")]) == 2
+        assert count_selections([("RSD", "EUR"), ("RSD", "USD"), ("EUR", "USD")]) == 4
+        assert count_selections([("RSD", "EUR")], selected=("RSD", "EUR")) == 0
+        log_info("✓ Dropdown selections are counted per change")
+
+    def test_same_currency_pair_is_rejected(self):
+        """A pair converting a currency to itself is a configuration error."""
+        with pytest.raises(ValueError):
+            plan_conversions([("EUR", "EUR")])
+        log_info("✓ Same-currency pairs are rejected")
+
+    def test_pair_keys_round_trip(self):
+        """RSD pairs keep their currency key, other pairs are keyed from_to, and both split back."""
+        assert pair_key("RSD", "EUR") == "eur"
+        assert pair_key("EUR", "USD") == "eur_usd"
+        for pair in PAIRS:
+            assert split_pair_key(pair_key(*pair)) == pair
+        assert pair_label("usd") == "USD"
+        assert pair_label("eur_usd") == "EUR → USD"
+        log_info("✓ Pair keys split back into their pairs")
@@ -0,0 +1,52 @@
+"""
+Decimal Calculator Tests
+Checks the in-process reference calculator - no GUI or browser needed.
+"""
+
+import pytest
+from calculators import CalculatorService, DecimalCalculator
+from utils.logger import log_info
+
+
+class TestDecimalCalculator:
+    """Test class for the Decimal reference calculator backend."""
+
+    def test_exact_and_rounded_products(self):
+        """Products use the rate's displayed digits and round with the configured mode."""
+        assert DecimalCalculator().perform_calculation(3000, 0.0085318237) == 25.5954711
+        assert DecimalCalculator(places=2).perform_calculation(1000, 0.008525) == 8.52
+        assert DecimalCalculator(places=2, rounding="ROUND_HALF_UP").perform_calculation(1000, 0.008525) == 8.53
+        assert DecimalCalculator(places=2, rounding="ROUND_DOWN").perform_calculation(1000, 0.008529) == 8.52
+        with pytest.raises(ValueError):
+            DecimalCalculator(rounding="HALF_UP")
+        log_info("✓ Decimal products and rounding modes are correct")
+
+    def test_service_selects_decimal_backend(self):
+        """CalculatorService picks the Decimal backend explicitly, whatever the OS."""
+        service = CalculatorService("decimal", places=4)
+        results = service.calculate_conversions([1000, 2000], {"eur": 0.00853182, "eur_usd": 1.0845}, "XE.com")
+
+        assert service.get_calculator_info()["implementation"] == "DecimalCalculator"
+        assert results["eur"]["conversions"] == {1000: 8.5318, 2000: 17.0636}
+        assert results["eur_usd"]["conversions"] == {1000: 1084.5, 2000: 2169.0}
+        log_info("✓ CalculatorService runs the Decimal backend")
+
+    @pytest.mark.parametrize("rounding", ["ROUND_HALF_EVEN", "ROUND_HALF_UP", "ROUND_HALF_DOWN", "ROUND_UP",
+                                          "ROUND_DOWN", "ROUND_CEILING", "ROUND_FLOOR"])
+    @pytest.mark.parametrize("precision", [28, 12, 6])
+    def test_vectorized_sweep_matches_decimal(self, rounding, precision):
+        """The numpy path gives exactly the Decimal loop's results, half-cent ties and short precisions included."""
+        pytest.importorskip("numpy")
+        # 600 and 1400 at this rate are exact half cents (5.115 and 11.935)
+        amounts = [600, 1400] + [round(i * 7.31, 2) for i in range(1, 5001)]
+        calculator = DecimalCalculator(places=2, rounding=rounding, precision=precision)
+        vectorized = calculator.calculate_bulk(amounts, 0.008525)
+        exact = DecimalCalculator(places=2, rounding=rounding, precision=precision,
+                                  vectorize=False).calculate_bulk(amounts, 0.008525)
+
+        assert vectorized == exact
+        assert vectorized == [float(calculator.multiply(amount, 0.008525)) for amount in amounts]
+        if rounding == "ROUND_HALF_EVEN" and precision == 28:
+            assert vectorized[:2] == [5.12, 11.94]
+        log_info(f"✓ Vectorized sweep of {len(amounts)} amounts matches the Decimal loop ({rounding}, "
+                 f"precision {precision})")
@@ -0,0 +1,49 @@
+"""
+HTTP Rate Source Tests
+Reads rates over plain HTTP from the local stub converter sites - no browser needed.
+"""
+
+import pytest
+from utils.http_rate_source import KeepAliveClient, WiseHttpRateSource, XEHttpRateSource
+from utils.stub_server import StubConverterServer, StubSiteConfig
+from utils.logger import log_info
+
+
+AMOUNTS = [1000, 2000, 3000]
+
+
+@pytest.fixture(scope="module")
+def stub_server():
+    """Stand-in sites with fixed rates."""
+    with StubConverterServer(StubSiteConfig(latency_ms=5, seed=3)) as server:
+        yield server
+
+
+@pytest.mark.stub
+class TestHttpRateSources:
+    """Test class for the browser-free rate sources against the stand-in sites."""
+
+    @pytest.mark.parametrize("source_class, source", [(XEHttpRateSource, "xe.com"), (WiseHttpRateSource, "wise.com")])
+    def test_rates_match_stub(self, stub_server, source_class, source):
+        """Every pair's rate and conversions come straight from the rate endpoint."""
+        with KeepAliveClient() as client:
+            rate_source = source_class(client, url=stub_server.url_for(source))
+            results = rate_source.get_conversions([("RSD", "EUR"), ("RSD", "USD"), ("EUR", "USD")], AMOUNTS)
+
+        assert len(results) == len(AMOUNTS) * 3, "Should have every pair for all amounts"
+        for result in results:
+            rate = stub_server.rate(result["from_currency"], result["to_currency"])
+            assert result["exchange_rate"] == pytest.approx(rate, rel=1e-12)
+            assert result["converted_amount"] == pytest.approx(result["amount"] * rate, rel=1e-12)
+            assert result["method"] == "http"
+        log_info(f"✓ {source} HTTP rates match the stand-in site")
+
+    def test_connections_are_reused(self, stub_server):
+        """Repeated rate reads share one keep-alive connection."""
+        with KeepAliveClient() as client:
+            rate_source = WiseHttpRateSource(client, url=stub_server.url_for("wise.com"))
+            for _ in range(5):
+                rate_source.get_rate("RSD", "EUR")
+
+        assert client.stats["requests"] == 5
+        assert client.stats["connections_opened"] == 1, "All reads should go over the first connection"
@@ -0,0 +1,136 @@
+"""
+Command Line Calculator Tests
+Checks gcalccmd answer parsing and the batched solver session - runs a stand-in gcalccmd, no GNOME needed.
+"""
+
+import io
+import os
+import sys
+import textwrap
+import pytest
+from calculators.linux_cli_calculator import LinuxCliCalculator
+from utils.logger import log_info
+
+
+# Stand-in gcalccmd: prompts without a newline like the real one, answers a*b exactly, writes
+# negative numbers with '−' and small ones in superscript notation, and logs what it reads
+FAKE_GCALCCMD = textwrap.dedent("""
+    import os
+    import sys
+    from decimal import Decimal
+
+    SUPERSCRIPT = str.maketrans("0123456789-", "⁰¹²³⁴⁵⁶⁷⁸⁹⁻")
+    log = open(os.environ["FAKE_GCALCCMD_LOG"], "a")
+    log.write(f"start {os.getpid()}\\n")
+
+    def answer(expression):
+        left, right = expression.split("*")
+        product = Decimal(left) * Decimal(right)
+        if product and abs(product) < Decimal("0.001"):
+            mantissa, exponent = f"{product:e}".split("e")
+            return f"{Decimal(mantissa).normalize()}×10{str(int(exponent)).translate(SUPERSCRIPT)}"
+        return str(product.normalize()).replace("-", "−")
+
+    sys.stdout.write("> ")
+    sys.stdout.flush()
+    for line in sys.stdin:
+        expression = line.strip()
+        if not expression:
+            break
+        log.write(f"read {expression}\\n")
+        log.flush()
+        sys.stdout.write(answer(expression) + "\\n> ")
+        sys.stdout.flush()
+""")
+
+
+@pytest.fixture
+def fake_gcalccmd(tmp_path, monkeypatch):
+    """Put the stand-in gcalccmd first on PATH; returns the path of its log."""
+    script = tmp_path / "gcalccmd"
+    script.write_text(f"#!{sys.executable}\n" + FAKE_GCALCCMD, encoding="utf-8")
+    script.chmod(0o755)
+    log = tmp_path / "gcalccmd.log"
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ.get('PATH', '')}")
+    monkeypatch.setenv("FAKE_GCALCCMD_LOG", str(log))
+    return log
+
+
+class FakeProcess:
+    """gcalccmd process whose output has already been written."""
+
+    def __init__(self, output: str):
+        self.stdout = io.StringIO(output)
+
+    def poll(self):
+        return 0
+
+
+class TestLinuxCliCalculator:
+    """Test class for LinuxCliCalculator."""
+
+    def test_parse_result_reads_gcalccmd_notation(self):
+        """Superscript exponents, the '−' minus sign and digit grouping spaces are understood."""
+        calculator = LinuxCliCalculator()
+
+        assert calculator._parse_result("8.5318237") == 8.5318237
+        assert calculator._parse_result("1.5×10⁻⁵") == pytest.approx(1.5e-05)
+        assert calculator._parse_result("2×10¹²") == 2e12
+        assert calculator._parse_result("−12.5") == -12.5
+        assert calculator._parse_result("−4×10⁻³") == pytest.approx(-0.004)
+        assert calculator._parse_result("1 234.5") == 1234.5
+        with pytest.raises(RuntimeError, match="Failed to parse"):
+            calculator._parse_result("Error: Division by zero")
+        log_info("✓ gcalccmd answers are parsed")
+
+    def test_read_result_strips_prompts(self):
+        """Prompts printed without a newline are stripped from the answer they precede."""
+        calculator = LinuxCliCalculator()
+        calculator.calculator_process = FakeProcess("> 8.53\n> > 17.06\n")
+
+        assert calculator._read_result() == 8.53
+        assert calculator._read_result() == 17.06
+        with pytest.raises(RuntimeError, match="exited with code 0"):
+            calculator._read_result()
+        log_info("✓ Prompts are stripped from answers")
+
+    def test_plain_avoids_exponent_notation(self):
+        """Numbers are written in plain decimal notation, as gcalccmd cannot read 1e-05."""
+        assert LinuxCliCalculator._plain(1e-05) == "0.00001"
+        assert LinuxCliCalculator._plain(0.0085318237) == "0.0085318237"
+        assert LinuxCliCalculator._plain(1.5e20) == "150000000000000000000"
+        assert LinuxCliCalculator._plain(1000) == "1000"
+        log_info("✓ Numbers are written without exponents")
+
+    @pytest.mark.skipif(os.name == "nt", reason="the stand-in gcalccmd is a POSIX script")
+    def test_batches_on_one_process(self, fake_gcalccmd, monkeypatch):
+        """Calculations spanning several batches are answered in order by one gcalccmd process."""
+        monkeypatch.setattr(LinuxCliCalculator, "BATCH_SIZE", 3)
+        calculator = LinuxCliCalculator()
+        amounts = [1000, 2000, 3000, 4000, 5000, 0.001, -20]
+        results = calculator.calculate_conversions(amounts, {"eur": 0.008525, "usd": 0.009871}, "XE.com")
+
+        assert results["eur"]["conversions"] == {1000: 8.525, 2000: 17.05, 3000: 25.575, 4000: 34.1,
+                                                 5000: 42.625, 0.001: pytest.approx(8.525e-06), -20: -0.1705}
+        assert results["usd"]["conversions"][5000] == pytest.approx(49.355)
+        log = fake_gcalccmd.read_text().splitlines()
+        assert sum(line.startswith("start") for line in log) == 1
+        assert [line for line in log if line.startswith("read")][:2] == ["read 1000*0.008525", "read 2000*0.008525"]
+        assert len([line for line in log if line.startswith("read")]) == 2 * len(amounts)
+        assert calculator.calculator_process is None
+        log_info("✓ Batches are answered in order by one solver process")
+
+    @pytest.mark.skipif(os.name == "nt", reason="the stand-in gcalccmd is a POSIX script")
+    def test_session_keeps_the_solver_open(self, fake_gcalccmd):
+        """In a session the solver process is reused across runs and closed with the session."""
+        calculator = LinuxCliCalculator()
+        calculator.open_session()
+        calculator.calculate_conversions([1000], {"eur": 0.008525}, "XE.com")
+        process = calculator.calculator_process
+        calculator.calculate_conversions([2000], {"eur": 0.008525}, "Wise.com")
+
+        assert calculator.calculator_process is process and calculator.session_launches == 1
+        calculator.close_session()
+        assert process.poll() == 0 and calculator.calculator_process is None
+        assert fake_gcalccmd.read_text().count("start") == 1
+        log_info("✓ Session reuses one solver process")
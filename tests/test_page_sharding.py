@@ -0,0 +1,60 @@
+"""
+Page Sharding Tests
+Checks how (pair, amount) work is split across pages - no browser needed.
+"""
+
+from utils.page_sharding import plan_shards
+from utils.logger import log_info
+
+
+EUR = ("RSD", "EUR")
+USD = ("RSD", "USD")
+EUR_USD = ("EUR", "USD")
+
+
+def flatten(plan) -> list:
+    """Every (pair, amount) of a plan."""
+    return sorted((pair, amount) for work in plan for pair, amounts in work for amount in amounts)
+
+
+class TestPageSharding:
+    """Test class for plan_shards."""
+
+    def test_uneven_split_deals_amounts_across_a_pairs_pages(self):
+        """Amounts that do not divide evenly differ by at most one per page and are all kept."""
+        amounts = [1, 2, 3, 4, 5, 6, 7]
+        plan = plan_shards([EUR, USD], amounts, 5)
+
+        assert [[pair for pair, _ in work] for work in plan] == [[EUR], [EUR], [EUR], [USD], [USD]]
+        assert [len(work[0][1]) for work in plan] == [3, 2, 2, 4, 3]
+        assert flatten(plan) == sorted([(EUR, a) for a in amounts] + [(USD, a) for a in amounts])
+        log_info("✓ Uneven amounts are dealt across each pair's pages")
+
+    def test_fewer_pages_than_pairs_keeps_whole_pairs(self):
+        """With fewer pages than pairs, pages take whole pairs round-robin."""
+        plan = plan_shards([EUR, USD, EUR_USD], [1000, 2000], 2)
+
+        assert plan == [[(EUR, [1000, 2000]), (EUR_USD, [1000, 2000])], [(USD, [1000, 2000])]]
+        log_info("✓ Pairs are dealt round-robin across fewer pages")
+
+    def test_more_pages_than_amounts(self):
+        """A pair never gets more pages than it has amounts."""
+        plan = plan_shards([EUR], [1000, 2000], 5)
+
+        assert plan == [[(EUR, [1000])], [(EUR, [2000])]]
+        log_info("✓ Page count is capped by the amount count")
+
+    def test_empty_input(self):
+        """No pairs give no pages; no amounts give one empty page per pair; page_count below 1 means 1."""
+        assert plan_shards([], [1000, 2000], 3) == []
+        assert plan_shards([EUR, USD], [], 4) == [[(EUR, [])], [(USD, [])]]
+        assert plan_shards([EUR], [1000], 0) == [[(EUR, [1000])]]
+        log_info("✓ Empty input is planned without errors")
+
+    def test_positions_keep_repeated_amounts_apart(self):
+        """Planning amount positions instead of amounts keeps duplicates distinct."""
+        amounts = [1000, 2000, 1000]
+        plan = plan_shards([EUR], list(range(len(amounts))), 2)
+
+        assert plan == [[(EUR, [0, 2])], [(EUR, [1])]]
+        log_info("✓ Repeated amounts keep their positions")
@@ -0,0 +1,84 @@
+"""
+Sampled Conversion Tests
+Checks how sampling mode merges UI samples with one fetched rate - no browser needed.
+"""
+
+import random
+import pytest
+from utils.result_structure import structure_results
+from utils.sampling import choose_sample, merge_sampled_results
+from utils.logger import log_info
+
+
+AMOUNTS = [1000, 2000, 3000, 4000]
+RATE = 0.0085318237
+SOURCE = "XE.com"
+TOLERANCE = 0.02
+
+
+def result(amount: float, converted_amount: float, rate: float = None, method: str = "dom") -> dict:
+    """A result as the page creates it; without a rate line the rate is converted / amount."""
+    return {"amount": amount, "from_currency": "RSD", "to_currency": "EUR", "converted_amount": converted_amount,
+            "exchange_rate": converted_amount / amount if rate is None else rate, "source": SOURCE,
+            "method": method}
+
+
+def merge(sampled: list, captured: list) -> list:
+    """Merge RSD → EUR samples the way BasePage does."""
+    return merge_sampled_results(AMOUNTS, "RSD", "EUR", SOURCE, sampled, captured, TOLERANCE)
+
+
+class TestSampledConversions:
+    """Test class for utils.sampling."""
+
+    def test_captured_rate_checks_every_sample(self):
+        """A captured network rate derives the other amounts and spot checks all samples."""
+        sampled = [result(1000, 8.53), result(3000, 25.60)]
+        captured = [result(amount, amount * RATE, RATE, method="network") for amount in AMOUNTS]
+        results = merge(sampled, captured)
+
+        assert [r["method"] for r in results] == ["sampled", "derived", "sampled", "derived"]
+        assert results[1]["converted_amount"] == pytest.approx(2000 * RATE)
+        assert results[1]["source"] == SOURCE and results[1]["sampling_rate"] == RATE
+        assert all(r["spot_check_passed"] for r in sampled)
+        assert structure_results(results, SOURCE)["eur"]["exchange_rate"] == RATE
+        log_info("✓ Captured rate derives the remaining amounts")
+
+    def test_rate_line_is_preferred_over_calculated_rates(self):
+        """A rate line shown next to a sample wins over converted / amount."""
+        sampled = [result(1000, 8.53, rate=RATE), result(3000, 25.60, rate=RATE)]
+        results = merge(sampled, [])
+
+        assert results[3]["exchange_rate"] == RATE
+        assert not any(r.get("rate_source") for r in results)
+        assert all("spot_check_passed" in r for r in sampled)
+        log_info("✓ Rate line is used as the sampling rate")
+
+    def test_largest_sample_gives_rate_and_is_not_spot_checked(self):
+        """Without a captured rate or rate line, the largest sample's rate is used and that sample is not checked."""
+        sampled = [result(1000, 8.53), result(3000, 25.60)]
+        results = merge(sampled, [])
+        structured = structure_results(results, SOURCE)["eur"]
+
+        assert structured["exchange_rate"] == pytest.approx(25.60 / 3000)
+        assert sampled[1]["rate_source"] and "spot_check_difference" not in sampled[1]
+        assert sampled[0]["spot_check_difference"] == pytest.approx(abs(8.53 - 1000 * 25.60 / 3000))
+        assert structured["sampled"] == [1000, 3000]
+        assert structured["spot_check"]["max_difference"] == sampled[0]["spot_check_difference"]
+        log_info("✓ Largest sample gives the rate and is left out of the spot check")
+
+    def test_no_rate_gives_no_results(self):
+        """Neither a captured rate nor a sample leaves the pair empty instead of failing."""
+        assert merge([], []) == []
+        log_info("✓ Pair without any rate is skipped")
+
+    def test_sample_keeps_order_and_is_reproducible(self):
+        """The same seed picks the same amounts, in their original order; no sample size keeps them all."""
+        amounts = list(range(100, 1100, 100))
+        first = choose_sample(amounts, 4, random.Random(7))
+
+        assert first == choose_sample(amounts, 4, random.Random(7))
+        assert len(first) == 4 and first == sorted(first)
+        assert choose_sample(amounts, None, random.Random(7)) == amounts
+        assert choose_sample(amounts, 20, random.Random(7)) == amounts
+        log_info("✓ Sample choice is ordered and reproducible")
@@ -0,0 +1,118 @@
+"""
+Stand-in Site Tests
+Runs the page objects against the local stub converter sites - no live websites needed.
+"""
+
+import pytest
+from calculators import CalculatorService
+from pages.xe_page import XEPage
+from pages.wise_page import WisePage
+from utils.currency_converter import CurrencyConverter
+from utils.locator_chain import LocatorCache
+from utils.stub_server import StubConverterServer, StubSiteConfig
+from utils.logger import log_info
+
+
+AMOUNTS = [1000, 2000, 3000]
+
+
+@pytest.fixture(scope="module")
+def stub_server():
+    """Stand-in sites with a little latency and jitter, but fixed rates."""
+    with StubConverterServer(StubSiteConfig(latency_ms=20, jitter_ms=30, seed=7)) as server:
+        yield server
+
+
+@pytest.mark.stub
+class TestStubSites:
+    """Test class for the page objects against the stand-in converter sites."""
+
+    def test_xe_page_against_stub(self, page, stub_server):
+        """XE.com page object reads every conversion shown by the XE-like page."""
+        results = XEPage(page, url=stub_server.url_for("xe.com")).get_rsd_conversions(AMOUNTS)
+
+        assert len(results) == len(AMOUNTS) * 2, "Should have EUR and USD conversions for all amounts"
+        for result in results:
+            rate = stub_server.rate("RSD", result["to_currency"])
+            assert result["converted_amount"] == pytest.approx(result["amount"] * rate, abs=1e-5)
+            assert result["exchange_rate"] == pytest.approx(rate, rel=1e-6)
+        log_info("✓ XE.com page object matches the stand-in site")
+
+    @pytest.mark.parametrize("wait_mode", ["value", "response"])
+    def test_wise_page_against_stub(self, page, stub_server, wait_mode):
+        """Wise.com page object waits for and reads every quote of the Wise-like page."""
+        wise_page = WisePage(page, wait_mode=wait_mode, url=stub_server.url_for("wise.com"))
+        results = wise_page.get_rsd_conversions(AMOUNTS)
+
+        assert len(results) == len(AMOUNTS) * 2, "Should have EUR and USD conversions for all amounts"
+        for result in results:
+            expected = result["amount"] * stub_server.rate("RSD", result["to_currency"])
+            assert result["converted_amount"] == pytest.approx(expected, abs=0.006)
+        assert not any(t["timed_out"] for t in wise_page.get_timings("wise_quote")), "No quote should time out"
+        log_info(f"✓ Wise.com page object matches the stand-in site ({wait_mode} mode)")
+
+    def test_xe_rate_capture_against_stub(self, page, stub_server):
+        """Network capture takes the full-precision rate from the XE-like rates endpoint."""
+        xe_page = XEPage(page, capture_rates=True, url=stub_server.url_for("xe.com"))
+        results = xe_page.get_rsd_conversions(AMOUNTS)
+
+        assert all(r["method"] == "network" for r in results), "All conversions should come from the captured rate"
+        for result in results:
+            assert result["exchange_rate"] == pytest.approx(stub_server.rate("RSD", result["to_currency"]), rel=1e-12)
+        log_info("✓ XE.com rate capture matches the stand-in site")
+
+    def test_xe_currency_pair_matrix_against_stub(self, page, stub_server):
+        """Arbitrary pairs come back for every amount with the selected FROM currency."""
+        pairs = [("RSD", "EUR"), ("EUR", "USD"), ("RSD", "USD"), ("EUR", "RSD")]
+        results = XEPage(page, url=stub_server.url_for("xe.com")).get_conversions(pairs, AMOUNTS)
+
+        assert len(results) == len(AMOUNTS) * len(pairs), "Should have every pair for all amounts"
+        for result in results:
+            rate = stub_server.rate(result["from_currency"], result["to_currency"])
+            assert result["converted_amount"] == pytest.approx(result["amount"] * rate, rel=1e-5, abs=1e-5)
+        log_info("✓ XE.com page object converts arbitrary pairs on the stand-in site")
+
+    @pytest.mark.parametrize("page_class", [XEPage, WisePage])
+    def test_batch_strategy_against_stub(self, page, stub_server, page_class):
+        """The in-page batch driver returns the same conversions as the step-by-step flow."""
+        url = stub_server.url_for("xe.com" if page_class is XEPage else "wise.com")
+        page_object = page_class(page, url=url, conversion_strategy="batch")
+        results = page_object.get_rsd_conversions(AMOUNTS)
+
+        assert len(results) == len(AMOUNTS) * 2, "Should have EUR and USD conversions for all amounts"
+        for result in results:
+            expected = result["amount"] * stub_server.rate("RSD", result["to_currency"])
+            assert result["converted_amount"] == pytest.approx(expected, abs=0.006)
+        assert "batch" in page_object.conversion_timing_summary(), "Batch conversions should be timed"
+        log_info(f"✓ {page_class.SOURCE_NAME} batch strategy matches the stand-in site")
+
+    def test_xe_deep_links_in_parallel_against_stub(self, page, stub_server):
+        """Deep-link conversions opened on several pages at once match the stand-in rates."""
+        converter = CurrencyConverter(page, page_count=3, conversion_strategy="deep_link",
+                                      site_urls=stub_server.site_urls(), calculator=CalculatorService("decimal"))
+        web_data = converter.get_web_data("xe.com", AMOUNTS)
+
+        for currency in ("eur", "usd"):
+            rate = stub_server.rate("RSD", currency.upper())
+            assert sorted(web_data[currency]["conversions"]) == AMOUNTS, f"Should have all {currency} amounts"
+            for amount, converted in web_data[currency]["conversions"].items():
+                assert converted == pytest.approx(amount * rate, abs=1e-5)
+        log_info("✓ XE.com deep links match the stand-in site")
+
+    def test_xe_locator_fallback_against_stub(self, page, tmp_path):
+        """A renamed result class is healed by the next fallback within moments, and the match is remembered."""
+        cache = LocatorCache(str(tmp_path / "locators.json"))
+        with StubConverterServer(StubSiteConfig(seed=7, xe_result_class="sc-4b2f91d0-1")) as server:
+            xe_page = XEPage(page, url=server.url_for("xe.com"))
+            xe_page.locator_cache = cache
+            results = xe_page.get_rsd_conversions(AMOUNTS)
+
+            for result in results:
+                rate = server.rate("RSD", result["to_currency"])
+                assert result["converted_amount"] == pytest.approx(result["amount"] * rate, abs=1e-5)
+
+        match = next(t for t in xe_page.get_timings("locator") if t["locator"] == "RESULT_ELEMENTS")
+        assert match["fallback"] == 1, "The broken primary selector should be replaced by the first fallback"
+        assert match["seconds"] < 2, "A broken primary selector should not wait out its timeout"
+        assert LocatorCache(cache.path).winner("XE.com", "RESULT_ELEMENTS") == match["selector"]
+        log_info(f"✓ XE.com result locator healed in {match['seconds'] * 1000:.0f} ms")
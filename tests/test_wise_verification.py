@@ -13,11 +13,11 @@ from utils.logger import log_info
 class TestWiseVerification:
     """Test class for Wise.com verification against calculator accuracy."""
 
-    def test_wise_verification_accuracy(self, page, test_data, verification_collector):
+    def test_wise_verification_accuracy(self, page, test_data, verification_collector, converter_options):
         """Test Wise.com web scraping accuracy by comparing with calculator using same rates."""
         
         # Initialize services
-        converter = CurrencyConverter(page)
+        converter = CurrencyConverter(page, **converter_options)
         verification_service = VerificationService(tolerance=0.02)
 
         log_info("Starting Wise.com verification test...")
@@ -0,0 +1,63 @@
+"""
+X11 Fallback Tests
+Checks that window management and the clipboard fall back to wmctrl and pyperclip - no display needed.
+"""
+
+from types import SimpleNamespace
+import pytest
+import utils.x11_clipboard as x11_clipboard
+import utils.x11_windows as x11_windows
+from utils.x11_clipboard import PyperclipClipboard, X11Clipboard
+from utils.x11_windows import WmctrlWindows, X11Windows
+from utils.logger import log_info
+
+
+def unreachable_display(*args):
+    """Display() of an X server that cannot be reached."""
+    raise ConnectionError("Can't connect to display ':99'")
+
+
+class TestX11Fallbacks:
+    """Test class for the X11Windows and X11Clipboard fallbacks."""
+
+    def test_without_python_xlib(self, monkeypatch):
+        """Without python-xlib, create() returns the wmctrl and pyperclip implementations."""
+        monkeypatch.setattr(x11_windows, "xdisplay", None)
+        monkeypatch.setattr(x11_clipboard, "xdisplay", None)
+
+        assert isinstance(X11Windows.create(), WmctrlWindows)
+        assert isinstance(X11Clipboard.create(), PyperclipClipboard)
+        log_info("✓ Missing python-xlib falls back to wmctrl and pyperclip")
+
+    def test_without_a_display(self, monkeypatch):
+        """When the X server cannot be reached, create() falls back as well."""
+        monkeypatch.setattr(x11_windows, "xdisplay", SimpleNamespace(Display=unreachable_display), raising=False)
+        monkeypatch.setattr(x11_clipboard, "xdisplay", SimpleNamespace(Display=unreachable_display), raising=False)
+
+        assert isinstance(X11Windows.create(), WmctrlWindows)
+        assert isinstance(X11Clipboard.create(), PyperclipClipboard)
+        log_info("✓ Unreachable display falls back to wmctrl and pyperclip")
+
+    @pytest.mark.parametrize("reply", ["no_answer", "refused", "no_property", "incr", "other_type"])
+    def test_unreadable_replies_are_read_through_pyperclip(self, monkeypatch, reply):
+        """Replies the in-process reader does not handle are read through pyperclip instead of failing."""
+        if x11_clipboard.xdisplay is None:
+            pytest.skip("python-xlib is not installed")
+        X = x11_clipboard.X
+        incr, utf8, pixmap = 101, 102, 20
+        prop = {"no_property": None,
+                "incr": SimpleNamespace(property_type=incr, value=[4096]),
+                "other_type": SimpleNamespace(property_type=pixmap, value=b"")}.get(reply)
+        event = SimpleNamespace(type=X.SelectionNotify, requestor=1,
+                                property=X.NONE if reply == "refused" else 103)
+
+        clipboard = X11Clipboard.__new__(X11Clipboard)
+        clipboard.display = SimpleNamespace(flush=lambda: None)
+        clipboard.window = SimpleNamespace(id=1, convert_selection=lambda *args: None,
+                                           get_full_property=lambda *args: prop, delete_property=lambda *args: None)
+        clipboard.clipboard, clipboard.utf8, clipboard.property, clipboard.incr = 100, utf8, 103, incr
+        monkeypatch.setattr(clipboard, "_next_event", lambda deadline: None if reply == "no_answer" else event)
+        monkeypatch.setattr(x11_clipboard.pyperclip, "paste", lambda: "8.53")
+
+        assert clipboard.read() == "8.53"
+        log_info(f"✓ Clipboard reply '{reply}' is read through pyperclip")
@@ -13,11 +13,11 @@ from utils.logger import log_info
 class TestXEVerification:
     """Test class for XE.com verification against calculator accuracy."""
 
-    def test_xe_verification_accuracy(self, page, test_data, verification_collector):
+    def test_xe_verification_accuracy(self, page, test_data, verification_collector, converter_options):
         """Test XE.com web scraping accuracy by comparing with calculator using same rates."""
         
         # Initialize services
-        converter = CurrencyConverter(page)
+        converter = CurrencyConverter(page, **converter_options)
         verification_service = VerificationService(tolerance=0.01)
 
         log_info("Starting XE.com verification test...")
@@ -0,0 +1,127 @@
+import json
+import os
+import shutil
+from typing import Dict, List, Optional
+from utils.logger import log_info, log_debug, log_warning
+
+
+class BrowserProfile:
+    """
+    Opt-in browser state that survives between runs.
+
+    Two flavours are supported and may be combined:
+    - user_data_dir: a Chromium profile directory (disk cache, cookies, local storage),
+      used through launch_persistent_context
+    - storage_state_path: a Playwright storage_state JSON (cookies and local storage only),
+      loaded into new contexts and saved again when they are torn down
+    """
+
+    # Chromium cache folders inside a user-data directory - removing them keeps cookies and consent
+    CACHE_DIRS = (
+        os.path.join("Default", "Cache"),
+        os.path.join("Default", "Code Cache"),
+        os.path.join("Default", "GPUCache"),
+        os.path.join("Default", "Service Worker", "CacheStorage"),
+    )
+
+    def __init__(self, user_data_dir: Optional[str] = None, storage_state_path: Optional[str] = None):
+        self.user_data_dir = os.path.abspath(user_data_dir) if user_data_dir else None
+        self.storage_state_path = os.path.abspath(storage_state_path) if storage_state_path else None
+
+    @classmethod
+    def from_env(cls) -> "BrowserProfile":
+        """Create a profile from BROWSER_PROFILE_DIR and BROWSER_STORAGE_STATE."""
+        return cls(os.getenv("BROWSER_PROFILE_DIR") or None, os.getenv("BROWSER_STORAGE_STATE") or None)
+
+    @property
+    def enabled(self) -> bool:
+        """Whether any state is persisted."""
+        return bool(self.user_data_dir or self.storage_state_path)
+
+    def context_args(self) -> Dict:
+        """Extra new_context arguments loading the stored state, if there is one yet."""
+        if self.storage_state_path and os.path.exists(self.storage_state_path):
+            return {"storage_state": self.storage_state_path}
+        return {}
+
+    def launch_persistent(self, browser_type, **options):
+        """
+        Launch a persistent context on the user-data directory.
+
+        Args:
+            browser_type: Playwright BrowserType (sync API)
+            options: Launch and context options (headless, slow_mo, viewport, locale, ...)
+
+        Returns:
+            The persistent BrowserContext
+        """
+        os.makedirs(self.user_data_dir, exist_ok=True)
+        log_info(f"Using persistent browser profile: {self.user_data_dir}")
+        context = browser_type.launch_persistent_context(self.user_data_dir, **options)
+        stored = self.context_args().get("storage_state")
+        if stored:
+            # Persistent contexts do not take storage_state - restore its cookies directly
+            with open(stored, encoding="utf-8") as f:
+                context.add_cookies(json.load(f).get("cookies", []))
+        return context
+
+    def save_storage_state(self, context) -> bool:
+        """Save the context's cookies and local storage when a storage_state path is configured."""
+        if not self.storage_state_path:
+            return False
+        try:
+            os.makedirs(os.path.dirname(self.storage_state_path), exist_ok=True)
+            context.storage_state(path=self.storage_state_path)
+            log_debug(f"Saved browser storage state to {self.storage_state_path}")
+            return True
+        except Exception as e:
+            log_warning(f"Could not save browser storage state: {e}")
+            return False
+
+    def clear(self, cache_only: bool = False) -> List[str]:
+        """
+        Invalidate the stored state.
+
+        Args:
+            cache_only: Only drop the HTTP/code caches, keeping cookies and consent
+
+        Returns:
+            Paths that were removed
+        """
+        removed = []
+        if self.user_data_dir and os.path.isdir(self.user_data_dir):
+            targets = ([os.path.join(self.user_data_dir, d) for d in self.CACHE_DIRS]
+                       if cache_only else [self.user_data_dir])
+            for target in targets:
+                if os.path.exists(target):
+                    shutil.rmtree(target)
+                    removed.append(target)
+        if not cache_only and self.storage_state_path and os.path.exists(self.storage_state_path):
+            os.remove(self.storage_state_path)
+            removed.append(self.storage_state_path)
+        return removed
+
+    def info(self) -> Dict:
+        """Describe what is stored: sizes of the profile and its caches and the stored cookies."""
+        details = {"user_data_dir": self.user_data_dir, "storage_state_path": self.storage_state_path}
+        if self.user_data_dir and os.path.isdir(self.user_data_dir):
+            details["profile_bytes"] = _directory_size(self.user_data_dir)
+            details["cache_bytes"] = sum(_directory_size(os.path.join(self.user_data_dir, d)) for d in self.CACHE_DIRS)
+        if self.storage_state_path and os.path.exists(self.storage_state_path):
+            with open(self.storage_state_path, encoding="utf-8") as f:
+                state = json.load(f)
+            details["cookies"] = len(state.get("cookies", []))
+            details["cookie_domains"] = sorted({c["domain"].lstrip(".") for c in state.get("cookies", [])})
+        return details
+
+
+def _directory_size(path: str) -> int:
+    """Total size of the files below a directory."""
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
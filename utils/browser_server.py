@@ -0,0 +1,319 @@
+import json
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+from utils.logger import log_info, log_debug, log_warning
+
+
+class BrowserServer:
+    """
+    Long-lived Chromium shared by test runs through its DevTools websocket endpoint.
+
+    The browser is started detached from the starting process, so it outlives the pytest run
+    that launched it; later runs connect with connect_over_cdp and only open fresh contexts.
+    Its pid and endpoint are kept in <state_dir>/server.json; starting and stopping hold
+    <state_dir>/server.lock, so parallel runs launch one browser between them. A server that
+    has died is relaunched by the next ensure_running(), i.e. the next connect(): a browser
+    that dies during a run is not replaced for that run, whose connection stays broken, but
+    for the run after it.
+    """
+
+    DEFAULT_DIR = os.path.join(".cache", "browser_server")
+    START_TIMEOUT = 15.0
+    # Playwright's own launch flags that matter for a shared test browser
+    LAUNCH_ARGS = ("--no-first-run", "--no-default-browser-check", "--no-sandbox", "--disable-dev-shm-usage")
+
+    def __init__(self, state_dir: str = DEFAULT_DIR, headless: bool = True, args: Optional[List[str]] = None):
+        """
+        Args:
+            state_dir: Directory for the state file, the lock file and the browser profile
+            headless: Run the browser without a window
+            args: Extra Chromium command line switches
+        """
+        self.state_dir = os.path.abspath(state_dir)
+        self.state_path = os.path.join(self.state_dir, "server.json")
+        self.lock_path = os.path.join(self.state_dir, "server.lock")
+        self.user_data_dir = os.path.join(self.state_dir, "profile")
+        self.headless = headless
+        self.args = list(args or [])
+        self._lock_depth = 0
+
+    @classmethod
+    def from_env(cls) -> Optional["BrowserServer"]:
+        """The server configured by BROWSER_SERVER and BROWSER_SERVER_DIR, or None when off."""
+        if os.getenv("BROWSER_SERVER", "false").lower() != "true":
+            return None
+        return cls(os.getenv("BROWSER_SERVER_DIR") or cls.DEFAULT_DIR)
+
+    def status(self) -> Dict:
+        """
+        Describe the server.
+
+        Returns:
+            Dict with running plus, when a server was started, its pid, endpoint, headless flag,
+            start time and uptime in seconds. running is only True while the stored pid is
+            alive and is the browser answering on the stored port.
+        """
+        state = self._read_state()
+        if not state:
+            return {"running": False}
+        running = self._owns_port(state) and self._endpoint_answers(state["port"])
+        return {**state, "running": running,
+                "uptime_seconds": time.time() - state["started_at"] if running else 0.0}
+
+    def start(self, executable_path: str) -> Dict:
+        """
+        Launch the browser unless it is already running.
+
+        Args:
+            executable_path: Chromium binary (playwright.chromium.executable_path)
+
+        Returns:
+            The server status
+
+        Raises:
+            RuntimeError: If the browser does not open its endpoint within START_TIMEOUT
+        """
+        with self._locked():
+            return self._start(executable_path)
+
+    def _start(self, executable_path: str) -> Dict:
+        status = self.status()
+        if status["running"]:
+            return status
+
+        os.makedirs(self.user_data_dir, exist_ok=True)
+        port_file = os.path.join(self.user_data_dir, "DevToolsActivePort")
+        if os.path.exists(port_file):
+            os.remove(port_file)
+        command = [executable_path, "--remote-debugging-port=0", f"--user-data-dir={self.user_data_dir}",
+                   *self.LAUNCH_ARGS, *self.args]
+        if self.headless:
+            command.append("--headless=new")
+        command.append("about:blank")
+
+        start = time.perf_counter()
+        process = subprocess.Popen(command, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                                   stderr=subprocess.DEVNULL, **self._detach_options())
+        port, path = self._wait_for_port_file(port_file, process)
+        state = {
+            "pid": process.pid,
+            "port": port,
+            "endpoint": f"ws://127.0.0.1:{port}{path}",
+            "headless": self.headless,
+            "args": self.args,
+            "started_at": time.time(),
+        }
+        self._write_state(state)
+        log_info(f"Browser server started in {time.perf_counter() - start:.2f} s "
+                 f"(pid {process.pid}, {state['endpoint']})")
+        return self.status()
+
+    def stop(self) -> bool:
+        """
+        Terminate the browser and forget its state.
+
+        Returns:
+            True when a running browser was stopped
+        """
+        with self._locked():
+            return self._stop()
+
+    def _stop(self) -> bool:
+        state = self._read_state()
+        if not state:
+            return False
+        # A pid that no longer owns the port may belong to an unrelated process by now
+        was_running = self.status()["running"]
+        if was_running:
+            try:
+                os.kill(state["pid"], signal.SIGTERM)
+            except OSError as e:
+                log_debug(f"Browser server pid {state['pid']} already gone: {e}")
+            deadline = time.monotonic() + 5
+            while self._endpoint_answers(state["port"]) and time.monotonic() < deadline:
+                time.sleep(0.1)
+            log_info(f"Browser server stopped (pid {state['pid']})")
+        os.remove(self.state_path)
+        return was_running
+
+    def ensure_running(self, executable_path: str) -> str:
+        """
+        Start the browser if it is not running - relaunching one that died or runs with other
+        headless mode or switches - and return its websocket endpoint. Runs under the lock
+        file, so concurrent runs never launch two browsers.
+        """
+        with self._locked():
+            status = self.status()
+            if status["running"] and (status["headless"], status.get("args", [])) != (self.headless, self.args):
+                log_info(f"Browser server runs {'headless' if status['headless'] else 'headed'} "
+                         f"with {status.get('args', [])}, restarting it")
+                self._stop()
+            elif not status["running"] and "pid" in status:
+                log_warning(f"Browser server (pid {status['pid']}) is no longer answering, relaunching it")
+                self._stop()
+            return self._start(executable_path)["endpoint"]
+
+    def connect(self, playwright, launch_args: Optional[Dict] = None):
+        """
+        Connect to the server, starting it first when needed.
+
+        Args:
+            playwright: Playwright instance (sync API)
+            launch_args: Playwright launch options, e.g. pytest-playwright's
+                browser_type_launch_args - headless, args and executable_path decide how the
+                server is started, slow_mo applies to the connection; options that only exist
+                for launch() (e.g. channel) are ignored
+
+        Returns:
+            The connected Browser - closing it disconnects without stopping the server
+        """
+        launch_args = launch_args or {}
+        # Playwright launches headless unless told otherwise
+        self.headless = launch_args.get("headless", True)
+        self.args = list(launch_args.get("args") or [])
+        ignored = set(launch_args) - {"headless", "args", "executable_path", "slow_mo"}
+        if ignored:
+            log_debug(f"Browser server ignores launch options {sorted(ignored)}")
+        executable_path = launch_args.get("executable_path") or playwright.chromium.executable_path
+        endpoint = self.ensure_running(executable_path)
+        start = time.perf_counter()
+        options = {"slow_mo": launch_args["slow_mo"]} if launch_args.get("slow_mo") else {}
+        browser = playwright.chromium.connect_over_cdp(endpoint, **options)
+        log_info(f"Connected to browser server in {time.perf_counter() - start:.2f} s")
+        return browser
+
+    def clear(self) -> None:
+        """Stop the server and remove its profile directory."""
+        self.stop()
+        shutil.rmtree(self.state_dir, ignore_errors=True)
+
+    @contextmanager
+    def _locked(self):
+        """Hold the server lock file - reentrant within this instance."""
+        if self._lock_depth:
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+            return
+        os.makedirs(self.state_dir, exist_ok=True)
+        with open(self.lock_path, "a+") as lock_file:
+            self._lock_file(lock_file, True)
+            self._lock_depth = 1
+            try:
+                yield
+            finally:
+                self._lock_depth = 0
+                self._lock_file(lock_file, False)
+
+    @staticmethod
+    def _lock_file(lock_file, lock: bool) -> None:
+        """Take or release an exclusive lock on the open file, blocking until it is free."""
+        if sys.platform == "win32":
+            import msvcrt
+            lock_file.seek(0)
+            if not lock:
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+                return
+            # LK_LOCK gives up after about 10 s - keep waiting like flock does
+            while True:
+                try:
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                    return
+                except OSError:
+                    continue
+        else:
+            import fcntl
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX if lock else fcntl.LOCK_UN)
+
+    def _owns_port(self, state: Dict) -> bool:
+        """
+        Whether the stored pid is still our browser on the stored port.
+
+        The profile's DevToolsActivePort file has to name the port, and where the process
+        table can be read the pid has to be alive and running with our user data directory.
+        """
+        port_file = os.path.join(self.user_data_dir, "DevToolsActivePort")
+        try:
+            with open(port_file, encoding="utf-8") as f:
+                lines = f.read().split()
+        except OSError:
+            return False
+        if not lines or lines[0] != str(state["port"]):
+            return False
+        if sys.platform == "win32":
+            # No signal 0 on Windows - the port file alone has to do
+            return True
+        try:
+            os.kill(state["pid"], 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            # Alive, but someone else's - not the browser we started
+            return False
+        cmdline_path = f"/proc/{state['pid']}/cmdline"
+        if not os.path.exists(cmdline_path):
+            return True
+        try:
+            with open(cmdline_path, "rb") as f:
+                cmdline = f.read().decode("utf-8", "replace")
+        except OSError:
+            return False
+        return f"--user-data-dir={self.user_data_dir}" in cmdline
+
+    def _wait_for_port_file(self, port_file: str, process: subprocess.Popen) -> tuple:
+        """Wait for Chromium to report its DevTools port and browser path."""
+        deadline = time.monotonic() + self.START_TIMEOUT
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError(f"Browser server exited during startup with code {process.returncode}")
+            if os.path.exists(port_file):
+                with open(port_file, encoding="utf-8") as f:
+                    lines = f.read().split()
+                if len(lines) >= 2 and self._endpoint_answers(int(lines[0])):
+                    return int(lines[0]), lines[1]
+            time.sleep(0.05)
+        process.kill()
+        raise RuntimeError(f"Browser server did not open its DevTools endpoint within {self.START_TIMEOUT} s")
+
+    @staticmethod
+    def _endpoint_answers(port: int) -> bool:
+        """Whether a DevTools endpoint answers on the port."""
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/json/version", timeout=1) as response:
+                return response.status == 200
+        except OSError:
+            return False
+
+    @staticmethod
+    def _detach_options() -> Dict:
+        """Popen options that keep the browser alive after the starting process exits."""
+        if sys.platform == "win32":
+            return {"creationflags": subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP}
+        return {"start_new_session": True}
+
+    def _read_state(self) -> Optional[Dict]:
+        """The stored server state, None when no server was started."""
+        if not os.path.exists(self.state_path):
+            return None
+        try:
+            with open(self.state_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            log_warning(f"Ignoring unreadable browser server state {self.state_path}: {e}")
+            return None
+
+    def _write_state(self, state: Dict) -> None:
+        """Store the server state."""
+        os.makedirs(self.state_dir, exist_ok=True)
+        with open(self.state_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2)
+        log_debug(f"Browser server state saved to {self.state_path}")
@@ -0,0 +1,116 @@
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+from utils.logger import log_info, log_debug
+
+
+class ContextPool:
+    """
+    Browser contexts kept open for a whole test session.
+
+    A lease hands out an idle context (or creates one) and takes it back afterwards: the
+    lease's cookies, local and session storage are cleared and its pages closed, the context
+    itself stays warm - the HTTP cache survives for the next test, which starts on a new page.
+    With reuse off every lease gets a fresh context that is closed on release, like
+    pytest-playwright's default. Safe to share between threads.
+    """
+
+    def __init__(self, factory: Callable, reuse: bool = True, on_release: Optional[Callable] = None,
+                 clear_state: bool = True):
+        """
+        Args:
+            factory: Creates a new BrowserContext
+            reuse: Keep released contexts for the next lease
+            on_release: Called with every released context before its pages are closed
+                (e.g. BrowserProfile.save_storage_state)
+            clear_state: Clear cookies and storage of released contexts before they are
+                reused (off when a browser profile is meant to keep them)
+        """
+        self.factory = factory
+        self.reuse = reuse
+        self.on_release = on_release
+        self.clear_state = clear_state
+        self.stats = {"created": 0, "reused": 0}
+        self._idle: List = []
+        self._leased: List = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_profile(cls, factory: Callable, profile, reuse: bool = True) -> "ContextPool":
+        """
+        A pool saving the profile's storage state on release and clearing released contexts
+        only when no profile is configured to keep their cookies and storage.
+
+        Args:
+            factory: Creates a new BrowserContext
+            profile: The session's BrowserProfile
+            reuse: Keep released contexts for the next lease
+        """
+        return cls(factory, reuse=reuse, on_release=profile.save_storage_state, clear_state=not profile.enabled)
+
+    def acquire(self):
+        """An idle warm context, or a new one."""
+        with self._lock:
+            if self._idle:
+                context = self._idle.pop()
+                self.stats["reused"] += 1
+                self._leased.append(context)
+                log_debug(f"Reusing warm browser context ({self.stats['reused']} reuses so far)")
+                return context
+        context = self.factory()
+        with self._lock:
+            self.stats["created"] += 1
+            self._leased.append(context)
+        return context
+
+    def release(self, context) -> None:
+        """Close the context's pages and keep it for the next lease (or close it when reuse is off)."""
+        if self.on_release:
+            self.on_release(context)
+        with self._lock:
+            self._leased.remove(context)
+        if not self.reuse:
+            context.close()
+            return
+        if self.clear_state:
+            self._clear_state(context)
+        for page in list(context.pages):
+            page.close()
+        with self._lock:
+            self._idle.append(context)
+
+    @staticmethod
+    def _clear_state(context) -> None:
+        """Clear the context's cookies and the storage of every origin its pages are on."""
+        context.clear_cookies()
+        for page in context.pages:
+            try:
+                page.evaluate("() => { localStorage.clear(); sessionStorage.clear(); }")
+            except Exception as e:
+                # about:blank and closed pages have no storage to clear
+                log_debug(f"Could not clear storage of {page.url}: {e}")
+
+    @contextmanager
+    def lease(self):
+        """Acquire a context for the duration of a with block."""
+        context = self.acquire()
+        try:
+            yield context
+        finally:
+            self.release(context)
+
+    def close(self) -> Dict:
+        """
+        Close every context.
+
+        Returns:
+            The pool statistics (contexts created and reuses)
+        """
+        with self._lock:
+            contexts, self._idle, self._leased = self._idle + self._leased, [], []
+        for context in contexts:
+            context.close()
+        if self.stats["created"]:
+            log_info(f"Browser context pool closed: {self.stats['created']} context(s) created, "
+                     f"{self.stats['reused']} reuse(s)")
+        return dict(self.stats)
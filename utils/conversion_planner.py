@@ -0,0 +1,70 @@
+from typing import Dict, List, Optional, Tuple
+
+Pair = Tuple[str, str]
+
+
+def pair_key(from_currency: str, to_currency: str) -> str:
+    """
+    Key of a pair in structured results.
+
+    RSD pairs keep the historical currency keys ('eur', 'usd'), so existing reports, tests and
+    calculator rates dicts stay valid; other pairs are keyed 'from_to' ('eur_usd'). Currency
+    codes never contain '_', so split_pair_key recovers the pair from either form; readers label
+    keys with pair_label rather than parsing them.
+    """
+    if from_currency == "RSD":
+        return to_currency.lower()
+    return f"{from_currency}_{to_currency}".lower()
+
+
+def split_pair_key(key: str) -> Pair:
+    """The (from, to) pair of a pair_key: 'eur' -> ('RSD', 'EUR'), 'eur_usd' -> ('EUR', 'USD')."""
+    from_currency, _, to_currency = key.upper().rpartition("_")
+    return from_currency or "RSD", to_currency
+
+
+def pair_label(key: str) -> str:
+    """Readable name of a pair key: the target for RSD pairs ('EUR'), 'FROM → TO' otherwise ('EUR → USD')."""
+    from_currency, to_currency = split_pair_key(key)
+    return to_currency if from_currency == "RSD" else f"{from_currency} → {to_currency}"
+
+
+def plan_conversions(pairs: List[Pair], selected: Optional[Pair] = None) -> List[Pair]:
+    """
+    Order currency pairs so the converter's dropdowns are re-selected as rarely as possible.
+
+    Pairs are grouped by source currency, starting with the source already selected; inside
+    a group the target already selected goes first, so consecutive pairs share a dropdown.
+
+    Args:
+        pairs: Currency pairs, e.g. [("RSD", "EUR"), ("EUR", "USD"), ("RSD", "USD")]
+        selected: (from, to) currently selected on the page, if any
+
+    Returns:
+        The distinct pairs in execution order
+    """
+    selected_from, selected_to = selected or (None, None)
+    groups: Dict[str, List[str]] = {}
+    for from_currency, to_currency in dict.fromkeys(pairs):
+        if from_currency == to_currency:
+            raise ValueError(f"Cannot convert {from_currency} to itself")
+        groups.setdefault(from_currency, []).append(to_currency)
+
+    order = sorted(groups, key=lambda currency: currency != selected_from)
+    plan = []
+    current_to = selected_to
+    for from_currency in order:
+        targets = sorted(groups[from_currency], key=lambda currency: currency != current_to)
+        plan.extend((from_currency, to_currency) for to_currency in targets)
+        current_to = targets[-1]
+    return plan
+
+
+def count_selections(plan: List[Pair], selected: Optional[Pair] = None) -> int:
+    """Number of dropdown selections needed to work through a plan."""
+    current_from, current_to = selected or (None, None)
+    selections = 0
+    for from_currency, to_currency in plan:
+        selections += (from_currency != current_from) + (to_currency != current_to)
+        current_from, current_to = from_currency, to_currency
+    return selections
@@ -1,42 +1,75 @@
-from typing import List, Dict
+import copy
+import http.client
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Dict, Optional
+from playwright.sync_api import sync_playwright
+from pages.base_page import BasePage
 from pages.xe_page import XEPage
 from pages.wise_page import WisePage
 from calculators import CalculatorService
 from utils.file_writer import FileWriter
-from utils.logger import log_info, log_debug
+from utils.http_rate_source import KeepAliveClient, WiseHttpRateSource, XEHttpRateSource
+from utils.logger import log_info, log_debug, log_warning
+from utils.conversion_planner import Pair, plan_conversions
+from utils.page_sharding import plan_shards
+from utils.result_structure import pair_entries, structure_results
 
 
 class CurrencyConverter:
     """Service to handle currency conversions from different sources."""
     
-    def __init__(self, page):
+    SOURCES = {
+        "xe.com": XEPage,
+        "wise.com": WisePage,
+    }
+    
+    # Browser-free rate sources for the http_sources option
+    HTTP_SOURCES = {
+        "xe.com": XEHttpRateSource,
+        "wise.com": WiseHttpRateSource,
+    }
+    
+    def __init__(self, page, capture_rates: bool = False, wise_wait_mode: str = "value",
+                 sample_size: Optional[int] = None, sample_seed: Optional[int] = None, page_count: int = 1,
+                 block_resources: bool = False, har_mode: str = "off", site_urls: Optional[Dict[str, str]] = None,
+                 conversion_strategy: str = "steps", http_sources: Optional[List[str]] = None,
+                 pipeline: bool = False, calculator_backend: Optional[str] = None,
+                 calculator_options: Optional[Dict] = None, calculator: Optional[CalculatorService] = None,
+                 headed: bool = False):
         self.page = page
+        self.capture_rates = capture_rates
+        self.wise_wait_mode = wise_wait_mode
+        self.sample_size = sample_size
+        self.sample_seed = sample_seed
+        self.page_count = page_count
+        self.block_resources = block_resources
+        self.har_mode = har_mode
+        # "steps", "batch" (in-page driver) or "deep_link" (XE), see the pages' CONVERSION_STRATEGIES
+        self.conversion_strategy = conversion_strategy
+        # Per-source page URL overrides, e.g. the stand-in sites from utils.stub_server
+        self.site_urls = site_urls or {}
+        # Sources read over plain HTTP instead of the browser; one keep-alive client serves all of them
+        self.http_sources = set(http_sources or [])
+        self._http_client = None
+        # Run the calculator alongside the browser, starting each pair as soon as its rate is read
+        self.pipeline = pipeline
         self.file_writer = FileWriter()
-        self.calculator = CalculatorService()
+        # A shared calculator (e.g. the session one from conftest) wins over the backend options; without
+        # a backend the calculator app is used where there is a display. Nothing is launched until first use.
+        self.calculator = calculator or CalculatorService(calculator_backend, **(calculator_options or {}))
+        if pipeline and headed and self.calculator.backend == "gui":
+            # The desktop calculator needs the keyboard focus while the visible browser is still being driven
+            raise ValueError("The calculator pipeline cannot run the GUI calculator next to a headed browser - "
+                             "run the browser headless or use the 'cli' or 'decimal' calculator backend")
     
-    def process_xe_conversions(self, amounts: List[float]):
+    def process_xe_conversions(self, amounts: List[float], pairs: Optional[List[Pair]] = None):
         """Process XE.com conversions and add to consolidated file."""
         log_debug("Processing XE.com conversions...")
-        xe_page = XEPage(self.page)
         
         # Get web conversions
         log_info("Getting XE.com currency conversions...")
-        web_results = xe_page.get_rsd_conversions(amounts)
-        web_data = self._structure_results(web_results, "XE.com")
-        log_info(f"STRUCTURED WEB DATA - EUR Rate: {web_data['eur']['exchange_rate']:.10f}")
-        log_info(f"STRUCTURED WEB DATA - USD Rate: {web_data['usd']['exchange_rate']:.10f}")
-        
-        # Close browser before calculator operations
-        log_info("Closing browser...")
-        self.page.context.close()
-        
-        # Get calculator conversions using rates from web
-        log_info("Performing calculator conversions with XE rates...")
-        eur_rate = web_data['eur']['exchange_rate']
-        usd_rate = web_data['usd']['exchange_rate']
-        log_info(f"RATES PASSED TO CALCULATOR - EUR: {eur_rate:.10f}")
-        log_info(f"RATES PASSED TO CALCULATOR - USD: {usd_rate:.10f}")
-        calculator_data = self.calculator.calculate_conversions(amounts, {"eur": eur_rate, "usd": usd_rate}, "Calculator")
+        web_data, calculator_data = self._get_source_data("xe.com", "XE", amounts, pairs)
         
         # Add to consolidated file
         self.file_writer.append_source_results("xe.com", web_data, calculator_data)
@@ -45,29 +78,13 @@ class CurrencyConverter:
         # Return data for verification
         return web_data, calculator_data
     
-    def process_wise_conversions(self, amounts: List[float]):
+    def process_wise_conversions(self, amounts: List[float], pairs: Optional[List[Pair]] = None):
         """Process Wise.com conversions and add to consolidated file."""
         log_debug("Processing Wise.com conversions...")
-        wise_page = WisePage(self.page)
         
         # Get web conversions
         log_info("Getting Wise.com currency conversions...")
-        web_results = wise_page.get_rsd_conversions(amounts)
-        web_data = self._structure_results(web_results, "Wise.com")
-        log_info(f"STRUCTURED WEB DATA - EUR Rate: {web_data['eur']['exchange_rate']:.10f}")
-        log_info(f"STRUCTURED WEB DATA - USD Rate: {web_data['usd']['exchange_rate']:.10f}")
-        
-        # Close browser before calculator operations
-        log_info("Closing browser...")
-        self.page.context.close()
-        
-        # Get calculator conversions using rates from web
-        log_info("Performing calculator conversions with Wise rates...")
-        eur_rate = web_data['eur']['exchange_rate']
-        usd_rate = web_data['usd']['exchange_rate']
-        log_info(f"RATES PASSED TO CALCULATOR - EUR: {eur_rate:.10f}")
-        log_info(f"RATES PASSED TO CALCULATOR - USD: {usd_rate:.10f}")
-        calculator_data = self.calculator.calculate_conversions(amounts, {"eur": eur_rate, "usd": usd_rate}, "Calculator")
+        web_data, calculator_data = self._get_source_data("wise.com", "Wise", amounts, pairs)
         
         # Add to consolidated file
         self.file_writer.append_source_results("wise.com", web_data, calculator_data)
@@ -76,32 +93,243 @@ class CurrencyConverter:
         # Return data for verification
         return web_data, calculator_data
     
-    def get_output_file_path(self) -> str:
-        """Get the path to the consolidated output file."""
-        return self.file_writer.get_consolidated_file_path()
+    def _get_source_data(self, source: str, label: str, amounts: List[float],
+                         pairs: Optional[List[Pair]]) -> tuple:
+        """Scrape a source and run the calculator on its rates - one after the other, or overlapped in pipeline mode."""
+        if self.pipeline:
+            return self._get_pipelined_source_data(source, label, amounts, pairs)
+        
+        web_data = self.get_web_data(source, amounts, pairs)
+        self._log_web_rates(web_data)
+        
+        # The browser stays open - its context belongs to the test (conftest.context)
+        # Get calculator conversions using rates from web
+        log_info(f"Performing calculator conversions with {label} rates...")
+        exchange_rates = self._calculator_rates(web_data)
+        calculator_data = self.calculator.calculate_conversions(amounts, exchange_rates, "Calculator")
+        return web_data, calculator_data
     
-    def _structure_results(self, results: List[Dict], source: str) -> Dict:
-        """Structure results for easy comparison."""
-        log_debug(f"Structuring {len(results)} results from {source}...")
+    def _get_pipelined_source_data(self, source: str, label: str, amounts: List[float],
+                                   pairs: Optional[List[Pair]]) -> tuple:
+        """
+        Overlap the calculator with the browser.
         
-        eur_results = [r for r in results if r["to_currency"] == "EUR"]
-        usd_results = [r for r in results if r["to_currency"] == "USD"]
+        The calculator opens in the background while the page loads, and every pair's
+        calculations are queued the moment the pair's web results are complete, so a source takes
+        about as long as its slower stage instead of the sum of both. Playwright drives the page over
+        its protocol connection, so with a headless browser the calculator can own the desktop focus
+        meanwhile.
+        """
+        start = time.perf_counter()
+        log_info(f"Performing calculator conversions with {label} rates while scraping...")
+        pipeline = self.calculator.start_pipeline(amounts, "Calculator")
+        try:
+            web_data = self.get_web_data(source, amounts, pairs, result_listener=pipeline.feed)
+        except Exception:
+            pipeline.cancel()
+            raise
+        web_seconds = time.perf_counter() - start
+        self._log_web_rates(web_data)
+        calculator_data = self.calculator.finish_pipeline(pipeline, amounts, self._calculator_rates(web_data))
+        log_info(f"{label} pipeline took {time.perf_counter() - start:.2f} s "
+                 f"(web {web_seconds:.2f} s, calculator {pipeline.timings['total_seconds']:.2f} s)")
+        return web_data, calculator_data
+    
+    @staticmethod
+    def _log_web_rates(web_data: Dict) -> None:
+        """Log the structured rate of every pair."""
+        for key, entry in pair_entries(web_data):
+            log_info(f"STRUCTURED WEB DATA - {key.upper()} Rate: {entry['exchange_rate']:.10f}")
+    
+    @staticmethod
+    def _calculator_rates(web_data: Dict) -> Dict[str, float]:
+        """The rates handed to the calculator, per pair key."""
+        exchange_rates = {key: entry['exchange_rate'] for key, entry in pair_entries(web_data)}
+        for key, rate in exchange_rates.items():
+            log_info(f"RATES PASSED TO CALCULATOR - {key.upper()}: {rate:.10f}")
+        return exchange_rates
+    
+    def get_web_data(self, source: str, amounts: List[float], pairs: Optional[List[Pair]] = None,
+                     result_listener: Optional[Callable[[List[Dict]], None]] = None) -> Dict:
+        """
+        Scrape one source's conversions without touching the calculator.
+        
+        Args:
+            source: Source key from SOURCES (e.g., 'xe.com')
+            amounts: List of amounts to convert
+            pairs: Currency pairs to convert (default: RSD to each of the page's TARGET_CURRENCIES)
+            result_listener: Called with each pair's results as soon as the pair is complete (e.g. CalculatorPipeline.feed)
+            
+        Returns:
+            Structured web data as _structure_results produces it
+        """
+        page_class = self.SOURCES[source]
+        pairs = pairs or self.default_pairs(page_class)
+        web_results = self._get_http_results(source, amounts, pairs) if source in self.http_sources else None
+        if web_results is None:
+            web_results = self._get_web_results(page_class, amounts, pairs, result_listener,
+                                                **self._page_kwargs(source))
+        elif result_listener:
+            result_listener(web_results)
+        return self._structure_results(web_results, page_class.SOURCE_NAME, pairs)
+    
+    @staticmethod
+    def default_pairs(page_class: type) -> List[Pair]:
+        """The RSD pairs every source is checked for by default."""
+        return [("RSD", currency) for currency in page_class.TARGET_CURRENCIES]
+    
+    def _page_kwargs(self, source: str) -> Dict:
+        """Page object options for a source."""
+        page_kwargs = {
+            "capture_rates": self.capture_rates,
+            "sample_size": self.sample_size,
+            "sample_seed": self.sample_seed,
+            "block_resources": self.block_resources,
+            "har_mode": self.har_mode,
+            "conversion_strategy": self._conversion_strategy(source),
+            "url": self.site_urls.get(source),
+        }
+        if source == "wise.com":
+            page_kwargs["wait_mode"] = self.wise_wait_mode
+        return page_kwargs
+    
+    def _conversion_strategy(self, source: str) -> str:
+        """The configured conversion strategy, or 'steps' for sources that do not offer it (e.g. deep links on Wise)."""
+        if self.conversion_strategy in self.SOURCES[source].CONVERSION_STRATEGIES:
+            return self.conversion_strategy
+        log_debug(f"  {source} has no '{self.conversion_strategy}' conversion strategy, using 'steps'")
+        return "steps"
+    
+    def _get_http_results(self, source: str, amounts: List[float], pairs: List[Pair]) -> Optional[List[Dict]]:
+        """Read a source's rates over plain HTTP; None when that fails, so the browser path takes over."""
+        if self._http_client is None:
+            self._http_client = KeepAliveClient()
+        rate_source = self.HTTP_SOURCES[source](self._http_client, url=self.site_urls.get(source))
+        start = time.perf_counter()
+        try:
+            results = rate_source.get_conversions(pairs, amounts)
+        except (OSError, http.client.HTTPException, ValueError) as e:
+            log_warning(f"HTTP rate fetch for {source} failed ({e}), falling back to the browser")
+            return None
+        log_info(f"{rate_source.SOURCE_NAME} rates fetched over HTTP in {time.perf_counter() - start:.2f} s")
+        return results
+    
+    def _get_web_results(self, page_class: type, amounts: List[float], pairs: List[Pair],
+                         result_listener: Optional[Callable[[List[Dict]], None]] = None,
+                         **page_kwargs) -> List[Dict]:
+        """Scrape a source on the main page, or sharded across several pages when configured."""
+        start = time.perf_counter()
+        # Recording writes one HAR per source, so it stays on a single page
+        sharded = self.page_count > 1 and not (self.capture_rates or self.sample_size or self.har_mode == "record")
+        if sharded:
+            results = self._get_sharded_results(page_class, amounts, pairs, result_listener, **page_kwargs)
+        else:
+            page_object = page_class(self.page, **page_kwargs)
+            page_object.result_listener = result_listener
+            results = page_object.get_conversions(pairs, amounts)
+        log_info(f"{page_class.SOURCE_NAME} web conversions took {time.perf_counter() - start:.2f} s "
+                 f"({'sharded across ' + str(self.page_count) + ' pages' if sharded else 'single page'})")
+        return results
+    
+    def _get_sharded_results(self, page_class: type, amounts: List[float], pairs: List[Pair],
+                             result_listener: Optional[Callable[[List[Dict]], None]] = None,
+                             **page_kwargs) -> List[Dict]:
+        """
+        Fan a source's (pair, amount) work out across pages of the same browser context.
+        
+        Every page keeps its currency selection and takes a shard of the amounts. Pages are driven
+        in lockstep: each page gets its next amount entered before any result is awaited, so the
+        sites compute the quotes concurrently. Lockstep is step by step by nature, so the batch
+        conversion strategy does not apply here.
+        """
+        pairs = plan_conversions(pairs)
+        # Shards hold amount positions, so results go back in place even for repeated amounts
+        plan = plan_shards(pairs, list(range(len(amounts))), self.page_count)
+        pages = [self.page] + [self.page.context.new_page() for _ in plan[1:]]
+        workers: List[BasePage] = [page_class(page, **page_kwargs) for page in pages]
+        log_info(f"  Sharding {page_class.SOURCE_NAME} work across {len(workers)} pages...")
         
-        # Use first exchange rate (should be same for all amounts from same source)
-        eur_rate = eur_results[0]["exchange_rate"] if eur_results else 0
-        usd_rate = usd_results[0]["exchange_rate"] if usd_results else 0
+        # Results by (pair index, amount position) - the order a single page produces
+        by_position: Dict[tuple, Dict] = {}
+        try:
+            for worker in workers:
+                worker.open_converter()
+            
+            queues = [[(pairs.index(pair), position) for pair, shard in work for position in shard] for work in plan]
+            # Results still missing per pair - a pair goes to the listener once all its shards are read
+            outstanding = [len(amounts)] * len(pairs)
+            while any(queues):
+                submitted = []
+                for worker, queue in zip(workers, queues):
+                    if queue:
+                        pair_index, position = queue.pop(0)
+                        from_currency, to_currency = pairs[pair_index]
+                        amount = amounts[position]
+                        submitted.append((worker, pair_index, position,
+                                          worker.submit_conversion(amount, from_currency, to_currency)))
+                for worker, pair_index, position, pending in submitted:
+                    from_currency, to_currency = pairs[pair_index]
+                    by_position[(pair_index, position)] = worker.read_conversion(amounts[position], from_currency,
+                                                                                 to_currency, pending)
+                    outstanding[pair_index] -= 1
+                    if result_listener and not outstanding[pair_index]:
+                        result_listener([by_position[(pair_index, p)] for p in range(len(amounts))])
+        finally:
+            for extra_page in pages[1:]:
+                extra_page.close()
         
-        log_debug(f"STRUCTURE RESULTS - Raw EUR rate from first result: {eur_rate:.10f}")
-        log_debug(f"STRUCTURE RESULTS - Raw USD rate from first result: {usd_rate:.10f}")
+        results = [by_position[key] for key in sorted(by_position)]
+        log_info(f"  Sharded {page_class.SOURCE_NAME} operations completed - {len(results)} conversions collected")
+        return results
+    
+    def scrape_sources_concurrently(self, amounts: List[float], sources: Optional[List[str]] = None,
+                                    browser_launch_args: Optional[Dict] = None,
+                                    pairs: Optional[List[Pair]] = None) -> Dict[str, Dict]:
+        """
+        Scrape several sources at once, each on its own thread.
+        
+        Playwright's sync API is bound to the thread that started it, so every source gets its
+        own Playwright instance and browser next to this converter's page, and the sources' page
+        objects wait on their sites in parallel. The page objects are sync only - there is no
+        async_api variant, since pytest-playwright hands out sync pages and a second page
+        hierarchy would repeat every page step.
         
-        return {
-            "source": source,
-            "eur": {
-                "exchange_rate": eur_rate,
-                "conversions": {r["amount"]: r["converted_amount"] for r in eur_results}
-            },
-            "usd": {
-                "exchange_rate": usd_rate,
-                "conversions": {r["amount"]: r["converted_amount"] for r in usd_results}
-            }
-        } 
\ No newline at end of file
+        Returns:
+            Structured web data per source key (e.g. 'xe.com'), as _structure_results produces it
+        """
+        sources = list(sources or self.SOURCES)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(sources), thread_name_prefix="source") as executor:
+            futures = [executor.submit(self._scrape_in_own_browser, source, amounts, pairs, browser_launch_args)
+                       for source in sources]
+            structured = [future.result() for future in futures]
+        log_info(f"Scraped {len(sources)} source(s) concurrently in {time.perf_counter() - start:.2f} s")
+        return dict(zip(sources, structured))
+    
+    def _scrape_in_own_browser(self, source: str, amounts: List[float], pairs: Optional[List[Pair]],
+                               browser_launch_args: Optional[Dict]) -> Dict:
+        """Scrape one source with this converter's options in a browser owned by the calling thread."""
+        with sync_playwright() as playwright:
+            browser = playwright.chromium.launch(**(browser_launch_args or {"headless": True}))
+            try:
+                # Service workers would bypass HAR routing
+                context = browser.new_context(**({"service_workers": "block"} if self.har_mode != "off" else {}))
+                try:
+                    worker = copy.copy(self)
+                    worker.page = context.new_page()
+                    # Connections belong to one thread
+                    worker._http_client = None
+                    return worker.get_web_data(source, amounts, pairs)
+                finally:
+                    # Recorded HARs are written when their context closes
+                    context.close()
+            finally:
+                browser.close()
+    
+    def get_output_file_path(self) -> str:
+        """Get the path to the consolidated output file."""
+        return self.file_writer.get_consolidated_file_path()
+    
+    def _structure_results(self, results: List[Dict], source: str, pairs: Optional[List[Pair]] = None) -> Dict:
+        """Structure results for easy comparison."""
+        return structure_results(results, source, pairs)
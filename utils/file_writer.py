@@ -1,7 +1,9 @@
 import os
 from datetime import datetime
-from typing import Dict
+from typing import Dict, List, Tuple
+from utils.conversion_planner import pair_label, split_pair_key
 from utils.logger import log_info
+from utils.result_structure import pair_entries
 
 
 class FileWriter:
@@ -29,33 +31,47 @@ class FileWriter:
         if not self.consolidated_path:
             self.initialize_consolidated_file()
         
+        pairs = pair_entries(web_data)
         with open(self.consolidated_path, 'a', encoding='utf-8') as f:
             f.write(f"=== Source: {source.lower()} ===\n")
-            f.write(f"Exchange Rate (EUR): {web_data['eur']['exchange_rate']:.8f}\n")
-            f.write(f"Exchange Rate (USD): {web_data['usd']['exchange_rate']:.8f}\n\n")
+            for key, entry in pairs:
+                f.write(f"Exchange Rate ({pair_label(key)}): {entry['exchange_rate']:.8f}\n")
+            f.write("\n")
             
             f.write("Website Conversions:\n")
-            for amount in sorted(web_data['eur']['conversions'].keys()):
-                eur_converted = web_data['eur']['conversions'][amount]
-                usd_converted = web_data['usd']['conversions'].get(amount, 0)
-                f.write(f"Value in RSD: {amount}\n")
-                f.write(f"→ EUR: {eur_converted:.2f}\n")
-                f.write(f"→ USD: {usd_converted:.2f}\n")
-                f.write("...\n\n")
+            self._write_conversions(f, pairs, web_data)
             
             f.write("Calculator Conversions:\n")
-            for amount in sorted(calculator_data['eur']['conversions'].keys()):
-                eur_converted = calculator_data['eur']['conversions'][amount]
-                usd_converted = calculator_data['usd']['conversions'].get(amount, 0)
-                f.write(f"Value in RSD: {amount}\n")
-                f.write(f"→ EUR: {eur_converted:.2f}\n")
-                f.write(f"→ USD: {usd_converted:.2f}\n")
-                f.write("...\n\n")
+            self._write_conversions(f, pairs, calculator_data)
             
             f.write("-" * 31 + "\n\n")
         
         log_info(f"Appended {source} results to consolidated file")
     
+    def _write_conversions(self, f, pairs: List[Tuple[str, Dict]], data: Dict):
+        """Write one block per source currency and amount, with a line per target currency."""
+        groups: Dict[str, List[Tuple[str, Dict]]] = {}
+        for key, entry in pairs:
+            groups.setdefault(split_pair_key(key)[0], []).append((key, entry))
+        
+        for from_currency, group in groups.items():
+            first_key = group[0][0]
+            for amount in sorted(data[first_key]['conversions'].keys()):
+                f.write(f"Value in {from_currency}: {amount}\n")
+                for key, entry in group:
+                    converted = data[key]['conversions'].get(amount, 0)
+                    note = self._origin_note(data[key], amount)
+                    f.write(f"→ {split_pair_key(key)[1]}: {converted:.2f}{note}\n")
+                f.write("...\n\n")
+    
+    def _origin_note(self, currency_data: Dict, amount) -> str:
+        """Mark values that were sampled through the UI or calculator app, or derived from the rate."""
+        if amount in currency_data.get('sampled', []):
+            return " (sampled)"
+        if amount in currency_data.get('derived', []):
+            return " (derived)"
+        return ""
+    
     def get_consolidated_file_path(self) -> str:
         """Get the path to the consolidated file."""
         return self.consolidated_path
@@ -0,0 +1,242 @@
+import http.client
+import json
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlencode, urljoin, urlsplit
+from utils.logger import log_info, log_debug
+from utils.rate_payloads import RateTable, parse_wise_rates, parse_xe_midmarket, rate_from_tables
+
+
+class KeepAliveClient:
+    """
+    Small pooled HTTP/1.1 client on http.client.
+
+    Idle connections are kept per (scheme, host, port) and reused, so after the first request
+    a rate lookup costs one round-trip instead of a TCP (and TLS) handshake plus the request.
+    Safe to share between threads.
+    """
+
+    # Errors meaning a pooled connection was closed by the server while idle - retried once on a new one
+    STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, http.client.CannotSendRequest,
+                               ConnectionResetError, BrokenPipeError)
+
+    def __init__(self, timeout: float = 10.0, max_idle_per_host: int = 4, headers: Optional[Dict[str, str]] = None):
+        self.timeout = timeout
+        self.max_idle_per_host = max_idle_per_host
+        self.headers = {"Accept": "application/json", "Connection": "keep-alive", **(headers or {})}
+        self.stats = {"requests": 0, "connections_opened": 0, "connections_reused": 0}
+        self._idle: Dict[Tuple[str, str, int], List[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+
+    def get_json(self, url: str, headers: Optional[Dict[str, str]] = None):
+        """
+        GET a URL and decode its JSON body.
+
+        Raises:
+            http.client.HTTPException: On non-2xx responses
+            OSError: On connection failures
+        """
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == "https" else 80))
+        path = parts.path + (f"?{parts.query}" if parts.query else "")
+        request_headers = {**self.headers, **(headers or {})}
+
+        connection, reused = self._acquire(key)
+        try:
+            response = self._request(connection, path, request_headers)
+        except self.STALE_CONNECTION_ERRORS:
+            if not reused:
+                raise
+            connection.close()
+            connection, _ = self._open(key)
+            response = self._request(connection, path, request_headers)
+        except Exception:
+            connection.close()
+            raise
+
+        body = response.read()
+        if response.will_close:
+            connection.close()
+        else:
+            self._release(key, connection)
+        if not 200 <= response.status < 300:
+            raise http.client.HTTPException(f"GET {url} answered HTTP {response.status}")
+        return json.loads(body.decode("utf-8"))
+
+    def close(self) -> None:
+        """Close every idle connection."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for connection in connections:
+                connection.close()
+
+    def __enter__(self) -> "KeepAliveClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _request(self, connection: http.client.HTTPConnection, path: str, headers: Dict[str, str]):
+        """Send one GET on a connection."""
+        with self._lock:
+            self.stats["requests"] += 1
+        connection.request("GET", path, headers=headers)
+        return connection.getresponse()
+
+    def _acquire(self, key: Tuple[str, str, int]) -> Tuple[http.client.HTTPConnection, bool]:
+        """An idle connection for the host, or a new one; the flag tells whether it was reused."""
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                self.stats["connections_reused"] += 1
+                return idle.pop(), True
+        return self._open(key)
+
+    def _open(self, key: Tuple[str, str, int]) -> Tuple[http.client.HTTPConnection, bool]:
+        """Open a new connection."""
+        scheme, host, port = key
+        connection_class = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        with self._lock:
+            self.stats["connections_opened"] += 1
+        return connection_class(host, port, timeout=self.timeout), False
+
+    def _release(self, key: Tuple[str, str, int], connection: http.client.HTTPConnection) -> None:
+        """Return a connection to the pool, closing it when the pool is full."""
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append(connection)
+                return
+        connection.close()
+
+
+class HttpRateSource:
+    """
+    Browser-free rate source reading a site's public rate endpoint.
+
+    The counterpart of a page object with network rate capture: it requests the same JSON the
+    converter page fetches and returns results shaped like BasePage.create_result, without
+    starting a browser. Subclasses set the endpoint and its payload parser.
+    """
+
+    URL = ""
+    SOURCE_NAME = ""
+    TARGET_CURRENCIES = ()
+    HEADERS: Dict[str, str] = {}
+
+    def __init__(self, client: Optional[KeepAliveClient] = None, url: Optional[str] = None,
+                 headers: Optional[Dict[str, str]] = None):
+        self.client = client or KeepAliveClient()
+        self.url = url or self.URL
+        self.headers = {**self.HEADERS, **(headers or {})}
+        self.timings: List[Dict] = []
+
+    def rate_url(self, from_currency: str, to_currency: str) -> str:
+        """Endpoint URL answering the pair's rate - to be implemented by subclasses."""
+        raise NotImplementedError("Subclasses must implement rate_url")
+
+    def parse_rate_payload(self, payload) -> List[RateTable]:
+        """Turn an endpoint payload into rate tables - to be implemented by subclasses."""
+        raise NotImplementedError("Subclasses must implement parse_rate_payload")
+
+    def fetch_rate_tables(self, from_currency: str, to_currency: str) -> List[RateTable]:
+        """Request the pair's rate endpoint and parse it, recording the request time."""
+        url = self.rate_url(from_currency, to_currency)
+        start = time.perf_counter()
+        payload = self.client.get_json(url, self.headers)
+        elapsed = time.perf_counter() - start
+        self.timings.append({"name": "http_rate", "seconds": elapsed, "url": url})
+        log_debug(f"  {self.SOURCE_NAME} rate endpoint answered in {elapsed * 1000:.0f} ms")
+        return self.parse_rate_payload(payload)
+
+    def get_rate(self, from_currency: str, to_currency: str) -> float:
+        """
+        Fetch the current full-precision rate of a pair.
+
+        Raises:
+            ValueError: If the endpoint's answer does not contain the pair
+        """
+        rate = rate_from_tables(self.fetch_rate_tables(from_currency, to_currency), from_currency, to_currency)
+        if rate is None:
+            raise ValueError(f"{self.SOURCE_NAME} rate endpoint returned no {from_currency} → {to_currency} rate")
+        return rate
+
+    def get_conversions(self, pairs: List[Tuple[str, str]], amounts: List[float]) -> List[Dict]:
+        """
+        Convert every amount for the pairs from freshly fetched rates.
+
+        Tables fetched for one pair are reused for the following pairs they cover, so a source
+        answering with all rates at once (XE) needs a single request.
+        """
+        tables: List[RateTable] = []
+        results = []
+        for from_currency, to_currency in dict.fromkeys(pairs):
+            rate = rate_from_tables(tables, from_currency, to_currency)
+            if rate is None:
+                tables.extend(self.fetch_rate_tables(from_currency, to_currency))
+                rate = rate_from_tables(tables, from_currency, to_currency)
+            if rate is None:
+                raise ValueError(f"{self.SOURCE_NAME} rate endpoint returned no {from_currency} → {to_currency} rate")
+            log_info(f"  {self.SOURCE_NAME} {from_currency} → {to_currency} rate over HTTP: {rate:.12f}")
+            results.extend(self.create_result(amount, from_currency, to_currency, amount * rate, rate)
+                           for amount in amounts)
+        return results
+
+    def get_rsd_conversions(self, amounts: List[float]) -> List[Dict]:
+        """Get RSD to TARGET_CURRENCIES conversions."""
+        return self.get_conversions([("RSD", currency) for currency in self.TARGET_CURRENCIES], amounts)
+
+    def create_result(self, amount: float, from_currency: str, to_currency: str,
+                      converted_amount: float, exchange_rate: float) -> Dict:
+        """Create a result dictionary like BasePage.create_result."""
+        return {
+            "amount": amount,
+            "from_currency": from_currency,
+            "to_currency": to_currency,
+            "converted_amount": converted_amount,
+            "exchange_rate": exchange_rate,
+            "source": self.SOURCE_NAME,
+            "method": "http"
+        }
+
+
+class XEHttpRateSource(HttpRateSource):
+    """
+    XE.com midmarket rates over HTTP.
+
+    The live endpoint is the one the converter widget calls; XE may require the widget's
+    Authorization header, which can be passed through headers.
+    """
+
+    URL = "https://www.xe.com/"
+    SOURCE_NAME = "XE.com"
+    TARGET_CURRENCIES = ("EUR", "USD")
+    RATE_PATH = "api/protected/midmarket-converter"
+
+    def rate_url(self, from_currency: str, to_currency: str) -> str:
+        """XE answers every rate at once, so the endpoint takes no pair."""
+        return urljoin(self.url, self.RATE_PATH)
+
+    def parse_rate_payload(self, payload) -> List[RateTable]:
+        """Parse XE.com midmarket rate payloads."""
+        return parse_xe_midmarket(payload)
+
+
+class WiseHttpRateSource(HttpRateSource):
+    """Wise.com live mid-market rates over HTTP."""
+
+    URL = "https://wise.com/gb/currency-converter/"
+    SOURCE_NAME = "Wise.com"
+    TARGET_CURRENCIES = ("EUR", "USD")
+    # Relative to the converter page, like the page's own requests
+    RATE_PATH = "../../rates/live"
+
+    def rate_url(self, from_currency: str, to_currency: str) -> str:
+        """Live rate endpoint of one pair."""
+        return f"{urljoin(self.url, self.RATE_PATH)}?{urlencode({'source': from_currency, 'target': to_currency})}"
+
+    def parse_rate_payload(self, payload) -> List[RateTable]:
+        """Parse Wise.com live rate payloads."""
+        return parse_wise_rates(payload)
@@ -0,0 +1,130 @@
+import json
+import os
+import re
+import threading
+from typing import Dict, Optional, Tuple
+from utils.logger import log_debug, log_warning
+
+
+# Playwright selectors that in-page scripts cannot hand to document.querySelector
+_ENGINE_PREFIX = re.compile(r"^(css|xpath|text|role|id|data-testid|internal:[\w-]+)=")
+_PLAYWRIGHT_PSEUDO = re.compile(r":(has-text|text|text-is|text-matches|visible|nth-match)\b")
+
+
+def is_css_selector(selector: str) -> bool:
+    """Whether a selector is plain CSS (no Playwright engine, pseudo-class or chaining)."""
+    return not (_ENGINE_PREFIX.match(selector) or selector.startswith(("//", "..")) or ">>" in selector
+                or _PLAYWRIGHT_PSEUDO.search(selector))
+
+
+class LocatorChain:
+    """
+    Ordered fallback selectors for one page element.
+
+    Selectors are Playwright selectors - CSS, role=..., text=... or data-testid=... - tried in
+    order, except that the one that matched on the previous run goes first (see LocatorCache).
+    The chain is named after the class attribute it is assigned to, e.g. XEPage.RESULT_ELEMENTS.
+    In-page scripts only get the plain CSS fallbacks.
+
+    Usage:
+        RESULT_INPUT = LocatorChain("#target-input", "[data-testid='target-amount'] input")
+    """
+
+    def __init__(self, *selectors: str):
+        if not selectors:
+            raise ValueError("A locator chain needs at least one selector")
+        self.selectors: Tuple[str, ...] = selectors
+        self.name: Optional[str] = None
+
+    def __set_name__(self, owner, name: str) -> None:
+        # Aliases such as EXTRACT_AMOUNT_SELECTOR = RESULT_ELEMENTS keep the first name
+        if self.name is None:
+            self.name = name
+
+    @property
+    def primary(self) -> str:
+        """The selector tried first on a cold cache."""
+        return self.selectors[0]
+
+    @property
+    def css_selectors(self) -> Tuple[str, ...]:
+        """The fallbacks usable in document.querySelector."""
+        return tuple(s for s in self.selectors if is_css_selector(s))
+
+    def __repr__(self) -> str:
+        return f"LocatorChain({self.name or '?'}: {', '.join(self.selectors)})"
+
+
+class LocatorCache:
+    """
+    The selector that last matched for every locator chain, kept in a small JSON file.
+
+    Stored as {source: {chain name: selector}} so a broken primary selector is paid for once -
+    the next run starts with the fallback that worked. Safe to share between threads.
+    """
+
+    DEFAULT_PATH = os.path.join(".cache", "locators.json")
+
+    _shared: Optional["LocatorCache"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, path: Optional[str] = DEFAULT_PATH):
+        self.path = os.path.abspath(path) if path else None
+        self._lock = threading.Lock()
+        self._winners: Dict[str, Dict[str, str]] = self._load()
+
+    @classmethod
+    def shared(cls) -> "LocatorCache":
+        """Process-wide cache at LOCATOR_CACHE (default .cache/locators.json, 'off' keeps it in memory)."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                path = os.getenv("LOCATOR_CACHE", cls.DEFAULT_PATH)
+                cls._shared = cls(None if path.lower() == "off" else path)
+            return cls._shared
+
+    def winner(self, source: str, name: str) -> Optional[str]:
+        """The selector that matched last time, if any."""
+        with self._lock:
+            return self._winners.get(source, {}).get(name)
+
+    def remember(self, source: str, name: str, selector: str) -> None:
+        """Store a chain's matching selector, writing the file only when it changed."""
+        with self._lock:
+            if self._winners.get(source, {}).get(name) == selector:
+                return
+            self._winners.setdefault(source, {})[name] = selector
+            snapshot = json.dumps(self._winners, indent=2, sort_keys=True)
+        self._save(snapshot)
+
+    def clear(self) -> None:
+        """Forget every remembered selector."""
+        with self._lock:
+            self._winners = {}
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+    def _load(self) -> Dict[str, Dict[str, str]]:
+        """Read the cache file, starting empty when it is missing or unreadable."""
+        if not self.path or not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError) as e:
+            log_warning(f"Ignoring unreadable locator cache {self.path}: {e}")
+            return {}
+
+    def _save(self, snapshot: str) -> None:
+        """Replace the cache file atomically."""
+        if not self.path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                f.write(snapshot)
+            os.replace(temp_path, self.path)
+            log_debug(f"Locator cache updated: {self.path}")
+        except OSError as e:
+            log_warning(f"Could not write locator cache {self.path}: {e}")
@@ -1,3 +1,4 @@
+import os
 import platform
 from typing import Dict, Optional
 from utils.logger import log_info, log_debug, log_error
@@ -16,14 +17,45 @@ def detect_os() -> str:
     return system
 
 
-def get_calculator_class() -> Optional[type[BaseCalculator]]:
+CALCULATOR_BACKENDS = ("gui", "cli", "decimal")
+
+
+def has_display() -> bool:
+    """Whether desktop apps can be shown and automated - on Linux only with an X or Wayland display."""
+    if detect_os() != "linux":
+        return True
+    return bool(os.getenv("DISPLAY") or os.getenv("WAYLAND_DISPLAY"))
+
+
+def default_calculator_backend() -> str:
+    """The calculator app ("gui") where there is a display to drive it, the in-process "decimal" one otherwise."""
+    if has_display():
+        return "gui"
+    log_info("No display to drive the calculator app, using the Decimal reference calculator")
+    return "decimal"
+
+
+def get_calculator_class(backend: str = "gui") -> Optional[type[BaseCalculator]]:
     """
     Get the appropriate calculator class based on the operating system.
 
+    Args:
+        backend: "gui" drives the desktop calculator app, "cli" its command-line solver (Linux only),
+            "decimal" multiplies in-process with decimal.Decimal on any OS
+
     Returns:
         Optional[type[BaseCalculator]]: Calculator class for the current OS
     """
+    if backend not in CALCULATOR_BACKENDS:
+        raise ValueError(f"Unsupported calculator backend '{backend}', expected one of {CALCULATOR_BACKENDS}")
+    if backend == "decimal":
+        log_info("Initializing Decimal reference Calculator service...")
+        from calculators.decimal_calculator import DecimalCalculator
+        return DecimalCalculator
     system = detect_os()
+    if backend == "cli" and system != "linux":
+        log_error(f"No command-line calculator backend for {system}")
+        raise NotImplementedError(f"Command-line calculator not implemented for {system}")
 
     if system == "windows":
         log_info("Initializing Windows Calculator service...")
@@ -33,6 +65,10 @@ def get_calculator_class() -> Optional[type[BaseCalculator]]:
         log_info("Initializing macOS Calculator service...")
         # TODO: Implement macOS calculator when needed
         raise NotImplementedError("macOS calculator not yet implemented")
+    elif system == "linux" and backend == "cli":
+        log_info("Initializing Linux command-line Calculator service...")
+        from calculators.linux_cli_calculator import LinuxCliCalculator
+        return LinuxCliCalculator
     elif system == "linux":
         log_info("Initializing Linux Calculator service...")
         from calculators.linux_calculator import LinuxCalculator
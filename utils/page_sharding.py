@@ -0,0 +1,36 @@
+from typing import List, Tuple
+
+Pair = Tuple[str, str]
+PageWork = List[Tuple[Pair, List[float]]]
+
+
+def plan_shards(pairs: List[Pair], amounts: List[float], page_count: int) -> List[PageWork]:
+    """
+    Split (pair, amount) work across pages so each page keeps one currency selection as long as possible.
+
+    With at least as many pages as pairs, every pair gets its own group of pages and the amounts
+    are dealt across that group. With fewer pages, pairs are dealt round-robin and each page
+    works through its pairs one after another with all amounts.
+
+    Args:
+        pairs: Currency pairs, e.g. [("RSD", "EUR"), ("RSD", "USD")]
+        amounts: Amounts to convert for every pair (or their positions, which keeps repeated amounts apart)
+        page_count: Number of pages available
+
+    Returns:
+        One work list per page, each a list of (pair, amounts) in execution order
+    """
+    page_count = max(1, page_count)
+    if page_count <= len(pairs):
+        plan = [[] for _ in range(page_count)]
+        for i, pair in enumerate(pairs):
+            plan[i % page_count].append((pair, list(amounts)))
+        return plan
+
+    plan = []
+    for i, pair in enumerate(pairs):
+        pages_for_pair = page_count // len(pairs) + (1 if i < page_count % len(pairs) else 0)
+        pages_for_pair = min(pages_for_pair, max(1, len(amounts)))
+        for shard in range(pages_for_pair):
+            plan.append([(pair, list(amounts[shard::pages_for_pair]))])
+    return plan
@@ -0,0 +1,62 @@
+from typing import Dict, List, Optional
+
+
+# A rate table maps currency codes to units per one unit of a shared base,
+# so the rate for any pair inside one table is table[to] / table[from].
+RateTable = Dict[str, float]
+
+
+def parse_xe_midmarket(payload) -> List[RateTable]:
+    """
+    Parse XE.com midmarket converter payloads.
+
+    XE answers with every rate relative to one base currency, e.g.
+    {"timestamp": ..., "rates": {"USD": 1, "EUR": 0.92, "RSD": 107.9}}.
+
+    Returns:
+        List with the rate table, or an empty list if the payload is not recognized
+    """
+    if not isinstance(payload, dict) or not isinstance(payload.get("rates"), dict):
+        return []
+    table = {}
+    for currency, value in payload["rates"].items():
+        if isinstance(value, (int, float)) and value > 0:
+            table[currency.upper()] = float(value)
+    return [table] if table else []
+
+
+def parse_wise_rates(payload) -> List[RateTable]:
+    """
+    Parse Wise.com live rate and quote payloads.
+
+    Supports the live rate endpoint ({"source": "RSD", "target": "EUR", "value": 0.0085})
+    as well as quote/price objects using sourceCurrency/targetCurrency with rate or midRate,
+    either as a single object or a list of them.
+
+    Returns:
+        List of two-currency rate tables, empty if nothing is recognized
+    """
+    items = payload if isinstance(payload, list) else [payload]
+    tables = []
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        source = item.get("source") or item.get("sourceCurrency")
+        target = item.get("target") or item.get("targetCurrency")
+        rate = item.get("value", item.get("rate", item.get("midRate")))
+        if isinstance(source, str) and isinstance(target, str) and isinstance(rate, (int, float)) and rate > 0:
+            tables.append({source.upper(): 1.0, target.upper(): float(rate)})
+    return tables
+
+
+def rate_from_tables(tables: List[RateTable], from_currency: str, to_currency: str) -> Optional[float]:
+    """
+    Look up a pair rate, preferring the most recently captured table.
+
+    Returns:
+        Full-precision rate, or None if no table contains both currencies
+    """
+    for table in reversed(tables):
+        if from_currency in table and to_currency in table:
+            return table[to_currency] / table[from_currency]
+    return None
@@ -0,0 +1,69 @@
+from typing import Dict, List, Optional, Tuple
+from utils.conversion_planner import pair_key
+from utils.logger import log_debug
+
+
+def structure_results(results: List[Dict], source: str, pairs: Optional[List[Tuple[str, str]]] = None) -> Dict:
+    """
+    Structure page results for easy comparison.
+    
+    Args:
+        results: Flat result dictionaries as created by BasePage.create_result
+        source: Source name (e.g., 'XE.com')
+        pairs: Pairs that get an entry even without results, in this order
+        
+    Returns:
+        Dict with the source and, per pair key (see pair_key, e.g. 'eur' for RSD → EUR),
+        the exchange rate and conversions
+    """
+    log_debug(f"Structuring {len(results)} results from {source}...")
+    
+    by_pair: Dict[Tuple[str, str], List[Dict]] = {pair: [] for pair in pairs or []}
+    for result in results:
+        by_pair.setdefault((result["from_currency"], result["to_currency"]), []).append(result)
+    
+    structured = {"source": source}
+    for (from_currency, to_currency), pair_results in by_pair.items():
+        # Use first exchange rate (should be same for all amounts from same source)
+        rate = pair_rate(pair_results)
+        log_debug(f"STRUCTURE RESULTS - Raw {from_currency} → {to_currency} rate from first result: {rate:.10f}")
+        structured[pair_key(from_currency, to_currency)] = _structure_currency(from_currency, to_currency,
+                                                                               pair_results, rate)
+    return structured
+
+
+def pair_entries(structured: Dict) -> List[Tuple[str, Dict]]:
+    """The (pair key, pair data) items of structured web or calculator data, skipping the source name."""
+    return [(key, value) for key, value in structured.items()
+            if isinstance(value, dict) and "conversions" in value]
+
+
+def pair_rate(pair_results: List[Dict]) -> float:
+    """Pick the pair rate - in sampling mode the single full-precision rate the amounts were checked against."""
+    if not pair_results:
+        return 0
+    for result in pair_results:
+        if "sampling_rate" in result:
+            return result["sampling_rate"]
+    return pair_results[0]["exchange_rate"]
+
+
+def _structure_currency(from_currency: str, to_currency: str, pair_results: List[Dict], rate: float) -> Dict:
+    """Structure one pair's conversions, reporting which amounts were sampled and which derived."""
+    sampled = [r for r in pair_results if r.get("method") == "sampled"]
+    structured = {
+        "from_currency": from_currency,
+        "to_currency": to_currency,
+        "exchange_rate": rate,
+        "conversions": {r["amount"]: r["converted_amount"] for r in pair_results},
+        "sampled": [r["amount"] for r in sampled],
+        "derived": [r["amount"] for r in pair_results if r.get("method") == "derived"]
+    }
+    # The sample the rate was calculated from checks nothing
+    checked = [r for r in sampled if "spot_check_difference" in r]
+    if checked:
+        structured["spot_check"] = {
+            "max_difference": max(r["spot_check_difference"] for r in checked),
+            "passed": all(r["spot_check_passed"] for r in checked)
+        }
+    return structured
@@ -0,0 +1,133 @@
+import time
+from typing import Dict, Iterable, Optional
+from urllib.parse import urlparse
+from utils.logger import log_info, log_debug
+
+
+class RouteProfile:
+    """
+    Request filter aborting resources a converter page does not need.
+
+    A request is aborted when its resource type is blocked, its host is on the deny list,
+    or its host is not on the allow list (third-party). Page classes define the lists,
+    see the ROUTE_* attributes of BasePage.
+    """
+
+    def __init__(self, allowed_domains: Iterable[str], blocked_domains: Iterable[str] = (),
+                 blocked_resource_types: Iterable[str] = ()):
+        self.allowed_domains = tuple(allowed_domains)
+        self.blocked_domains = tuple(blocked_domains)
+        self.blocked_resource_types = set(blocked_resource_types)
+        self.stats = {"allowed_requests": 0, "blocked_requests": 0, "blocked_by_reason": {}}
+
+    @staticmethod
+    def _host_matches(host: str, domains: Iterable[str]) -> bool:
+        """Check whether a host is one of the domains or a subdomain of them."""
+        return any(host == domain or host.endswith("." + domain) for domain in domains)
+
+    def block_reason(self, url: str, resource_type: str) -> Optional[str]:
+        """
+        Decide whether a request should be aborted.
+
+        Returns:
+            The reason ('resource:<type>', 'denied', 'third-party'), or None to let it through
+        """
+        host = urlparse(url).hostname or ""
+        if not host:
+            return None
+        if resource_type in self.blocked_resource_types:
+            return f"resource:{resource_type}"
+        if self._host_matches(host, self.blocked_domains):
+            return "denied"
+        if self.allowed_domains and not self._host_matches(host, self.allowed_domains):
+            return "third-party"
+        return None
+
+    def _count(self, reason: Optional[str]) -> None:
+        """Update request statistics."""
+        if reason is None:
+            self.stats["allowed_requests"] += 1
+            return
+        self.stats["blocked_requests"] += 1
+        by_reason = self.stats["blocked_by_reason"]
+        by_reason[reason] = by_reason.get(reason, 0) + 1
+
+    def handle_route(self, route) -> None:
+        """Route handler for playwright.sync_api."""
+        reason = self.block_reason(route.request.url, route.request.resource_type)
+        self._count(reason)
+        if reason:
+            route.abort()
+        else:
+            # Fall back rather than continue, so HAR replay routes still get the request
+            route.fallback()
+
+
+def measure_navigation(page, url: str, profile: Optional[RouteProfile] = None, settle_timeout: int = 10000) -> Dict:
+    """
+    Navigate a fresh sync page and measure what it loads.
+
+    Load time is taken up to domcontentloaded, as BasePage.navigate_to waits for it; requests
+    and transferred bytes are counted until the network goes idle (or settle_timeout passes).
+
+    Returns:
+        Dict with load_seconds, requests, bytes and blocked_requests
+    """
+    finished = []
+    page.on("requestfinished", finished.append)
+    if profile:
+        page.route("**/*", profile.handle_route)
+
+    start = time.perf_counter()
+    page.goto(url, timeout=30000, wait_until="domcontentloaded")
+    load_seconds = time.perf_counter() - start
+    try:
+        page.wait_for_load_state("networkidle", timeout=settle_timeout)
+    except Exception:
+        log_debug(f"Network did not go idle within {settle_timeout} ms on {url}")
+
+    transferred = 0
+    for request in finished:
+        try:
+            sizes = request.sizes()
+            transferred += sizes["responseBodySize"] + sizes["responseHeadersSize"]
+        except Exception:
+            pass
+    return {
+        "load_seconds": load_seconds,
+        "requests": len(finished),
+        "bytes": transferred,
+        "blocked_requests": profile.stats["blocked_requests"] if profile else 0,
+    }
+
+
+def compare_route_profile(browser, page_class: type, **context_args) -> Dict:
+    """
+    Load a page class's URL once without and once with its route profile.
+
+    Each load gets a fresh browser context so neither is served from the other's cache.
+
+    Returns:
+        Dict with both measurements and the requests/bytes saved and load time change
+    """
+    measurements = []
+    for profile in (None, page_class.create_route_profile()):
+        context = browser.new_context(**context_args)
+        try:
+            measurements.append(measure_navigation(context.new_page(), page_class.URL, profile))
+        finally:
+            context.close()
+    baseline, profiled = measurements
+
+    report = {
+        "source": page_class.SOURCE_NAME,
+        "baseline": baseline,
+        "profiled": profiled,
+        "requests_saved": baseline["requests"] - profiled["requests"],
+        "bytes_saved": baseline["bytes"] - profiled["bytes"],
+        "load_seconds_change": profiled["load_seconds"] - baseline["load_seconds"],
+    }
+    log_info(f"{page_class.SOURCE_NAME} route profile: {report['requests_saved']} requests and "
+             f"{report['bytes_saved'] / 1024:.0f} KiB saved, load time "
+             f"{baseline['load_seconds']:.2f} s → {profiled['load_seconds']:.2f} s")
+    return report
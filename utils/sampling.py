@@ -0,0 +1,108 @@
+import random
+from typing import Dict, List, Optional, Tuple
+from utils.logger import log_info, log_warning
+
+
+def choose_sample(amounts: List[float], sample_size: Optional[int], sampler: random.Random) -> List[float]:
+    """
+    Pick the amounts checked in sampling mode, keeping their original order.
+
+    Args:
+        amounts: All amounts of the run
+        sample_size: How many amounts to pick (None, 0 or at least len(amounts): all of them)
+        sampler: Random generator, seeded for reproducible runs
+
+    Returns:
+        The picked amounts, in the order of amounts
+    """
+    if not sample_size or sample_size >= len(amounts):
+        return list(amounts)
+    chosen = set(sampler.sample(range(len(amounts)), sample_size))
+    return [amount for i, amount in enumerate(amounts) if i in chosen]
+
+
+def merge_sampled_results(amounts: List[float], from_currency: str, to_currency: str, source: str,
+                          sampled: List[Dict], captured: List[Dict], tolerance: float) -> List[Dict]:
+    """
+    Spot check sampled UI conversions against one full-precision rate and derive the remaining amounts.
+
+    Every result carries that rate as "sampling_rate". A sample the rate was calculated from
+    agrees with it by construction, so it is marked "rate_source" and not spot checked.
+
+    Args:
+        amounts: All amounts of the pair
+        from_currency: Source currency
+        to_currency: Target currency
+        source: Source name the derived results are attributed to (e.g. 'XE.com')
+        sampled: UI results of the sampled amounts, as BasePage.create_result creates them
+        captured: Results built from a captured network rate (empty when none was captured)
+        tolerance: Largest allowed difference between a sample and its derived value
+
+    Returns:
+        One result per amount, or an empty list when there is neither a captured rate nor a sample
+    """
+    if not sampled and not captured:
+        log_warning(f"No {from_currency} → {to_currency} rate to derive conversions from: "
+                    f"nothing captured and no amount sampled")
+        return []
+    rate, rate_source = sampling_rate(sampled, captured)
+
+    by_amount = {}
+    for result in sampled:
+        result["method"] = "sampled"
+        result["sampling_rate"] = rate
+        by_amount[result["amount"]] = result
+        if result is rate_source:
+            result["rate_source"] = True
+            continue
+        expected = result["amount"] * rate
+        result["spot_check_difference"] = abs(result["converted_amount"] - expected)
+        result["spot_check_passed"] = result["spot_check_difference"] <= tolerance
+        if not result["spot_check_passed"]:
+            log_warning(f"Spot check mismatch for {result['amount']} {from_currency} → {to_currency}: "
+                        f"site={result['converted_amount']:.4f}, derived={expected:.4f}")
+
+    results = []
+    for amount in amounts:
+        if amount in by_amount:
+            results.append(by_amount[amount])
+        else:
+            results.append({
+                "amount": amount,
+                "from_currency": from_currency,
+                "to_currency": to_currency,
+                "converted_amount": amount * rate,
+                "exchange_rate": rate,
+                "source": source,
+                "method": "derived",
+                "sampling_rate": rate
+            })
+    log_info(f"  {from_currency} → {to_currency}: {len(sampled)} sampled, "
+             f"{len(results) - len(sampled)} derived from rate {rate:.10f}")
+    return results
+
+
+def sampling_rate(sampled: List[Dict], captured: List[Dict]) -> Tuple[float, Optional[Dict]]:
+    """
+    The rate sampling mode derives amounts from, and the sample it was calculated from (if any).
+
+    In order of precision: the captured network rate, a rate line the page showed next to a
+    sample, or the largest sample's converted amount over its amount, whose display rounding
+    matters least.
+    """
+    if captured:
+        return captured[0]["exchange_rate"], None
+    by_size = sorted(sampled, key=lambda r: r["amount"], reverse=True)
+    for result in by_size:
+        # A calculated rate is exactly converted / amount; anything else was read from a rate line
+        if result["exchange_rate"] != _calculated_rate(result):
+            return result["exchange_rate"], None
+    largest = by_size[0]
+    return _calculated_rate(largest), largest
+
+
+def _calculated_rate(result: Dict) -> float:
+    """converted / amount, as BasePage.calculate_exchange_rate calculates it."""
+    if result["converted_amount"] > 0 and result["amount"] > 0:
+        return result["converted_amount"] / result["amount"]
+    return 0.0
@@ -0,0 +1,452 @@
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlparse
+from utils.logger import log_info, log_debug
+
+
+# Units per EUR - the stand-in sites quote every pair from this table
+DEFAULT_RATES = {"EUR": 1.0, "RSD": 117.17, "USD": 1.0835, "GBP": 0.8432}
+
+CURRENCY_NAMES = {"EUR": "Euro", "RSD": "Serbian Dinar", "USD": "US Dollar", "GBP": "British Pound"}
+
+
+class StubSiteConfig:
+    """
+    Behaviour of the stand-in converter sites.
+
+    Args:
+        rates: Units per EUR for every offered currency
+        latency_ms: Delay of every rate/quote response
+        jitter_ms: Random extra delay (0..jitter_ms) per response
+        tick_interval: Seconds between rate ticks, 0 keeps rates fixed
+        tick_size: Relative rate move per tick step (rates cycle through -2..+2 steps)
+        failure_rate: Share of rate/quote requests that fail
+        failure_mode: 'error' answers HTTP 500, 'slow' delays the answer by slow_ms
+        slow_ms: Delay used by the 'slow' failure mode
+        seed: Seed for jitter and failure injection
+        xe_result_class: Class of the XE-like result line - change it to simulate XE renaming its hashed classes
+    """
+
+    FAILURE_MODES = ("error", "slow")
+
+    def __init__(self, rates: Optional[Dict[str, float]] = None, latency_ms: int = 0, jitter_ms: int = 0,
+                 tick_interval: float = 0, tick_size: float = 0.0005, failure_rate: float = 0.0,
+                 failure_mode: str = "error", slow_ms: int = 15000, seed: Optional[int] = None,
+                 xe_result_class: str = "sc-708e65be-1"):
+        if failure_mode not in self.FAILURE_MODES:
+            raise ValueError(f"Unsupported failure mode '{failure_mode}', expected one of {self.FAILURE_MODES}")
+        self.rates = dict(rates or DEFAULT_RATES)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.tick_interval = tick_interval
+        self.tick_size = tick_size
+        self.failure_rate = failure_rate
+        self.failure_mode = failure_mode
+        self.slow_ms = slow_ms
+        self.seed = seed
+        self.xe_result_class = xe_result_class
+
+
+class StubConverterServer:
+    """
+    Local HTTP server with XE-like and Wise-like converter pages.
+
+    The pages expose the selectors XEPage and WisePage rely on and fetch their rates from
+    JSON endpoints shaped like the real ones. Sites are served below /xe.com/ and /wise.com/
+    so the page classes' rate response patterns match them too.
+
+    Usage:
+        with StubConverterServer(StubSiteConfig(latency_ms=50)) as server:
+            XEPage(page, url=server.url_for("xe.com")).get_rsd_conversions([1000])
+    """
+
+    SITE_PATHS = {
+        "xe.com": "/xe.com/",
+        "wise.com": "/wise.com/gb/currency-converter/",
+    }
+
+    def __init__(self, config: Optional[StubSiteConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or StubSiteConfig()
+        self._random = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self.stats = {"requests": 0, "failures": 0, "by_endpoint": {}}
+        self._httpd = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        """Root URL of the running server."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url_for(self, source: str) -> str:
+        """Converter page URL for a source key ('xe.com' or 'wise.com')."""
+        return self.base_url + self.SITE_PATHS[source]
+
+    def site_urls(self) -> Dict[str, str]:
+        """Converter page URLs for every source, as CurrencyConverter's site_urls option takes them."""
+        return {source: self.url_for(source) for source in self.SITE_PATHS}
+
+    def start(self) -> "StubConverterServer":
+        """Serve in a background thread."""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="stub-converter-server", daemon=True)
+        self._thread.start()
+        log_info(f"Stub converter sites running at {self.base_url}")
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and release the port."""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join()
+        log_debug(f"Stub converter sites stopped after {self.stats['requests']} requests")
+
+    def __enter__(self) -> "StubConverterServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def current_rates(self) -> Dict[str, float]:
+        """The rate table at this moment, after applying rate ticks."""
+        factor = 1.0
+        if self.config.tick_interval > 0:
+            tick = int((time.monotonic() - self._started) / self.config.tick_interval)
+            factor = 1.0 + self.config.tick_size * ((tick % 5) - 2)
+        return {currency: value if currency == "EUR" else value * factor
+                for currency, value in self.config.rates.items()}
+
+    def rate(self, from_currency: str, to_currency: str) -> float:
+        """Current pair rate."""
+        rates = self.current_rates()
+        return rates[to_currency] / rates[from_currency]
+
+    def _count(self, endpoint: str) -> None:
+        """Update request statistics."""
+        with self._lock:
+            self.stats["requests"] += 1
+            by_endpoint = self.stats["by_endpoint"]
+            by_endpoint[endpoint] = by_endpoint.get(endpoint, 0) + 1
+
+    def _response_delay(self) -> tuple:
+        """
+        Decide how an API response behaves.
+
+        Returns:
+            (delay in seconds, whether to fail with HTTP 500)
+        """
+        with self._lock:
+            delay = self.config.latency_ms + self._random.uniform(0, self.config.jitter_ms)
+            failing = self._random.random() < self.config.failure_rate
+            if failing:
+                self.stats["failures"] += 1
+        if failing and self.config.failure_mode == "slow":
+            return (delay + self.config.slow_ms) / 1000, False
+        return delay / 1000, failing
+
+
+def _make_handler(server: StubConverterServer):
+    """Request handler class bound to one server instance."""
+
+    class StubRequestHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body are written separately; without TCP_NODELAY keep-alive clients stall on delayed ACKs
+        disable_nagle_algorithm = True
+
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            parsed = urlparse(self.path)
+            query = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+            routes = {
+                "/xe.com/": self._xe_page,
+                "/xe.com/currencyconverter/convert/": self._xe_page,
+                "/xe.com/api/protected/midmarket-converter": self._xe_rates,
+                "/wise.com/gb/currency-converter/": self._wise_page,
+                "/wise.com/rates/live": self._wise_live_rate,
+                "/wise.com/gateway/v3/quotes": self._wise_quote,
+            }
+            handler = routes.get(parsed.path)
+            if handler is None:
+                server._count("not_found")
+                self._send(404, "text/plain", b"not found")
+                return
+            server._count(parsed.path)
+            handler(query)
+
+        def _xe_page(self, query):
+            self._send(200, "text/html; charset=utf-8", _render_page(XE_PAGE_HTML, server))
+
+        def _wise_page(self, query):
+            self._send(200, "text/html; charset=utf-8", _render_page(WISE_PAGE_HTML, server))
+
+        def _xe_rates(self, query):
+            if self._delay_or_fail():
+                return
+            self._send_json({"timestamp": int(time.time() * 1000), "rates": server.current_rates()})
+
+        def _wise_live_rate(self, query):
+            if self._delay_or_fail():
+                return
+            source, target = query.get("source", "GBP"), query.get("target", "EUR")
+            self._send_json({"source": source, "target": target, "value": server.rate(source, target),
+                             "time": int(time.time() * 1000)})
+
+        def _wise_quote(self, query):
+            if self._delay_or_fail():
+                return
+            source, target = query.get("source", "GBP"), query.get("target", "EUR")
+            amount = float(query.get("amount", 0) or 0)
+            rate = server.rate(source, target)
+            self._send_json({"sourceCurrency": source, "targetCurrency": target, "rate": rate,
+                             "sourceAmount": amount, "targetAmount": amount * rate})
+
+        def _delay_or_fail(self) -> bool:
+            """Apply latency and failure injection; True when the request was failed."""
+            delay, failing = server._response_delay()
+            if delay > 0:
+                time.sleep(delay)
+            if failing:
+                self._send_json({"error": "injected failure"}, status=500)
+            return failing
+
+        def _send_json(self, payload, status: int = 200):
+            self._send(status, "application/json", json.dumps(payload).encode("utf-8"))
+
+        def _send(self, status: int, content_type: str, body: bytes):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Cache-Control", "no-store")
+            self.end_headers()
+            self.wfile.write(body)
+
+    return StubRequestHandler
+
+
+def _render_page(template: str, server: StubConverterServer) -> bytes:
+    """Fill a page template with the offered currencies and the XE result class."""
+    currencies = [{"code": code, "name": CURRENCY_NAMES.get(code, code)} for code in server.config.rates]
+    return (template.replace("__CURRENCIES__", json.dumps(currencies))
+            .replace("__RESULT_CLASS__", server.config.xe_result_class).encode("utf-8"))
+
+
+# XE-like converter: searchable currency comboboxes, a Convert button and a conversion panel.
+# The amount input is reformatted on change (value attribute included), and every change clears
+# the panel until the rates request for it has been answered. Served at currencyconverter/convert/
+# too, where Amount, From and To query parameters preset and run a conversion like XE's deep links.
+XE_PAGE_HTML = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>XE stand-in converter</title>
+<base href="/xe.com/">
+<style>[hidden] { display: none !important; } li[role=option] { cursor: pointer; }</style>
+</head>
+<body>
+<form onsubmit="return false">
+  <label>Amount <input id="amount" value="1" inputmode="decimal"></label>
+  <div id="midmarketFromCurrency">
+    <input placeholder="Type to search..." autocomplete="off"> <span class="selected">USD</span>
+    <ul role="listbox" hidden></ul>
+  </div>
+  <div id="midmarketToCurrency">
+    <input placeholder="Type to search..." autocomplete="off"> <span class="selected">EUR</span>
+    <ul role="listbox" hidden></ul>
+  </div>
+  <button type="button" id="convert">Convert</button>
+</form>
+<div data-testid="conversion" hidden>
+  <div class="[grid-area:conversion]">
+    <p class="amount-line"></p>
+    <p class="__RESULT_CLASS__"></p>
+  </div>
+  <div class="rate-lines">
+    <p class="rate-from"></p>
+    <p class="rate-to"></p>
+  </div>
+</div>
+<script>
+const CURRENCIES = __CURRENCIES__;
+const state = { from: "USD", to: "EUR", converted: false, sequence: 0 };
+const amountInput = document.getElementById("amount");
+const panel = document.querySelector("[data-testid='conversion']");
+
+function formatAmount(value) {
+  return value.toLocaleString("en-US", { minimumFractionDigits: 2, maximumFractionDigits: 2 });
+}
+
+function setupSelect(rootId, key) {
+  const root = document.getElementById(rootId);
+  const input = root.querySelector("input");
+  const list = root.querySelector("[role=listbox]");
+  input.addEventListener("input", () => {
+    const query = input.value.trim().toLowerCase();
+    list.innerHTML = "";
+    CURRENCIES.filter(c => query && (c.code + " " + c.name).toLowerCase().includes(query)).forEach(c => {
+      const option = document.createElement("li");
+      option.setAttribute("role", "option");
+      option.textContent = c.code + " " + c.name;
+      option.addEventListener("click", () => {
+        state[key] = c.code;
+        root.querySelector(".selected").textContent = c.code;
+        input.value = "";
+        list.hidden = true;
+        if (state.converted) refresh();
+      });
+      list.appendChild(option);
+    });
+    list.hidden = list.children.length === 0;
+  });
+}
+
+async function refresh() {
+  const sequence = ++state.sequence;
+  const amount = parseFloat(amountInput.value.replace(/,/g, "")) || 0;
+  panel.querySelector(".amount-line").textContent = "";
+  panel.querySelector(".__RESULT_CLASS__").textContent = "";
+  const response = await fetch("api/protected/midmarket-converter");
+  if (!response.ok || sequence !== state.sequence) return;
+  const rates = (await response.json()).rates;
+  const rate = rates[state.to] / rates[state.from];
+  panel.querySelector(".amount-line").textContent = formatAmount(amount) + " " + state.from + " =";
+  panel.querySelector(".__RESULT_CLASS__").textContent = (amount * rate).toFixed(6) + " " + state.to;
+  panel.querySelector(".rate-from").textContent = "1 " + state.from + " = " + rate.toFixed(10) + " " + state.to;
+  panel.querySelector(".rate-to").textContent = "1 " + state.to + " = " + (1 / rate).toFixed(6) + " " + state.from;
+  panel.hidden = false;
+}
+
+amountInput.addEventListener("change", () => {
+  const amount = parseFloat(amountInput.value.replace(/,/g, "")) || 0;
+  amountInput.value = formatAmount(amount);
+  amountInput.setAttribute("value", amountInput.value);
+  if (state.converted) refresh();
+});
+
+document.getElementById("convert").addEventListener("click", () => {
+  state.converted = true;
+  refresh();
+});
+
+setupSelect("midmarketFromCurrency", "from");
+setupSelect("midmarketToCurrency", "to");
+const deepLink = new URLSearchParams(location.search);
+if (deepLink.get("Amount") && deepLink.get("From") && deepLink.get("To")) {
+  state.from = deepLink.get("From").toUpperCase();
+  state.to = deepLink.get("To").toUpperCase();
+  document.querySelector("#midmarketFromCurrency .selected").textContent = state.from;
+  document.querySelector("#midmarketToCurrency .selected").textContent = state.to;
+  amountInput.value = formatAmount(parseFloat(deepLink.get("Amount")) || 0);
+  state.converted = true;
+  refresh();
+}
+// Like the real site, rates are fetched as soon as the page loads
+fetch("api/protected/midmarket-converter");
+</script>
+</body>
+</html>
+"""
+
+
+# Wise-like converter: currency buttons opening a search box and a listbox section, the source
+# amount input and a read-only target input filled from the quote endpoint.
+WISE_PAGE_HTML = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>Wise stand-in converter</title>
+<style>[hidden] { display: none !important; } .d-inline { display: inline; cursor: pointer; }</style>
+</head>
+<body>
+<div class="converter">
+  <div class="source">
+    <input id="source-input" value="100" inputmode="decimal">
+    <button type="button" id="source-inputSelectedCurrency">GBP</button>
+    <input id="source-inputSelectedCurrencySearch" hidden autocomplete="off">
+  </div>
+  <div class="target">
+    <input id="target-input" readonly>
+    <button type="button" id="target-inputSelectedCurrency">EUR</button>
+    <input id="target-inputSelectedCurrencySearch" hidden autocomplete="off">
+  </div>
+  <p class="rate"></p>
+</div>
+<script>
+const CURRENCIES = __CURRENCIES__;
+const state = { source: "GBP", target: "EUR", sequence: 0 };
+const sourceInput = document.getElementById("source-input");
+const targetInput = document.getElementById("target-input");
+
+function closeListbox() {
+  document.querySelectorAll("section.np-select-input-listbox-container").forEach(s => s.remove());
+  document.querySelectorAll("[id$=SelectedCurrencySearch]").forEach(i => { i.hidden = true; i.value = ""; });
+}
+
+function setupSelect(side) {
+  const button = document.getElementById(side + "-inputSelectedCurrency");
+  const search = document.getElementById(side + "-inputSelectedCurrencySearch");
+  button.addEventListener("click", () => {
+    closeListbox();
+    search.hidden = false;
+    const section = document.createElement("section");
+    section.className = "np-select-input-listbox-container";
+    search.insertAdjacentElement("afterend", section);
+    const render = () => {
+      const query = search.value.trim().toLowerCase();
+      section.innerHTML = "";
+      CURRENCIES.filter(c => (c.code + " " + c.name).toLowerCase().includes(query)).forEach(c => {
+        const option = document.createElement("div");
+        option.className = "np-select-input-option";
+        option.innerHTML = '<div class="d-inline">' + c.code + '</div> <small>' + c.name + '</small>';
+        option.addEventListener("click", () => {
+          state[side] = c.code;
+          button.textContent = c.code;
+          closeListbox();
+          loadLiveRate();
+          requestQuote();
+        });
+        section.appendChild(option);
+      });
+    };
+    search.oninput = render;
+    render();
+    search.focus();
+  });
+}
+
+async function loadLiveRate() {
+  const response = await fetch("../../rates/live?source=" + state.source + "&target=" + state.target);
+  if (!response.ok) return;
+  const live = await response.json();
+  document.querySelector(".rate").textContent = "1 " + live.source + " = " + live.value.toFixed(6) + " " + live.target;
+}
+
+async function requestQuote() {
+  // The target stays empty while a quote is pending, and superseded quotes are dropped
+  const sequence = ++state.sequence;
+  targetInput.value = "";
+  const amount = parseFloat(sourceInput.value.replace(/,/g, ""));
+  if (!amount) return;
+  const response = await fetch("../../gateway/v3/quotes?source=" + state.source + "&target=" + state.target +
+                               "&amount=" + amount);
+  if (!response.ok || sequence !== state.sequence) return;
+  const quote = await response.json();
+  targetInput.value = quote.targetAmount.toLocaleString("en-US", { minimumFractionDigits: 2, maximumFractionDigits: 2 });
+}
+
+sourceInput.addEventListener("input", requestQuote);
+setupSelect("source");
+setupSelect("target");
+requestQuote();
+</script>
+</body>
+</html>
+"""
@@ -1,5 +1,7 @@
 from typing import Dict
+from utils.conversion_planner import split_pair_key
 from utils.logger import log_info, log_debug
+from utils.result_structure import pair_entries
 
 
 class VerificationService:
@@ -25,26 +27,28 @@ class VerificationService:
         """
         log_info(f"Verifying {source} - Web vs Calculator conversion accuracy...")
         
-        # Check EUR conversions
-        eur_matches = self._verify_currency_conversions(
-            web_data["eur"], calculator_data["eur"], "EUR", source
-        )
-        
-        # Check USD conversions  
-        usd_matches = self._verify_currency_conversions(
-            web_data["usd"], calculator_data["usd"], "USD", source
-        )
+        # Check every pair the website returned (EUR and USD for the RSD runs)
+        all_pairs_match = True
+        for key, web_pair_data in pair_entries(web_data):
+            if key not in calculator_data:
+                log_info(f"❌ {source} has no calculator results for pair '{key}'")
+                all_pairs_match = False
+                continue
+            from_currency, to_currency = split_pair_key(key)
+            if not self._verify_currency_conversions(web_pair_data, calculator_data[key], to_currency, source,
+                                                     from_currency):
+                all_pairs_match = False
         
         # Overall assertion
-        if eur_matches and usd_matches:
+        if all_pairs_match:
             log_info(f" {source} verification PASSED - All conversions match within tolerance")
             return True
         else:
             raise AssertionError(f" {source} verification FAILED - Conversions don't match")
     
     def _verify_currency_conversions(self, web_currency_data: Dict, calc_currency_data: Dict, 
-                                   currency: str, source: str) -> bool:
-        """Verify conversions for a specific currency (EUR or USD)."""
+                                   currency: str, source: str, from_currency: str = "RSD") -> bool:
+        """Verify conversions for a specific pair (e.g. RSD → EUR)."""
         log_debug(f"Checking {currency} conversions for {source}...")
         
         web_conversions = web_currency_data["conversions"]
@@ -66,11 +70,11 @@ class VerificationService:
                 difference = abs(web_result - calc_result)
                 
                 if difference > self.tolerance:
-                    log_info(f"❌ {amount} RSD → {currency}: Web={web_result:.4f}, Calc={calc_result:.4f}, "
+                    log_info(f"❌ {amount} {from_currency} → {currency}: Web={web_result:.4f}, Calc={calc_result:.4f}, "
                              f"Diff={difference:.4f} (exceeds tolerance {self.tolerance})")
                     all_match = False
                 else:
-                    log_debug(f"✓ {amount} RSD → {currency}: Web={web_result:.4f}, Calc={calc_result:.4f}, "
+                    log_debug(f"✓ {amount} {from_currency} → {currency}: Web={web_result:.4f}, Calc={calc_result:.4f}, "
                              f"Diff={difference:.4f} (within tolerance {self.tolerance})")
         
         return all_match 
\ No newline at end of file
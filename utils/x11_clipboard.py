@@ -0,0 +1,138 @@
+import select
+import time
+from typing import Callable, Optional
+import pyperclip
+from utils.logger import log_debug, log_warning
+
+try:
+    from Xlib import X, Xatom, display as xdisplay
+    from Xlib.ext import xfixes
+except ImportError:  # python-xlib is optional - the clipboard then goes through pyperclip
+    xdisplay = None
+
+
+class PyperclipClipboard:
+    """
+    Clipboard access through pyperclip - on Linux every call forks xclip or xsel.
+
+    The clipboard is cleared before the copy and read after the fixed COPY_DELAY, like the
+    original automation.
+    """
+
+    COPY_DELAY = 1.0
+
+    def copy_from(self, trigger: Callable[[], None], timeout: float = 2.0) -> str:
+        """Run trigger (e.g. a ctrl+c keystroke) and return what it put on the clipboard."""
+        pyperclip.copy('')
+        trigger()
+        time.sleep(self.COPY_DELAY)
+        return pyperclip.paste()
+
+
+class X11Clipboard:
+    """
+    In-process CLIPBOARD reader over one X connection.
+
+    Ownership changes are watched with the XFixes extension, so copy_from returns as soon as
+    the application has taken the clipboard instead of after a fixed delay; the text is then
+    converted into a property of a hidden window of our own - what xclip does, without
+    forking it. Replies this reader does not handle - an incremental (INCR) transfer, a refused
+    UTF8_STRING target, a non-text property or no answer at all - are read through pyperclip.
+    """
+
+    PROPERTY = "INSIGHTFUL_CLIPBOARD"
+
+    def __init__(self, display=None):
+        """
+        Args:
+            display: Xlib Display to share (e.g. X11Windows.display), a new connection by default
+        """
+        self.display = display or xdisplay.Display()
+        if not self.display.has_extension("XFIXES"):
+            raise RuntimeError("X server has no XFIXES extension")
+        self.display.xfixes_query_version()
+        self.root = self.display.screen().root
+        self.clipboard = self.display.intern_atom("CLIPBOARD")
+        self.utf8 = self.display.intern_atom("UTF8_STRING")
+        self.property = self.display.intern_atom(self.PROPERTY)
+        self.incr = self.display.intern_atom("INCR")
+        self.window = self.root.create_window(0, 0, 1, 1, 0, X.CopyFromParent)
+        self.display.xfixes_select_selection_input(self.window, self.clipboard,
+                                                   xfixes.XFixesSetSelectionOwnerNotifyMask)
+        self.display.flush()
+
+    @classmethod
+    def create(cls, display=None):
+        """X11Clipboard when python-xlib, a display and XFixes are available, PyperclipClipboard otherwise."""
+        if xdisplay is None:
+            log_debug("python-xlib is not installed, using pyperclip for the clipboard")
+            return PyperclipClipboard()
+        try:
+            return cls(display)
+        except Exception as e:
+            log_warning(f"In-process clipboard unavailable ({e}), using pyperclip")
+            return PyperclipClipboard()
+
+    def copy_from(self, trigger: Callable[[], None], timeout: float = 2.0) -> str:
+        """
+        Run trigger (e.g. a ctrl+c keystroke) and return what it put on the clipboard.
+
+        Raises:
+            RuntimeError: If nobody took the clipboard within timeout seconds
+        """
+        self._drain_events()
+        start = time.perf_counter()
+        trigger()
+        deadline = time.monotonic() + timeout
+        owner_event = self.display.extension_event.SetSelectionOwnerNotify
+        while True:
+            event = self._next_event(deadline)
+            if event is None:
+                raise RuntimeError(f"Clipboard did not change within {timeout} s")
+            if (event.type, getattr(event, "sub_code", None)) == owner_event:
+                break
+        text = self.read(deadline)
+        log_debug(f"Clipboard read in {(time.perf_counter() - start) * 1000:.0f} ms")
+        return text
+
+    def read(self, deadline: Optional[float] = None) -> str:
+        """The current CLIPBOARD text - through pyperclip when the owner's reply cannot be read here."""
+        deadline = deadline or time.monotonic() + 2.0
+        self.window.convert_selection(self.clipboard, self.utf8, self.property, X.CurrentTime)
+        self.display.flush()
+        while True:
+            event = self._next_event(deadline)
+            if event is None:
+                return self._read_fallback("the clipboard owner did not answer")
+            if event.type == X.SelectionNotify and event.requestor == self.window.id:
+                break
+        if event.property == X.NONE:
+            return self._read_fallback("the clipboard owner refused the UTF8_STRING target")
+        prop = self.window.get_full_property(self.property, X.AnyPropertyType)
+        self.window.delete_property(self.property)
+        if prop is None:
+            return self._read_fallback("the clipboard owner left no property")
+        if prop.property_type == self.incr:
+            # Large selections arrive in chunks through PropertyNotify events - left to xclip/xsel
+            return self._read_fallback("the clipboard owner started an INCR transfer")
+        if prop.property_type not in (self.utf8, Xatom.STRING):
+            return self._read_fallback(f"the clipboard holds property type {prop.property_type}")
+        value = prop.value
+        return value.decode("utf-8", "replace") if isinstance(value, bytes) else str(value)
+
+    def _read_fallback(self, reason: str) -> str:
+        log_debug(f"Reading the clipboard through pyperclip: {reason}")
+        return pyperclip.paste()
+
+    def _drain_events(self) -> None:
+        while self.display.pending_events():
+            self.display.next_event()
+
+    def _next_event(self, deadline: float):
+        """The next X event, None once the deadline has passed."""
+        while not self.display.pending_events():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            select.select([self.display], [], [], remaining)
+        return self.display.next_event()
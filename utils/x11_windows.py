@@ -0,0 +1,179 @@
+import os
+import subprocess
+import time
+from typing import Optional
+from utils.logger import log_debug, log_warning
+
+try:
+    from Xlib import X, display as xdisplay, error as xerror, protocol
+except ImportError:  # python-xlib is optional - window management then goes through wmctrl
+    xdisplay = None
+
+
+class WmctrlWindows:
+    """
+    Window lookup and activation through the wmctrl command - every call forks a process.
+
+    Window ids are the hex strings wmctrl prints. Whether a window became active cannot be
+    observed here, so wait_until_active sleeps ACTIVATE_DELAY like the original automation.
+    """
+
+    LIST_CMD = ["wmctrl", "-l", "-p"]
+    ACTIVATE_CMD = "wmctrl"
+    ACTIVATE_DELAY = 1.0
+    POLL_INTERVAL = 0.25
+    # No X connection of its own to share
+    display = None
+
+    def find_window(self, name: str) -> Optional[str]:
+        """Id of the first window whose wmctrl line contains name, None when there is none."""
+        window_list = subprocess.check_output(self.LIST_CMD).decode()
+        for line in window_list.split('\n'):
+            if name in line:
+                return line.split()[0]
+        return None
+
+    def wait_for_window(self, name: str, timeout: float) -> Optional[str]:
+        """Poll for a window until it appears or timeout seconds pass."""
+        deadline = time.monotonic() + timeout
+        while True:
+            window = self.find_window(name)
+            if window or time.monotonic() >= deadline:
+                return window
+            time.sleep(self.POLL_INTERVAL)
+
+    def wait_for_window_gone(self, name: str, timeout: float) -> bool:
+        """Poll until no window matches name; False when one is still there after timeout seconds."""
+        deadline = time.monotonic() + timeout
+        while self.find_window(name):
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(self.POLL_INTERVAL)
+        return True
+
+    def window_exists(self, window) -> bool:
+        """Whether the window is still listed."""
+        window_list = subprocess.check_output(self.LIST_CMD).decode()
+        return any(line.split()[0] == window for line in window_list.split('\n') if line.strip())
+
+    def is_active(self, window) -> bool:
+        """Unknown through wmctrl - always False, so the window is always activated."""
+        return False
+
+    def activate(self, window) -> None:
+        """Switch to the window's desktop, raise and focus it."""
+        subprocess.run([self.ACTIVATE_CMD, "-ia", window], check=False)
+
+    def wait_until_active(self, window, timeout: float = ACTIVATE_DELAY) -> bool:
+        """Give the window manager the fixed activation delay."""
+        time.sleep(self.ACTIVATE_DELAY)
+        return True
+
+
+class X11Windows:
+    """
+    In-process EWMH window management through python-xlib.
+
+    Reads _NET_CLIENT_LIST, the window titles and _NET_ACTIVE_WINDOW from the X server
+    connection and activates windows with a _NET_ACTIVE_WINDOW client message - what wmctrl
+    does, without forking it - and waits for activation by watching the active window rather
+    than sleeping. Window ids are ints.
+    """
+
+    POLL_INTERVAL = 0.02
+
+    def __init__(self, display_name: Optional[str] = None):
+        self.display = xdisplay.Display(display_name)
+        self.root = self.display.screen().root
+        self._atoms = {}
+
+    @classmethod
+    def create(cls):
+        """X11Windows when python-xlib and a display are available, WmctrlWindows otherwise."""
+        if xdisplay is None:
+            log_debug("python-xlib is not installed, managing windows through wmctrl")
+            return WmctrlWindows()
+        try:
+            return cls()
+        except Exception as e:
+            log_warning(f"Cannot connect to X display {os.getenv('DISPLAY')!r} ({e}), managing windows through wmctrl")
+            return WmctrlWindows()
+
+    def find_window(self, name: str) -> Optional[int]:
+        """Id of the first client window whose title contains name, None when there is none."""
+        for window_id in self._client_ids():
+            if name in self._title(window_id):
+                return window_id
+        return None
+
+    def wait_for_window(self, name: str, timeout: float) -> Optional[int]:
+        """Poll for a window until it appears or timeout seconds pass."""
+        deadline = time.monotonic() + timeout
+        while True:
+            window_id = self.find_window(name)
+            if window_id or time.monotonic() >= deadline:
+                return window_id
+            time.sleep(self.POLL_INTERVAL)
+
+    def wait_for_window_gone(self, name: str, timeout: float) -> bool:
+        """Poll until no window matches name; False when one is still there after timeout seconds."""
+        deadline = time.monotonic() + timeout
+        while self.find_window(name):
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(self.POLL_INTERVAL)
+        return True
+
+    def window_exists(self, window_id: int) -> bool:
+        """Whether the window is still managed."""
+        return window_id in self._client_ids()
+
+    def is_active(self, window_id: int) -> bool:
+        """Whether the window has the focus."""
+        active = self._property(self.root, "_NET_ACTIVE_WINDOW")
+        return bool(active) and active[0] == window_id
+
+    def activate(self, window_id: int) -> None:
+        """Ask the window manager to raise and focus the window."""
+        event = protocol.event.ClientMessage(
+            window=self.display.create_resource_object("window", window_id),
+            client_type=self._atom("_NET_ACTIVE_WINDOW"),
+            # Source indication 2: a pager-like tool, which window managers obey unconditionally
+            data=(32, [2, X.CurrentTime, 0, 0, 0]))
+        self.root.send_event(event, event_mask=X.SubstructureRedirectMask | X.SubstructureNotifyMask)
+        self.display.flush()
+
+    def wait_until_active(self, window_id: int, timeout: float = 1.0) -> bool:
+        """Wait until the window has the focus; False when it did not get it within timeout seconds."""
+        deadline = time.monotonic() + timeout
+        while not self.is_active(window_id):
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(self.POLL_INTERVAL)
+        return True
+
+    def _client_ids(self) -> list:
+        return list(self._property(self.root, "_NET_CLIENT_LIST") or [])
+
+    def _title(self, window_id: int) -> str:
+        window = self.display.create_resource_object("window", window_id)
+        try:
+            title = self._property(window, "_NET_WM_NAME", self._atom("UTF8_STRING"))
+            if title is None:
+                title = window.get_wm_name()
+        except xerror.XError:
+            # Closed between listing and reading
+            return ""
+        if isinstance(title, bytes):
+            title = title.decode("utf-8", "replace")
+        return title or ""
+
+    def _property(self, window, name: str, property_type: int = 0):
+        # 0 is X.AnyPropertyType
+        prop = window.get_full_property(self._atom(name), property_type)
+        return prop.value if prop is not None else None
+
+    def _atom(self, name: str) -> int:
+        if name not in self._atoms:
+            self._atoms[name] = self.display.intern_atom(name)
+        return self._atoms[name]